@@ -0,0 +1,82 @@
+"""
+Framework-overhead benchmarks.
+
+Run with `pytest benchmarks`. Each benchmark reports a median time that is
+compared with the stored baseline in BENCH_BASELINES (default
+benchmarks/baselines.json); a result slower than baseline * (1 + BENCH_THRESHOLD)
+fails. Baselines depend on the machine, so they are not committed:
+`--update-baselines` records them. Without it a benchmark that has no
+baseline fails, so a fresh checkout (or a CI runner without its baselines
+file) can't pass the regression check by comparing against nothing.
+"""
+import json
+import os
+
+import pytest
+
+BASELINES_PATH = os.getenv("BENCH_BASELINES", os.path.join(os.path.dirname(__file__), "baselines.json"))
+# Allowed slowdown before a benchmark fails (0.25 = 25%)
+THRESHOLD = float(os.getenv("BENCH_THRESHOLD", "0.25"))
+# Absolute slack in seconds so sub-millisecond benchmarks don't fail on noise
+MIN_SLACK = float(os.getenv("BENCH_MIN_SLACK", "0.002"))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-baselines", action="store_true", default=False, help="Re-record benchmark baselines")
+
+
+class BaselineStore:
+    def __init__(self, path, update=False):
+        self.path = path
+        self.update = update
+        self.results = {}
+        # Figures shown with the results but not checked against a baseline
+        self.notes = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.baselines = json.load(f)
+        except (OSError, ValueError):
+            self.baselines = {}
+
+    def check(self, name, seconds):
+        self.results[name] = seconds
+        baseline = self.baselines.get(name)
+        if self.update:
+            self.baselines[name] = seconds
+            return
+        if baseline is None:
+            pytest.fail(
+                f"No baseline for {name} in {self.path} (measured {seconds * 1000:.1f}ms); "
+                "record one with `pytest benchmarks --update-baselines`"
+            )
+        limit = baseline * (1 + THRESHOLD) + MIN_SLACK
+        assert seconds <= limit, (
+            f"{name} regressed: {seconds * 1000:.1f}ms vs baseline {baseline * 1000:.1f}ms "
+            f"(limit {limit * 1000:.1f}ms, BENCH_THRESHOLD={THRESHOLD})"
+        )
+
+    def note(self, name, seconds):
+        self.notes[name] = seconds
+
+    def save(self):
+        if not self.update:
+            return
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.baselines, f, indent=2, sort_keys=True)
+
+
+@pytest.fixture(scope="session")
+def perf_baseline(request):
+    store = BaselineStore(BASELINES_PATH, update=request.config.getoption("--update-baselines"))
+    yield store
+    store.save()
+    reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is not None:
+        reporter.write_line("")
+        for name, seconds in sorted(store.results.items()):
+            baseline = store.baselines.get(name)
+            against = f"baseline {baseline * 1000:.2f}ms" if baseline is not None else "no baseline"
+            reporter.write_line(f"benchmark {name}: {seconds * 1000:.2f}ms ({against})")
+        for name, seconds in sorted(store.notes.items()):
+            reporter.write_line(f"benchmark {name}: {seconds * 1000:+.2f}ms")
+
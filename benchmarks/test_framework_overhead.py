@@ -0,0 +1,133 @@
+import json
+import os
+
+from benchmarks.timing import median_time, median_time_async
+from framework.archive import IncrementalArchive, combine_archives
+from framework.browser_pool import BrowserPool
+from framework.report import write_report
+from framework.results import ResultSink, iter_results, safe_filename, shard_path
+from framework.spans import SpanRecorder, attach
+from framework.tracing import ChunkedTracer
+from pages.login_page import LoginPage
+
+SYNTHETIC_TESTS = 2000
+
+
+def _synthetic_result(i):
+    return {
+        "nodeid": f"tests/test_synthetic.py::TestSynthetic::test_case[{i}]",
+        "outcome": "failed" if i % 10 == 0 else "passed",
+        "longrepr": "AssertionError: boom\n" * 20 if i % 10 == 0 else "",
+        "duration": 1.5,
+        "spans": [
+            {"name": "LoginPage.login", "start": 0.0, "dur": 400.0, "depth": 0, "ok": True},
+            {"name": "login.form_gone", "start": 120.0, "dur": 250.0, "depth": 1, "ok": True},
+        ],
+    }
+
+
+class TestFrameworkOverhead:
+    async def test_context_setup_teardown(self, perf_baseline):
+        pool = await BrowserPool(headless=True, prewarm=2).start()
+        try:
+
+            async def cycle():
+                context, _ = await pool.acquire()
+                await pool.release(context)
+
+            await cycle()
+            perf_baseline.check("context_setup_teardown", await median_time_async(cycle, repeat=10))
+        finally:
+            await pool.close()
+
+    async def test_login_flow_against_mock(self, perf_baseline, mock_app):
+        pool = await BrowserPool(headless=True, prewarm=1).start()
+        try:
+
+            async def flow(traced=False):
+                context, _ = await pool.acquire()
+                tracer = ChunkedTracer(context) if traced else None
+                if tracer is not None:
+                    await tracer.start()
+                page = await context.new_page()
+                recorder = SpanRecorder()
+                if tracer is not None:
+                    recorder.listeners.append(tracer)
+                attach(page, recorder)
+                login_page = LoginPage(page, base_url=mock_app.url)
+                await login_page.go_to_login_page()
+                await login_page.login(mock_app.email, mock_app.password)
+                if tracer is not None:
+                    await tracer.stop(keep=False, target_dir="")
+                await pool.release(context)
+
+            await flow()
+            untraced = await median_time_async(flow, repeat=5)
+            traced = await median_time_async(lambda: flow(traced=True), repeat=5)
+            perf_baseline.note("tracing_overhead_login_flow", traced - untraced)
+            perf_baseline.check("login_flow_mock", untraced)
+            perf_baseline.check("login_flow_mock_traced", traced)
+        finally:
+            await pool.close()
+
+    def test_per_test_bookkeeping(self, perf_baseline, tmp_path):
+        """What the conftest hooks do for every test: result stream, per-test JSON, archive queue."""
+        report_dir = str(tmp_path)
+
+        def run():
+            sink = ResultSink(shard_path(report_dir, "bench", "main"))
+            archive = IncrementalArchive(os.path.join(report_dir, "bench.zip"), report_dir)
+            for i in range(200):
+                entry = _synthetic_result(i)
+                nodeid = entry.pop("nodeid")
+                sink.record(nodeid, **entry)
+                final = sink.finish(nodeid, context_teardown=0.01)
+                path = os.path.join(report_dir, f"{safe_filename(nodeid)}.json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(final, f, separators=(",", ":"))
+                archive.add(path)
+            sink.close()
+            archive.close()
+
+        perf_baseline.check("per_test_bookkeeping_x200", median_time(run, repeat=3))
+
+    def test_report_generation(self, perf_baseline, tmp_path):
+        sink = ResultSink(shard_path(str(tmp_path), "bench", "main"))
+        for i in range(SYNTHETIC_TESTS):
+            entry = _synthetic_result(i)
+            sink.record(entry.pop("nodeid"), **entry)
+        sink.close()
+
+        def run():
+            write_report(
+                str(tmp_path),
+                iter_results(str(tmp_path), "bench"),
+                exitstatus=1,
+                metas=[],
+                aliases={},
+            )
+
+        perf_baseline.check(f"report_generation_x{SYNTHETIC_TESTS}", median_time(run, repeat=3))
+
+    def test_archiving(self, perf_baseline, tmp_path):
+        artifacts = []
+        for i in range(100):
+            png = tmp_path / f"shot-{i}.png"
+            png.write_bytes(os.urandom(50_000))
+            result = tmp_path / f"result-{i}.json"
+            result.write_text(json.dumps(_synthetic_result(i)), encoding="utf-8")
+            artifacts += [str(png), str(result)]
+
+        def run():
+            # Two workers archive half the artifacts each, then the controller combines them
+            half = len(artifacts) // 2
+            shards = []
+            for worker, paths in (("gw0", artifacts[:half]), ("gw1", artifacts[half:])):
+                archive = IncrementalArchive(str(tmp_path / "shards" / f"{worker}.zip"), str(tmp_path))
+                for path in paths:
+                    archive.add(path)
+                archive.close()
+                shards.append(archive.path)
+            combine_archives(shards, str(tmp_path / "report.zip"))
+
+        perf_baseline.check("archiving_x200", median_time(run, repeat=3))
@@ -0,0 +1,21 @@
+import statistics
+import time
+
+
+def median_time(fn, repeat=5):
+    """Median wall time of `fn()` over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+async def median_time_async(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
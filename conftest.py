@@ -1,13 +1,44 @@
 import json
 import os
-import zipfile
+import time
+import uuid
 from datetime import datetime
-from html import escape
 
 import pytest
-from playwright.async_api import async_playwright
 from dotenv import load_dotenv
 
+from framework.archive import IncrementalArchive, append_files, combine_archives
+from framework.auth_state import AuthStateCache
+from framework.browser_log import BrowserLog
+from framework.browser_pool import BrowserPool
+from framework.flow_state import FlowSnapshotCache
+from framework.har_cache import MODES as HAR_MODES, HarCache
+from framework.mock_app import MockConstructApp
+from framework.preconditions import MODES as PRECONDITION_MODES, PreconditionStats, Preconditions
+from framework.report import write_report
+from framework.spans import SpanRecorder, attach
+from framework.timeouts import timeout_policy
+from framework.tracing import MODES as TRACING_MODES, ChunkedTracer
+from framework.routing import apply_profile, format_bytes, get_profile
+from framework.screenshots import ScreenshotWriter
+from framework.results import (
+    ResultSink,
+    is_worker,
+    iter_results,
+    load_shard_meta,
+    order_by_duration,
+    prune_shards,
+    safe_filename,
+    shard_dir,
+    shard_path,
+    update_durations,
+    worker_id,
+    write_shard_meta,
+)
+from pages.base_page import page_metrics
+from pages.locators import selector_cache
+from pages.org_page import OrgNameAllocator
+
 load_dotenv()
 
 # Directory where reports and screenshots will be saved
@@ -15,129 +46,508 @@ REPORT_DIR = os.getenv("REPORT_DIR", "reports")
 os.makedirs(REPORT_DIR, exist_ok=True)
 
 
+WEBSITE_URL = os.getenv("WEBSITE_URL", "https://dev-app.helpconstruct.com")
+TEST_EMAIL = os.getenv("TEST_EMAIL")
+TEST_PASSWORD = os.getenv("TEST_PASSWORD")
+# pytest cache key holding the rolling per-test duration history used for scheduling
+DURATIONS_CACHE_KEY = "construct/durations"
+# pytest cache key holding resource sizes learned from Content-Length, used to estimate bytes saved
+RESOURCE_SIZES_CACHE_KEY = "construct/resource_sizes"
+# pytest cache key holding recent UI timings of each precondition, the baseline for "time saved" by the API path
+PRECONDITION_BASELINE_CACHE_KEY = "construct/precondition_ui_seconds"
+# Recorded static assets/API responses for --har record/replay. Kept outside REPORT_DIR like AUTH_STATE_DIR
+HAR_DIR = os.getenv("HAR_DIR", ".har")
+# Comma-separated URL globs of GET APIs stable enough to replay, e.g. "*/api/countries*"
+HAR_API_PATTERNS = [p.strip() for p in os.getenv("HAR_API_PATTERNS", "").split(",") if p.strip()]
+# Total size of failure screenshots kept per run, in MB (0 = no limit)
+SCREENSHOT_BUDGET_MB = int(os.getenv("SCREENSHOT_BUDGET_MB", "200"))
+# Trace chunks (steps) kept for a failing test, and whether they include screenshots
+TRACE_MAX_CHUNKS = int(os.getenv("TRACE_MAX_CHUNKS", "3"))
+TRACE_SCREENSHOTS = os.getenv("TRACE_SCREENSHOTS", "1").lower() not in ("0", "false", "no")
+# Console/network log kept per test (only saved when it fails): entries, KB and the "slow request" threshold
+BROWSER_LOG_MAX_ENTRIES = int(os.getenv("BROWSER_LOG_MAX_ENTRIES", "200"))
+BROWSER_LOG_MAX_KB = int(os.getenv("BROWSER_LOG_MAX_KB", "64"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+# Append-only index of past runs behind the report's trend column; outside REPORT_DIR if that is wiped per run
+REPORT_HISTORY = os.getenv("REPORT_HISTORY", os.path.join(REPORT_DIR, "history.jsonl"))
+# Extra Chromium flags for --fast runs
+FAST_LAUNCH_ARGS = ["--disable-gpu", "--disable-dev-shm-usage", "--disable-extensions"]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--mock-app",
+        action="store_true",
+        default=False,
+        help="Run against the bundled local stand-in of the Construct app instead of WEBSITE_URL",
+    )
+    parser.addoption(
+        "--routing-profile",
+        default=os.getenv("ROUTING_PROFILE"),
+        help=(
+            "Default routing profile for every test: "
+            "full (load everything) or lean (block images/fonts/media, stub trackers)"
+        ),
+    )
+    parser.addoption(
+        "--headless",
+        action="store_true",
+        default=os.getenv("HEADLESS", "").lower() in ("1", "true", "yes"),
+        help="Run the browser headless",
+    )
+    parser.addoption(
+        "--har",
+        choices=HAR_MODES,
+        default=os.getenv("HAR_MODE", "off"),
+        help="record: save static assets/API responses to HAR_DIR; replay: serve them from there",
+    )
+    parser.addoption(
+        "--tracing",
+        choices=TRACING_MODES,
+        default=os.getenv("TRACING", "retain-on-failure"),
+        help="retain-on-failure: Playwright trace per step, kept in the report only for failed tests",
+    )
+    parser.addoption(
+        "--preconditions",
+        choices=PRECONDITION_MODES,
+        default=os.getenv("PRECONDITIONS", "api"),
+        help="How the `preconditions` fixture builds org state: api (backend calls, UI fallback) or ui",
+    )
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        default=False,
+        help="CI mode: headless, lean routing profile (unless --routing-profile is given) and lighter Chromium flags",
+    )
+
+
+def pytest_configure(config):
+    global WEBSITE_URL, TEST_EMAIL, TEST_PASSWORD
+    if config.getoption("--mock-app"):
+        # Started before test modules are imported, so their WEBSITE_URL/TEST_* constants pick it up
+        config._mock_app = MockConstructApp().start()
+        WEBSITE_URL = os.environ["WEBSITE_URL"] = config._mock_app.url
+        TEST_EMAIL = os.environ["TEST_EMAIL"] = config._mock_app.email
+        TEST_PASSWORD = os.environ["TEST_PASSWORD"] = config._mock_app.password
+
+    fast = config.getoption("--fast")
+    config._headless = fast or config.getoption("--headless")
+    config._routing_profile = get_profile(config.getoption("--routing-profile") or ("lean" if fast else "full"))
+    config._resource_sizes = config.cache.get(RESOURCE_SIZES_CACHE_KEY, {}) if getattr(config, "cache", None) else {}
+    config._learned_sizes = {}
+    config._routing_totals = {"tests": 0, "requests": 0, "blocked": 0, "stubbed": 0, "bytes_saved": 0}
+    config._tracing_totals = {"tests": 0, "seconds": 0.0, "retained": 0, "call_seconds": 0.0}
+    config._preconditions = PreconditionStats(
+        config.cache.get(PRECONDITION_BASELINE_CACHE_KEY, {}) if getattr(config, "cache", None) else {}
+    )
+    config._har = HarCache(HAR_DIR, config.getoption("--har"), HAR_API_PATTERNS)
+    if config._har.mode == "replay" and not is_worker(config):
+        # Once per run, before xdist workers start using the cache
+        config._har.check_staleness()
+
+    if is_worker(config):
+        config._run_id = config.workerinput["construct_run_id"]
+    else:
+        config._run_id = datetime.now().strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        config._started = time.perf_counter()
+        # Shards of earlier runs are never merged again; a run still writing its own is left alone
+        prune_shards(REPORT_DIR)
+    config._results = ResultSink(shard_path(REPORT_DIR, config._run_id, worker_id(config)))
+    # Artifacts of this run only, zipped in the background as tests produce them
+    config._archive = IncrementalArchive(
+        os.path.join(shard_dir(REPORT_DIR, config._run_id), f"{worker_id(config)}.zip"),
+        REPORT_DIR,
+    )
+    # The run's screenshot budget is split evenly between xdist workers
+    workers = config.workerinput.get("workercount", 1) if is_worker(config) else 1
+    config._screenshots = ScreenshotWriter(config._archive, max_bytes=SCREENSHOT_BUDGET_MB * 1024 * 1024 // workers)
+
+
+def pytest_unconfigure(config):
+    mock_app = getattr(config, "_mock_app", None)
+    if mock_app is not None:
+        mock_app.stop()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # xdist controller -> worker: every worker writes into the controller's run
+    node.workerinput["construct_run_id"] = node.config._run_id
+
+
+def pytest_collection_modifyitems(session, config, items):
+    # Only reorder under xdist; serial runs keep the file order people expect
+    if is_worker(config) and getattr(config, "cache", None) is not None:
+        history = config.cache.get(DURATIONS_CACHE_KEY, {})
+        items[:] = order_by_duration(items, history)
+
+
+# Number of contexts created ahead of time in the background
+PREWARM_CONTEXTS = int(os.getenv("PREWARM_CONTEXTS", "2"))
+
+# Saved login sessions (cookies/localStorage). Kept outside REPORT_DIR so they never end up in report.zip
+AUTH_STATE_DIR = os.getenv("AUTH_STATE_DIR", ".auth")
+AUTH_STATE_TTL = int(os.getenv("AUTH_STATE_TTL", "3600"))
+# Storage state + URL at org-flow checkpoints (see @pytest.mark.checkpoint); they hold the same cookies
+FLOW_STATE_DIR = os.getenv("FLOW_STATE_DIR", ".flow_state")
+FLOW_STATE_TTL = int(os.getenv("FLOW_STATE_TTL", str(AUTH_STATE_TTL)))
+
+
+@pytest.fixture(scope="session")
+async def browser_pool(request):
+    # One browser for the whole session (one per worker under xdist)
+    fast = request.config.getoption("--fast")
+    pool = await BrowserPool(
+        headless=request.config._headless,
+        prewarm=PREWARM_CONTEXTS,
+        launch_options={"args": FAST_LAUNCH_ARGS} if fast else None,
+    ).start()
+    request.config._browser_pool = pool
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture(scope="session")
+async def browser(browser_pool):
+    return browser_pool.browser
+
+
+@pytest.fixture(scope="session")
+def mock_app(request):
+    # The --mock-app server when running with it, otherwise a private one for this session
+    app = getattr(request.config, "_mock_app", None)
+    if app is not None:
+        yield app
+        return
+    app = MockConstructApp().start()
+    yield app
+    app.stop()
+
+
+@pytest.fixture(scope="session")
+def auth_state(browser_pool, request):
+    cache = AuthStateCache(browser_pool, WEBSITE_URL, state_dir=AUTH_STATE_DIR, ttl=AUTH_STATE_TTL)
+    request.config._auth_state = cache
+    return cache
+
+
+@pytest.fixture(scope="session")
+def flow_snapshots(browser_pool, auth_state, org_names, request):
+    cache = FlowSnapshotCache(
+        browser_pool, auth_state, WEBSITE_URL, state_dir=FLOW_STATE_DIR, ttl=FLOW_STATE_TTL, name_allocator=org_names
+    )
+    request.config._flow_snapshots = cache
+    return cache
+
+
+def _credentials(marker):
+    email = marker.kwargs.get("email", TEST_EMAIL)
+    password = marker.kwargs.get("password", TEST_PASSWORD)
+    if not email or not password:
+        pytest.skip("TEST_EMAIL and TEST_PASSWORD must be set in .env")
+    return email, password
+
+
 @pytest.fixture
-async def browser():
-    playwright = await async_playwright().start()
-    browser = await playwright.chromium.launch(headless=False)
-    yield browser
-    await browser.close()
-    await playwright.stop()
+async def context(browser_pool, auth_state, flow_snapshots, request):
+    # Tests marked `authenticated` start with a saved login instead of going through the form;
+    # tests marked `checkpoint` start further along, at a saved point of the org flow
+    options = {}
+    checkpoint = request.node.get_closest_marker("checkpoint")
+    marker = request.node.get_closest_marker("authenticated")
+    if checkpoint is not None:
+        snapshot = await flow_snapshots.get(checkpoint.args[0], *_credentials(checkpoint))
+        options["storage_state"] = snapshot["storage_state"]
+        request.node._checkpoint_url = snapshot["url"]
+    elif marker is not None:
+        options["storage_state"] = await auth_state.get(*_credentials(marker))
+    context, setup_time = await browser_pool.acquire(**options)
+    request.node._context_setup = setup_time
+    browser_log = BrowserLog(BROWSER_LOG_MAX_ENTRIES, BROWSER_LOG_MAX_KB * 1024, SLOW_REQUEST_MS).attach(context)
+    routing = await apply_profile(context, _routing_profile(request), request.config._resource_sizes)
+    # Live stats, for tests that check what their profile blocked
+    request.node._route_stats = routing
+    # Registered after the routing profile so cached responses are served before anything is blocked
+    await request.config._har.attach(context, request.config._run_id, safe_filename(request.node.nodeid))
+    yield context
+    rep = getattr(request.node, "rep_call", None)
+    if rep and rep.failed:
+        request.node._browser_log = browser_log.dump()
+    request.node._context_teardown = await browser_pool.release(context)
+    _record_routing(request, routing)
+
+
+def _routing_profile(request):
+    # @pytest.mark.routing("lean") or @pytest.mark.routing(block_patterns=["*/chat/*"]) override --routing-profile
+    marker = request.node.get_closest_marker("routing")
+    if marker is None:
+        return request.config._routing_profile
+    name = marker.args[0] if marker.args else None
+    base = get_profile(name) if name else request.config._routing_profile
+    return base.extend(**marker.kwargs)
+
+
+def _record_routing(request, routing):
+    summary = routing.summary()
+    request.node._routing = summary
+    request.config._learned_sizes.update(routing.learned)
+    totals = request.config._routing_totals
+    totals["tests"] += 1
+    for key in ("requests", "blocked", "stubbed", "bytes_saved"):
+        totals[key] += summary[key]
 
 
 @pytest.fixture
-async def page(browser):
-    page = await browser.new_page()
+async def page(context, request):
+    tracer = None
+    if request.config.getoption("--tracing") == "retain-on-failure":
+        tracer = ChunkedTracer(context, max_chunks=TRACE_MAX_CHUNKS, screenshots=TRACE_SCREENSHOTS)
+        await tracer.start()
+    page = await context.new_page()
+    recorder = SpanRecorder()
+    if tracer is not None:
+        # Each top-level page-object step gets its own trace chunk
+        recorder.listeners.append(tracer)
+    attach(page, recorder)
+    checkpoint_url = getattr(request.node, "_checkpoint_url", None)
+    if checkpoint_url:
+        await page.goto(checkpoint_url)
     yield page
+    # Wait timings, create_org retries, ... recorded by page objects during the test
+    request.node._page_metrics = page_metrics(page)
+    if recorder.spans:
+        trace_path = os.path.join(REPORT_DIR, "traces", f"{safe_filename(request.node.nodeid)}.trace.json")
+        recorder.write_chrome_trace(trace_path, label=request.node.nodeid)
+        request.config._archive.add(trace_path)
+        request.node._spans = {"spans": recorder.compact(), "trace": trace_path}
+    rep = getattr(request.node, "rep_call", None)
+    failed = bool(rep and rep.failed)
+    if failed:
+        request.node._failure_artifacts = await _capture_failure(request.node, page)
+    if tracer is not None:
+        target_dir = os.path.join(REPORT_DIR, "traces", safe_filename(request.node.nodeid))
+        chunks = await tracer.stop(keep=failed, target_dir=target_dir)
+        for chunk in chunks:
+            request.config._archive.add(chunk)
+        request.node._tracing = {"tracing_overhead": round(tracer.overhead * 1000, 1)}
+        if chunks:
+            request.node._tracing.update(playwright_trace=chunks, failed_step=tracer.failed_step or "")
+        totals = request.config._tracing_totals
+        totals["tests"] += 1
+        totals["seconds"] += tracer.overhead
+        totals["retained"] += len(chunks)
+        totals["call_seconds"] += getattr(rep, "duration", 0)
     await page.close()
 
 
+@pytest.fixture
+async def preconditions(context, org_names, request):
+    # Org state built through the backend API (UI as fallback); use with `authenticated` so the API calls are signed in
+    builder = Preconditions(
+        context.request,
+        WEBSITE_URL,
+        mode=request.config.getoption("--preconditions"),
+        name_allocator=org_names,
+        stats=request.config._preconditions,
+    )
+    yield builder
+    request.node._preconditions = builder.records
+
+
+@pytest.fixture(scope="session")
+def org_names(request):
+    # Unique per run and per xdist worker, so org names never collide
+    tag = request.config._run_id[-6:].upper()
+    if is_worker(request.config):
+        tag += worker_id(request.config).replace("gw", "W")
+    return OrgNameAllocator(tag)
+
+
+async def _capture_failure(node, page):
+    writer = node.config._screenshots
+    safe_name = safe_filename(node.nodeid)
+    ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+    screenshot_path = os.path.join(REPORT_DIR, f"{safe_name}-{ts}.png")
+    artifacts = {"screenshot": "", "page_url": ""}
+    try:
+        artifacts["page_url"] = page.url
+        if not writer.has_budget():
+            return {**artifacts, **writer.skip()}
+        # Only the capture runs here; writing, thumbnail and archiving happen on the writer thread
+        data = await page.screenshot(full_page=True)
+    except Exception:
+        # Page/context may already be closed; ignore screenshot errors
+        return artifacts
+    return {**artifacts, **writer.submit(data, screenshot_path)}
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     setattr(item, "rep_" + rep.when, rep)
-    results = getattr(item.config, "_test_results", [])
     if rep.when == "call":
-        entry = {
-            "nodeid": item.nodeid,
-            "outcome": rep.outcome,
-            "longrepr": str(rep.longrepr) if rep.failed else "",
-            "duration": getattr(rep, "duration", 0),
-            "start": datetime.utcnow().isoformat(),
-        }
-        results.append(entry)
-        item.config._test_results = results
+        item.config._results.record(
+            item.nodeid,
+            outcome=rep.outcome,
+            longrepr=str(rep.longrepr) if rep.failed else "",
+            duration=getattr(rep, "duration", 0),
+            start=datetime.utcnow().isoformat(),
+            context_setup=getattr(item, "_context_setup", 0),
+        )
 
 
 @pytest.fixture(autouse=True)
-async def screenshot_on_failure(request, page):
+async def screenshot_on_failure(request):
+    # The screenshot itself is taken by the `page` fixture before the page closes,
+    # so tests that never open a page don't pay for a browser context.
     yield
     rep = getattr(request.node, "rep_call", None)
-    results = getattr(request.config, "_test_results", [])
-    # find the entry for this test
-    entry = next((r for r in results if r.get("nodeid") == request.node.nodeid), None)
+    fields = {
+        "context_teardown": getattr(request.node, "_context_teardown", 0),
+        "metrics": getattr(request.node, "_page_metrics", {}),
+        "routing": getattr(request.node, "_routing", {}),
+        "preconditions": getattr(request.node, "_preconditions", []),
+        **getattr(request.node, "_spans", {}),
+        **getattr(request.node, "_tracing", {}),
+    }
     if rep and rep.failed:
-        safe_name = request.node.nodeid.replace("::", "_").replace("/", "_")
-        ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-        screenshot_path = os.path.join(REPORT_DIR, f"{safe_name}-{ts}.png")
-        page_url = ""
-        try:
-            page_url = page.url
-            await page.screenshot(path=screenshot_path, full_page=True)
-        except Exception:
-            # Page/context may already be closed; ignore screenshot errors
-            screenshot_path = ""
         # attach screenshot path and page URL to the results entry
-        if entry is not None:
-            entry["screenshot"] = screenshot_path
-            entry["page_url"] = page_url
-            entry["longrepr"] = entry.get("longrepr", "")
-        request.config._test_results = results
+        fields.update(getattr(request.node, "_failure_artifacts", {"screenshot": "", "page_url": ""}))
+        if hasattr(request.node, "_browser_log"):
+            fields["browser_log"] = request.node._browser_log
+    entry = request.config._results.finish(request.node.nodeid, **fields)
 
     # Always write per-test JSON (useful for CI)
     if entry is None:
         entry = {"nodeid": request.node.nodeid, "outcome": getattr(rep, "outcome", "unknown")}
-    per_test_path = os.path.join(REPORT_DIR, f"{request.node.name}.json")
+    per_test_path = os.path.join(REPORT_DIR, f"{safe_filename(request.node.nodeid)}.json")
     try:
         with open(per_test_path, "w", encoding="utf-8") as pf:
-            json.dump(entry, pf, indent=2)
+            json.dump(entry, pf, separators=(",", ":"))
+        request.config._archive.add(per_test_path)
     except Exception:
         pass
 
 
-def _format_duration(s):
-    try:
-        return f"{s:.2f}s"
-    except Exception:
-        return str(s)
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    pool = getattr(config, "_browser_pool", None)
+    if pool is not None:
+        terminalreporter.write_sep("-", "browser pool")
+        terminalreporter.write_line(pool.summary())
+    auth = getattr(config, "_auth_state", None)
+    if auth is not None:
+        terminalreporter.write_line(auth.summary())
+    snapshots = getattr(config, "_flow_snapshots", None)
+    if snapshots is not None:
+        terminalreporter.write_line(snapshots.summary())
+    preconditions = config._preconditions.summary()
+    if preconditions:
+        terminalreporter.write_sep("-", "preconditions")
+        terminalreporter.write_line(preconditions)
+    tracing = _tracing_summary(config)
+    if tracing:
+        terminalreporter.write_sep("-", "tracing")
+        terminalreporter.write_line(tracing)
+    if config._har.mode != "off" and not is_worker(config):
+        terminalreporter.write_sep("-", "HAR cache")
+        terminalreporter.write_line(config._har.summary())
+    routing = config._routing_totals
+    if routing["tests"]:
+        terminalreporter.write_sep("-", f"routing ({config._routing_profile.name})")
+        terminalreporter.write_line(
+            f"{routing['requests']} requests in {routing['tests']} tests | {routing['blocked']} blocked, "
+            f"{routing['stubbed']} stubbed | ~{format_bytes(routing['bytes_saved'])} saved"
+        )
+    learned = {name: step for name, step in timeout_policy.stats().items() if step["timeout_ms"] is not None}
+    if learned:
+        terminalreporter.write_sep("-", "adaptive timeouts")
+        for name, step in sorted(learned.items()):
+            timed_out = f" | {step['timeouts']} timed out" if step["timeouts"] else ""
+            terminalreporter.write_line(
+                f"{name}: p99 {step['p99_ms']:.0f}ms over {step['samples']} runs "
+                f"-> timeout {step['timeout_ms']:.0f}ms{timed_out}"
+            )
+    stats = selector_cache.stats()
+    if stats:
+        terminalreporter.write_sep("-", "selector cache")
+        for key, field in sorted(stats.items()):
+            dead = f" | never matched: {', '.join(field['dead'])}" if field["dead"] else ""
+            terminalreporter.write_line(f"{key}: {field['hits']} hits, {field['misses']} misses{dead}")
+
+
+def _tracing_summary(config):
+    totals = config._tracing_totals
+    if not totals["tests"]:
+        return ""
+    share = totals["seconds"] / totals["call_seconds"] * 100 if totals["call_seconds"] else 0.0
+    return (
+        f"Tracing: {totals['seconds']:.2f}s in tracing calls over {totals['tests']} tests "
+        f"({totals['seconds'] / totals['tests'] * 1000:.0f}ms/test, {share:.1f}% of test time) | "
+        f"{totals['retained']} chunks kept for failures"
+    )
 
 
 def pytest_sessionfinish(session, exitstatus):
-    results = getattr(session.config, "_test_results", [])
-    report_path = os.path.join(REPORT_DIR, "report.html")
-    now = datetime.now().isoformat()
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write("<!doctype html><html><head><meta charset='utf-8'><title>Test Report</title>")
-        f.write("<style>body{font-family:Arial,Helvetica,sans-serif;padding:18px}table{border-collapse:collapse;width:100%}th,td{border:1px solid #ddd;padding:8px}th{background:#f4f6f8}tr.fail{background:#ffecec}tr.pass{background:#ecffec}details{margin-top:6px}</style>")
-        f.write("</head><body>")
-        f.write(f"<h1>Test Report</h1><p>Run at: {escape(now)}</p>")
-        f.write(f"<p>Total tests: {len(results)} | Exit status: {exitstatus}</p>")
-        f.write("<table>")
-        f.write("<tr><th>Test</th><th>Result</th><th>Duration</th><th>Page</th><th>Screenshot</th></tr>")
-        for r in results:
-            nodeid = escape(r.get("nodeid", ""))
-            outcome = r.get("outcome", "")
-            duration = _format_duration(r.get("duration", 0))
-            page_url = escape(r.get("page_url", ""))
-            screenshot = r.get("screenshot", "")
-            row_class = "pass" if outcome == "passed" else "fail" if outcome == "failed" else ""
-            f.write(f"<tr class='{row_class}'>")
-            f.write(f"<td>{nodeid}</td>")
-            f.write(f"<td>{outcome}</td>")
-            f.write(f"<td>{duration}</td>")
-            if page_url:
-                f.write(f"<td><a href='{page_url}' target='_blank'>open</a></td>")
-            else:
-                f.write("<td>-</td>")
-            if screenshot:
-                rel = os.path.relpath(screenshot, REPORT_DIR)
-                f.write(f"<td><a href='./{rel}' target='_blank'><img src='./{rel}' style='height:60px'></a></td>")
-            else:
-                f.write("<td>-</td>")
-            f.write("</tr>")
-            if r.get("longrepr"):
-                f.write("<tr><td colspan='5'><details><summary>Failure details</summary><pre>")
-                f.write(escape(r.get("longrepr")))
-                f.write("</pre></details></td></tr>")
-        f.write("</table></body></html>")
-
-    # Zip the report directory for easy download
+    config = session.config
+    pool = getattr(config, "_browser_pool", None)
+    config._results.close()
+    # Drain pending screenshot writes first; they still queue files for the archive
+    config._screenshots.close()
+    config._archive.close()
+    selector_cache.save()
+    timeout_policy.save()
+    if config._learned_sizes and getattr(config, "cache", None) is not None:
+        # Read-merge-write so parallel workers keep each other's sizes
+        sizes = config.cache.get(RESOURCE_SIZES_CACHE_KEY, {})
+        sizes.update(config._learned_sizes)
+        config.cache.set(RESOURCE_SIZES_CACHE_KEY, sizes)
+    if config._preconditions.new_samples and getattr(config, "cache", None) is not None:
+        saved = config.cache.get(PRECONDITION_BASELINE_CACHE_KEY, {})
+        config.cache.set(PRECONDITION_BASELINE_CACHE_KEY, config._preconditions.merged_history(saved))
+    write_shard_meta(
+        REPORT_DIR,
+        config._run_id,
+        worker_id(config),
+        {
+            "pool": pool.summary() if pool is not None else "",
+            "archive": config._archive.summary(),
+            "screenshots": config._screenshots.summary(),
+            "tracing": _tracing_summary(config),
+            "preconditions": config._preconditions.summary(),
+            "archive_aliases": config._archive.aliases,
+        },
+    )
+    if is_worker(config):
+        # The controller merges every worker's shard into the single report
+        return
+
+    metas = load_shard_meta(REPORT_DIR, config._run_id)
+    if config._har.mode == "record":
+        config._har.merge_recordings(config._run_id)
+    if getattr(config, "cache", None) is not None:
+        history = config.cache.get(DURATIONS_CACHE_KEY, {})
+        config.cache.set(DURATIONS_CACHE_KEY, update_durations(history, iter_results(REPORT_DIR, config._run_id)))
+
+    # Combine the per-process archives first so report links can point at deduplicated files
     zip_path = os.path.join(REPORT_DIR, "report.zip")
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for root, _, files in os.walk(REPORT_DIR):
-            for file in files:
-                if file == os.path.basename(zip_path):
-                    continue
-                full = os.path.join(root, file)
-                arcname = os.path.relpath(full, REPORT_DIR)
-                zf.write(full, arcname)
+    aliases = {}
+    for meta in metas:
+        aliases.update(meta.get("archive_aliases", {}))
+    aliases = combine_archives(
+        [os.path.join(shard_dir(REPORT_DIR, config._run_id), f"{meta['worker']}.zip") for meta in metas],
+        zip_path,
+        aliases,
+    )
+
+    report_files = write_report(
+        REPORT_DIR,
+        iter_results(REPORT_DIR, config._run_id),
+        exitstatus=exitstatus,
+        metas=metas,
+        aliases=aliases,
+        run_id=config._run_id,
+        history_path=REPORT_HISTORY,
+        wall_seconds=time.perf_counter() - config._started,
+    )
+    append_files(zip_path, REPORT_DIR, report_files)
@@ -0,0 +1,136 @@
+"""
+Incremental, compression-aware report archiving.
+
+Artifacts are queued as soon as a test produces them and written to a
+per-process zip by a background thread, so nothing is left to compress when
+the session ends. Formats that are already compressed (PNG, JPEG, video, zip)
+are stored as-is, and files with identical content are stored once.
+
+At session end the controller combines the per-process archives into
+report.zip, again skipping content it has already seen.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import queue
+import threading
+import time
+import zipfile
+
+# Re-deflating these costs CPU and saves next to nothing
+STORED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".webm", ".mp4", ".zip", ".gz", ".woff2"}
+
+
+def compression_for(path: str) -> int:
+    ext = os.path.splitext(path)[1].lower()
+    return zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+class IncrementalArchive:
+    def __init__(self, path: str, root: str):
+        self.path = path
+        self.root = root
+        # sha256 -> arcname of the first copy; duplicate arcname -> that arcname
+        self.hashes: dict[str, str] = {}
+        self.aliases: dict[str, str] = {}
+        self.stats = {"files": 0, "duplicates": 0, "bytes": 0, "seconds": 0.0}
+        self._queue: queue.Queue = queue.Queue()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="report-archiver", daemon=True)
+        self._thread.start()
+
+    def add(self, path: str):
+        """Queue a file for archiving; returns immediately."""
+        if path:
+            self._queue.put(path)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        with zipfile.ZipFile(self.path, "w") as zf:
+            while True:
+                path = self._queue.get()
+                if path is None:
+                    break
+                started = time.perf_counter()
+                try:
+                    self._write(zf, path)
+                except OSError:
+                    # The artifact was never written (e.g. screenshot of a closed page)
+                    pass
+                self.stats["seconds"] += time.perf_counter() - started
+
+    def _write(self, zf: zipfile.ZipFile, path: str):
+        arcname = os.path.relpath(path, self.root).replace(os.sep, "/")
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in self.hashes:
+            if self.hashes[digest] != arcname:
+                self.aliases[arcname] = self.hashes[digest]
+                self.stats["duplicates"] += 1
+            return
+        self.hashes[digest] = arcname
+        info = zipfile.ZipInfo(arcname, date_time=time.localtime(os.path.getmtime(path))[:6])
+        info.compress_type = compression_for(path)
+        # Keep the content hash so archives can be combined without re-hashing
+        info.comment = digest.encode("ascii")
+        zf.writestr(info, data)
+        self.stats["files"] += 1
+        self.stats["bytes"] += len(data)
+
+    def summary(self) -> str:
+        return (
+            f"Archived {self.stats['files']} files ({self.stats['bytes'] / 1e6:.1f} MB, "
+            f"{self.stats['duplicates']} duplicates skipped) in {self.stats['seconds']:.2f}s of background time"
+        )
+
+
+def combine_archives(sources: list[str], target: str, aliases: dict[str, str] | None = None) -> dict[str, str]:
+    """Build `target` from per-process archives and return the merged alias map.
+
+    With a single source (a serial run) the archive is moved into place instead
+    of being copied.
+    """
+    aliases = dict(aliases or {})
+    sources = [s for s in sources if os.path.exists(s)]
+    if len(sources) == 1:
+        os.replace(sources[0], target)
+        return aliases
+    seen: dict[str, str] = {}
+    with zipfile.ZipFile(target, "w") as out:
+        for source in sources:
+            with zipfile.ZipFile(source) as zin:
+                for info in zin.infolist():
+                    digest = info.comment.decode("ascii")
+                    if digest and digest in seen:
+                        if seen[digest] != info.filename:
+                            aliases[info.filename] = seen[digest]
+                        continue
+                    seen[digest] = info.filename
+                    copy = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    copy.compress_type = info.compress_type
+                    copy.comment = info.comment
+                    out.writestr(copy, zin.read(info))
+    return aliases
+
+
+def resolve(aliases: dict[str, str], arcname: str) -> str:
+    seen = set()
+    while arcname in aliases and arcname not in seen:
+        seen.add(arcname)
+        arcname = aliases[arcname]
+    return arcname
+
+
+def append_files(target: str, root: str, paths: list[str]):
+    """Add end-of-session files (report.html, ...) to an existing archive."""
+    mode = "a" if os.path.exists(target) else "w"
+    with zipfile.ZipFile(target, mode) as zf:
+        for path in paths:
+            if os.path.exists(path):
+                arcname = os.path.relpath(path, root).replace(os.sep, "/")
+                zf.write(path, arcname, compress_type=compression_for(path))
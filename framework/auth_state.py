@@ -0,0 +1,103 @@
+"""
+Authenticated storage-state cache.
+
+Logs in through the UI once per email, saves the Playwright storage state
+(cookies + localStorage) to disk and hands it to new contexts so tests start
+already signed in. Saved states expire after a TTL, when any of their cookies
+expire, or when the first reuse in a session lands back on the login page.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+from pages.login_page import LoginPage
+
+
+def is_state_fresh(state: dict) -> bool:
+    """True if a Playwright storage state has content and none of its cookies have expired."""
+    cookies = state.get("cookies", [])
+    if not cookies and not state.get("origins"):
+        return False
+    now = time.time()
+    # Session cookies have expires == -1 and are fine to reuse
+    return all(c.get("expires", -1) < 0 or c["expires"] > now for c in cookies)
+
+
+class AuthStateCache:
+    def __init__(self, pool, base_url: str, state_dir: str = ".auth", ttl: int = 3600):
+        self.pool = pool
+        self.base_url = base_url
+        self.state_dir = state_dir
+        self.ttl = ttl
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Emails whose on-disk state has been checked against the live app this session
+        self._verified: set[str] = set()
+        self.stats = {"hits": 0, "logins": 0, "login_time": 0.0}
+
+    def path_for(self, email: str) -> str:
+        host = urlparse(self.base_url).netloc or self.base_url
+        digest = hashlib.sha1(f"{host}|{email.lower()}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.state_dir, f"{digest}.json")
+
+    def is_valid(self, path: str) -> bool:
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return age <= self.ttl and is_state_fresh(state)
+
+    async def get(self, email: str, password: str) -> str:
+        """Return a path to a valid storage state for `email`, logging in if needed."""
+        lock = self._locks.setdefault(email, asyncio.Lock())
+        async with lock:
+            path = self.path_for(email)
+            if self.is_valid(path) and (email in self._verified or await self._still_logged_in(path)):
+                self._verified.add(email)
+                self.stats["hits"] += 1
+                return path
+            await self._login(email, password, path)
+            self._verified.add(email)
+            return path
+
+    async def _still_logged_in(self, path: str) -> bool:
+        context, _ = await self.pool.acquire(storage_state=path)
+        try:
+            page = await context.new_page()
+            await page.goto(self.base_url)
+            return "login" not in page.url.lower()
+        except Exception:
+            return False
+        finally:
+            await self.pool.release(context)
+
+    async def _login(self, email: str, password: str, path: str):
+        started = time.perf_counter()
+        context, _ = await self.pool.acquire()
+        try:
+            page = await context.new_page()
+            login_page = LoginPage(page, base_url=self.base_url)
+            await login_page.go_to_login_page()
+            await login_page.login(email, password)
+            await login_page.wait_until_signed_in()
+            os.makedirs(self.state_dir, exist_ok=True)
+            # Write to a temp file first so a parallel reader never sees a half-written state
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            await context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            await self.pool.release(context)
+        self.stats["logins"] += 1
+        self.stats["login_time"] += time.perf_counter() - started
+
+    def summary(self) -> str:
+        return (
+            f"Auth state: {self.stats['hits']} reused, {self.stats['logins']} UI logins "
+            f"({self.stats['login_time']:.2f}s)"
+        )
@@ -0,0 +1,90 @@
+"""
+Bounded console and network log per browser context.
+
+Records what the browser said while a test ran:
+- console messages
+- uncaught page errors
+- requests that failed or got an HTTP error status
+- requests slower than a threshold
+
+Entries go into a ring buffer capped by count and by bytes. Once the buffer is
+full, the oldest entries are dropped, so a chatty page can't grow it without
+limit. Each event handler only copies a few strings, and the buffer is thrown
+away with the context unless the test failed. Passing tests pay close to
+nothing.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+
+from playwright.async_api import BrowserContext
+
+# Longest text kept for one entry
+MAX_TEXT = 500
+# Rough per-entry cost on top of the text, counted against the byte cap
+ENTRY_OVERHEAD = 48
+
+
+class BrowserLog:
+    def __init__(self, max_entries: int = 200, max_bytes: int = 64 * 1024, slow_request_ms: float = 1000.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # 0 = don't record slow requests
+        self.slow_request_ms = slow_request_ms
+        self.entries: deque[tuple[float, str, str]] = deque()
+        self.bytes = 0
+        self.dropped = 0
+        self._started = time.perf_counter()
+
+    def attach(self, context: BrowserContext) -> "BrowserLog":
+        # Context-level events cover every page the test opens; the handlers go away with the context
+        context.on("console", self._on_console)
+        context.on("weberror", self._on_web_error)
+        context.on("requestfailed", self._on_request_failed)
+        context.on("response", self._on_response)
+        if self.slow_request_ms:
+            context.on("requestfinished", self._on_request_finished)
+        return self
+
+    def add(self, kind: str, text: str):
+        text = text[:MAX_TEXT]
+        size = len(text) + ENTRY_OVERHEAD
+        while self.entries and (len(self.entries) >= self.max_entries or self.bytes + size > self.max_bytes):
+            _, _, old = self.entries.popleft()
+            self.bytes -= len(old) + ENTRY_OVERHEAD
+            self.dropped += 1
+        self.entries.append((round((time.perf_counter() - self._started) * 1000, 1), kind, text))
+        self.bytes += size
+
+    def dump(self) -> dict:
+        """The buffer as JSON-ready data for the per-test results."""
+        return {
+            "entries": [{"ms": ms, "kind": kind, "text": text} for ms, kind, text in self.entries],
+            "dropped": self.dropped,
+        }
+
+    def _on_console(self, message):
+        location = message.location or {}
+        where = f" ({location['url']}:{location.get('lineNumber', 0)})" if location.get("url") else ""
+        self.add(f"console.{message.type}", message.text + where)
+
+    def _on_web_error(self, web_error):
+        self.add("pageerror", str(web_error.error))
+
+    def _on_request_failed(self, request):
+        failure = request.failure or ""
+        # Blocked on purpose by the routing profile; not something the app did
+        if "ERR_BLOCKED_BY_CLIENT" in failure:
+            return
+        self.add("requestfailed", f"{request.method} {request.url} {failure}")
+
+    def _on_response(self, response):
+        if response.status >= 400:
+            self.add("http", f"{response.status} {response.request.method} {response.url}")
+
+    def _on_request_finished(self, request):
+        # Milliseconds from the request start to the last byte; -1 when the browser has no timing
+        elapsed = request.timing.get("responseEnd", -1)
+        if elapsed >= self.slow_request_ms:
+            self.add("slow", f"{request.method} {request.url} {elapsed:.0f}ms")
@@ -0,0 +1,121 @@
+"""
+Session-scoped browser with pre-warmed, per-test BrowserContexts.
+
+One Playwright driver and one Chromium process live for the whole session (one
+per worker when running in parallel). Every test gets its own BrowserContext,
+which gives cookie/storage isolation at a fraction of the cost of a new browser.
+A small number of contexts are created in the background so the next test
+usually finds one ready.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        headless: bool = False,
+        prewarm: int = 2,
+        launch_options: dict | None = None,
+        context_options: dict | None = None,
+        playwright: Playwright | None = None,
+    ):
+        self.headless = headless
+        self.prewarm = prewarm
+        self.launch_options = launch_options or {}
+        self.context_options = context_options or {}
+        # A driver passed in is shared with other pools and left running on close()
+        self.playwright: Playwright | None = playwright
+        self._owns_playwright = playwright is None
+        self.browser: Browser | None = None
+        self._warm: deque[asyncio.Task] = deque()
+        self.stats = {
+            "launch": 0.0,
+            "contexts": 0,
+            "warm_hits": 0,
+            "setup": 0.0,
+            "teardown": 0.0,
+        }
+
+    async def start(self) -> "BrowserPool":
+        started = time.perf_counter()
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless, **self.launch_options)
+        self.stats["launch"] = time.perf_counter() - started
+        self._refill()
+        return self
+
+    def _refill(self):
+        while len(self._warm) < self.prewarm:
+            self._warm.append(asyncio.ensure_future(self.browser.new_context(**self.context_options)))
+
+    async def _take_warm(self) -> BrowserContext | None:
+        while self._warm:
+            task = self._warm.popleft()
+            try:
+                return await task
+            except Exception:
+                # A pre-warmed context failed to start; try the next one or fall back to a fresh one
+                continue
+        return None
+
+    async def acquire(self, **options) -> tuple[BrowserContext, float]:
+        """Return a fresh context and the seconds it took to hand it out.
+
+        Contexts with custom options (storage state, viewport, ...) cannot come
+        from the warm queue and are created on demand.
+        """
+        started = time.perf_counter()
+        context = None
+        if not options:
+            context = await self._take_warm()
+            if context is not None:
+                self.stats["warm_hits"] += 1
+        if context is None:
+            context = await self.browser.new_context(**{**self.context_options, **options})
+        self._refill()
+        elapsed = time.perf_counter() - started
+        self.stats["contexts"] += 1
+        self.stats["setup"] += elapsed
+        return context, elapsed
+
+    async def release(self, context: BrowserContext) -> float:
+        started = time.perf_counter()
+        try:
+            await context.close()
+        except Exception:
+            # Context may already be closed (browser crash, test closed it)
+            pass
+        elapsed = time.perf_counter() - started
+        self.stats["teardown"] += elapsed
+        return elapsed
+
+    async def close(self):
+        while self._warm:
+            task = self._warm.popleft()
+            if not task.done():
+                task.cancel()
+            try:
+                context = await task
+                await context.close()
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self.browser is not None:
+            await self.browser.close()
+        if self.playwright is not None and self._owns_playwright:
+            await self.playwright.stop()
+
+    def summary(self) -> str:
+        contexts = self.stats["contexts"] or 1
+        return (
+            f"Browser launch: {self.stats['launch']:.2f}s | "
+            f"Contexts: {self.stats['contexts']} ({self.stats['warm_hits']} pre-warmed) | "
+            f"Avg setup: {self.stats['setup'] / contexts * 1000:.0f}ms | "
+            f"Avg teardown: {self.stats['teardown'] / contexts * 1000:.0f}ms"
+        )
@@ -0,0 +1,181 @@
+"""
+Flow-state snapshots: start a test part-way through the org flow.
+
+A snapshot is the storage state and URL captured once the flow reaches a
+checkpoint:
+- welcome
+- create-organization
+- setup (an organization created and waiting for its setup form)
+
+Snapshots are saved per environment and user under FLOW_STATE_DIR. A test
+marked `@pytest.mark.checkpoint("setup")` gets a context built from the
+snapshot and a page already at its URL. It skips the login, welcome and org
+creation steps that lead there.
+
+Each checkpoint is built from the one before it, so rebuilding "setup" only
+repeats org creation. A snapshot is rebuilt when:
+- it is older than the TTL,
+- one of its cookies has expired, or
+- its first reuse in a session no longer lands on the checkpoint (for
+  example, the org was set up by hand).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from urllib.parse import urlparse
+
+from framework.auth_state import is_state_fresh
+from pages.org_page import OrgPage
+
+CHECKPOINTS = ("welcome", "create-organization", "setup")
+
+# URL fragment and OrgPage element that show the page is at a checkpoint
+_CHECKPOINT_URLS = {
+    "welcome": "/welcome",
+    "create-organization": "/organization/create-organization",
+    "setup": "/organization/setup/",
+}
+_CHECKPOINT_ELEMENTS = {
+    "welcome": "start_button",
+    "create-organization": "org_name_input",
+    "setup": "address_input",
+}
+
+
+class FlowSnapshotCache:
+    def __init__(
+        self,
+        pool,
+        auth_state,
+        base_url: str,
+        state_dir: str = ".flow_state",
+        ttl: int = 3600,
+        name_allocator=None,
+        org_prefix: str = "Snapshot Org",
+    ):
+        self.pool = pool
+        self.auth_state = auth_state
+        self.base_url = base_url.rstrip("/")
+        self.state_dir = state_dir
+        self.ttl = ttl
+        self.name_allocator = name_allocator
+        self.org_prefix = org_prefix
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Snapshot paths checked against the live app this session
+        self._verified: set[str] = set()
+        self.stats = {"hits": 0, "builds": 0, "rebuilds": 0, "build_time": 0.0}
+
+    def path_for(self, checkpoint: str, email: str) -> str:
+        host = urlparse(self.base_url).netloc or self.base_url
+        digest = hashlib.sha1(f"{host}|{email.lower()}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.state_dir, digest, f"{checkpoint}.json")
+
+    def load(self, path: str) -> dict | None:
+        """The saved snapshot, or None if it is missing, expired or its cookies have expired."""
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if age > self.ttl or not snapshot.get("url") or not is_state_fresh(snapshot.get("storage_state", {})):
+            return None
+        return snapshot
+
+    async def get(self, checkpoint: str, email: str, password: str) -> dict:
+        """Return {"checkpoint", "url", "storage_state", ...} for `checkpoint`, building it if needed."""
+        if checkpoint not in CHECKPOINTS:
+            raise ValueError(f"Unknown checkpoint {checkpoint!r}; choose from {', '.join(CHECKPOINTS)}")
+        path = self.path_for(checkpoint, email)
+        async with self._locks.setdefault(path, asyncio.Lock()):
+            snapshot = self.load(path)
+            if snapshot is not None:
+                if path in self._verified or await self._still_valid(checkpoint, snapshot):
+                    self._verified.add(path)
+                    self.stats["hits"] += 1
+                    return snapshot
+            if os.path.exists(path):
+                self.stats["rebuilds"] += 1
+            snapshot = await self._build(checkpoint, email, password)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so a parallel reader never sees a half-written snapshot
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, path)
+            self._verified.add(path)
+            return snapshot
+
+    def invalidate(self, checkpoint: str, email: str):
+        """Forget a snapshot, e.g. after a test moved its org past the checkpoint."""
+        path = self.path_for(checkpoint, email)
+        self._verified.discard(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    async def at_checkpoint(self, org_page: OrgPage, checkpoint: str) -> bool:
+        if _CHECKPOINT_URLS[checkpoint] not in org_page.page.url:
+            return False
+        locator = getattr(org_page, _CHECKPOINT_ELEMENTS[checkpoint])
+        return await org_page.wait_until_element(f"flow.{checkpoint}_ready", locator, required=False)
+
+    async def _still_valid(self, checkpoint: str, snapshot: dict) -> bool:
+        context, _ = await self.pool.acquire(storage_state=snapshot["storage_state"])
+        try:
+            page = await context.new_page()
+            await page.goto(snapshot["url"])
+            return await self.at_checkpoint(OrgPage(page, welcome_url=f"{self.base_url}/welcome"), checkpoint)
+        except Exception:
+            return False
+        finally:
+            await self.pool.release(context)
+
+    def _org_name(self) -> str:
+        if self.name_allocator is not None:
+            return self.name_allocator.allocate(self.org_prefix)
+        return f"{self.org_prefix} {uuid.uuid4().hex[:6].upper()}"
+
+    async def _build(self, checkpoint: str, email: str, password: str) -> dict:
+        index = CHECKPOINTS.index(checkpoint)
+        if index == 0:
+            storage_state = await self.auth_state.get(email, password)
+            start_url = f"{self.base_url}/welcome"
+        else:
+            # Resume from the previous checkpoint instead of walking the whole flow again
+            previous = await self.get(CHECKPOINTS[index - 1], email, password)
+            storage_state, start_url = previous["storage_state"], previous["url"]
+
+        started = time.perf_counter()
+        context, _ = await self.pool.acquire(storage_state=storage_state)
+        try:
+            page = await context.new_page()
+            await page.goto(start_url)
+            org_page = OrgPage(page, welcome_url=f"{self.base_url}/welcome", name_allocator=self.name_allocator)
+            snapshot = {"checkpoint": checkpoint}
+            if checkpoint == "welcome":
+                await org_page.wait_until_url("org.welcome_url", "**/welcome")
+            elif checkpoint == "create-organization":
+                await org_page.click_start_on_welcome()
+                await org_page.wait_until_url("org.create_url", "**/organization/create-organization")
+            else:
+                snapshot["org_name"] = self._org_name()
+                await org_page.create_org(snapshot["org_name"])
+            snapshot.update(url=page.url, storage_state=await context.storage_state(), created=time.time())
+        finally:
+            await self.pool.release(context)
+        self.stats["builds"] += 1
+        self.stats["build_time"] += time.perf_counter() - started
+        return snapshot
+
+    def summary(self) -> str:
+        return (
+            f"Flow snapshots: {self.stats['hits']} reused, {self.stats['builds']} built "
+            f"({self.stats['rebuilds']} rebuilt after going stale) in {self.stats['build_time']:.1f}s"
+        )
@@ -0,0 +1,196 @@
+"""
+HAR record/replay cache for static assets and selected API responses.
+
+Record mode (`--har record`) has Playwright write one HAR per test context.
+At the end of the run the cacheable entries (successful GETs of scripts,
+stylesheets, fonts, images, plus API URLs matching HAR_API_PATTERNS) are merged
+into HAR_DIR/cache.har, with bodies stored next to it as content-addressed
+files. Replay mode (`--har replay`) serves matching requests from that cache
+and lets everything else (documents, POSTs, unknown URLs) go to the network.
+
+Before a replay run, each cached body is re-downloaded once and its sha256
+compared with the recorded one. Entries whose content changed are dropped.
+If the app is unreachable, the cache is used as-is (offline runs).
+"""
+from __future__ import annotations
+
+import base64
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from playwright.async_api import BrowserContext
+
+MODES = ("off", "record", "replay")
+
+STATIC_MIME_TYPES = (
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "application/x-javascript",
+    "application/wasm",
+    "font/",
+    "application/font",
+    "image/",
+)
+
+# Parallel downloads when checking cached bodies against the live app
+VERIFY_WORKERS = 8
+VERIFY_TIMEOUT = 10
+
+
+def _fetch(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=VERIFY_TIMEOUT) as response:
+        return response.read()
+
+
+class HarCache:
+    def __init__(self, har_dir: str = ".har", mode: str = "off", api_patterns: tuple[str, ...] | list[str] = ()):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HAR mode {mode!r}; choose from {', '.join(MODES)}")
+        self.har_dir = har_dir
+        self.mode = mode
+        self.api_patterns = tuple(api_patterns)
+        self.path = os.path.join(har_dir, "cache.har")
+        self.manifest_path = os.path.join(har_dir, "manifest.json")
+        self.stats = {"entries": 0, "recorded": 0, "checked": 0, "stale": 0, "offline": False}
+
+    def recording_dir(self, run_id: str) -> str:
+        return os.path.join(self.har_dir, "recordings", run_id)
+
+    def is_cacheable(self, entry: dict) -> bool:
+        request, response = entry["request"], entry["response"]
+        if request["method"] != "GET" or response["status"] != 200:
+            return False
+        if any(fnmatch.fnmatchcase(request["url"], pattern) for pattern in self.api_patterns):
+            return True
+        mime = response.get("content", {}).get("mimeType", "").lower()
+        return mime.startswith(STATIC_MIME_TYPES)
+
+    async def attach(self, context: BrowserContext, run_id: str, name: str):
+        """Record into or replay from the cache for one test context."""
+        if self.mode == "record":
+            path = os.path.join(self.recording_dir(run_id), f"{name}.har")
+            # Written by Playwright when the context closes
+            await context.route_from_har(path, update=True, update_content="attach", update_mode="minimal")
+        elif self.mode == "replay" and os.path.exists(self.path):
+            await context.route_from_har(self.path, not_found="fallback")
+
+    def _load(self, path: str) -> list[dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["log"]["entries"]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _body(self, entry: dict, base_dir: str) -> bytes | None:
+        content = entry["response"].get("content", {})
+        if "_file" in content:
+            try:
+                with open(os.path.join(base_dir, content["_file"]), "rb") as f:
+                    return f.read()
+            except OSError:
+                return None
+        if "text" in content:
+            if content.get("encoding") == "base64":
+                return base64.b64decode(content["text"])
+            return content["text"].encode("utf-8")
+        return None
+
+    def _write(self, entries: list[dict], manifest: dict):
+        os.makedirs(self.har_dir, exist_ok=True)
+        creator = {"name": "construct-har-cache", "version": "1"}
+        har = {"log": {"version": "1.2", "creator": creator, "entries": entries}}
+        for path, data in ((self.path, har), (self.manifest_path, manifest)):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, path)
+        self.stats["entries"] = len(entries)
+
+    def load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def merge_recordings(self, run_id: str) -> int:
+        """Fold this run's per-test HARs into the cache; returns entries added or refreshed."""
+        recording_dir = self.recording_dir(run_id)
+        entries = {(e["request"]["method"], e["request"]["url"]): e for e in self._load(self.path)}
+        manifest = self.load_manifest()
+        recorded = 0
+        for har_path in sorted(glob.glob(os.path.join(recording_dir, "*.har"))):
+            for entry in self._load(har_path):
+                if not self.is_cacheable(entry):
+                    continue
+                body = self._body(entry, recording_dir)
+                if body is None:
+                    continue
+                digest = hashlib.sha256(body).hexdigest()
+                # Bodies are stored once per content hash, shared by every entry that has it
+                file_name = digest[:40] + os.path.splitext(entry["response"]["content"].get("_file", ""))[1]
+                file_path = os.path.join(self.har_dir, file_name)
+                if not os.path.exists(file_path):
+                    os.makedirs(self.har_dir, exist_ok=True)
+                    with open(file_path, "wb") as f:
+                        f.write(body)
+                content = {k: v for k, v in entry["response"]["content"].items() if k not in ("text", "encoding")}
+                content["_file"] = file_name
+                entry["response"]["content"] = content
+                url = entry["request"]["url"]
+                entries[(entry["request"]["method"], url)] = entry
+                manifest[url] = {"sha256": digest, "file": file_name, "recorded": entry.get("startedDateTime", "")}
+                recorded += 1
+        self._write(list(entries.values()), manifest)
+        shutil.rmtree(recording_dir, ignore_errors=True)
+        self.stats["recorded"] = recorded
+        return recorded
+
+    def check_staleness(self, fetch=_fetch) -> dict:
+        """Drop entries whose live content no longer matches the recorded hash."""
+        manifest = self.load_manifest()
+        entries = self._load(self.path)
+        self.stats["entries"] = len(entries)
+        if not manifest:
+            return self.stats
+
+        def live_digest(url):
+            # (url, sha256 or None, reachable)
+            try:
+                return url, hashlib.sha256(fetch(url)).hexdigest(), True
+            except urllib.error.HTTPError:
+                # Reachable but refused (auth-only API, ...): can't verify, keep it
+                return url, None, True
+            except (urllib.error.URLError, OSError):
+                return url, None, False
+
+        with ThreadPoolExecutor(VERIFY_WORKERS) as executor:
+            results = list(executor.map(live_digest, manifest))
+        if not any(reachable for _, _, reachable in results):
+            self.stats["offline"] = True
+            return self.stats
+        verified = {url: digest for url, digest, _ in results if digest is not None}
+        stale = {url for url, digest in verified.items() if digest != manifest[url]["sha256"]}
+        self.stats["checked"] = len(verified)
+        self.stats["stale"] = len(stale)
+        if stale:
+            entries = [e for e in entries if e["request"]["url"] not in stale]
+            self._write(entries, {url: info for url, info in manifest.items() if url not in stale})
+        return self.stats
+
+    def summary(self) -> str:
+        if self.mode == "record":
+            return f"HAR cache (record): {self.stats['recorded']} responses recorded, {self.stats['entries']} cached"
+        offline = " | app unreachable, cache used unverified" if self.stats["offline"] else ""
+        return (
+            f"HAR cache (replay): {self.stats['entries']} cached responses | "
+            f"{self.stats['checked']} verified, {self.stats['stale']} stale dropped{offline}"
+        )
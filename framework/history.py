@@ -0,0 +1,75 @@
+"""
+Append-only index of past runs, for per-test trends in the report.
+
+Each finished run adds one JSON line: the run's totals plus the outcome and
+duration of every test. Old runs are never rewritten. The report reads the last
+HISTORY_WINDOW lines, so it can show how a test's duration and pass rate
+changed without opening old report zips. It reads backwards from the end of
+the file, so the cost depends on the window, not on how long the history has
+grown. Lines are only ever added at the end, so a torn last line (crash
+mid-write) is skipped, and it doesn't break the lines before it.
+"""
+from __future__ import annotations
+
+import json
+import os
+
+# Runs shown in the report's trends
+HISTORY_WINDOW = 20
+
+# One letter per outcome keeps a line per run small
+OUTCOME_CODES = {"passed": "p", "failed": "f", "skipped": "s"}
+
+# Bytes read per step when walking the history backwards
+READ_BLOCK = 64 * 1024
+
+
+def outcome_code(outcome: str) -> str:
+    return OUTCOME_CODES.get(outcome, "?")
+
+
+def read_recent_runs(path: str, window: int = HISTORY_WINDOW) -> list[dict]:
+    """The last `window` runs in `path`, oldest first."""
+    runs: list[dict] = []
+    try:
+        with open(path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            partial = b""
+            while position > 0 and len(runs) < window:
+                step = min(READ_BLOCK, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + partial).split(b"\n")
+                # Until the start of the file, the first piece may be the end of a line from an earlier block
+                partial = lines.pop(0) if position > 0 else b""
+                for line in reversed(lines):
+                    try:
+                        runs.append(json.loads(line))
+                    except ValueError:
+                        continue
+                    if len(runs) == window:
+                        break
+    except OSError:
+        pass
+    return runs[::-1]
+
+
+def trends_by_test(runs: list[dict]) -> dict[str, dict]:
+    """Per nodeid: outcome letters and durations over `runs`, oldest first.
+
+    A test missing from a run (not collected, or deselected) has no entry for it.
+    """
+    trends: dict[str, dict] = {}
+    for run in runs:
+        for nodeid, (code, duration) in run.get("tests", {}).items():
+            trend = trends.setdefault(nodeid, {"outcomes": "", "durations": []})
+            trend["outcomes"] += code
+            trend["durations"].append(duration)
+    return trends
+
+
+def append_run(path: str, run: dict):
+    # One write per run in append mode: parallel readers see whole lines or nothing new
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, separators=(",", ":")) + "\n")
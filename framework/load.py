@@ -0,0 +1,181 @@
+"""
+Load-testing mode built on the page objects.
+
+Runs many LoginPage.login + OrgPage.complete_flow_from_current_url sessions
+concurrently, each in its own BrowserContext, spread over a small number of
+browsers. Sessions start over a ramp-up period and at most `concurrency` run
+at once. Per-step latency comes from the same spans that feed the report
+waterfall, so every instrumented page-object method and readiness wait is
+reported. Failed steps and failed sessions are counted next to the
+percentiles, not in them: a step that times out would otherwise show up as
+the slowest "latency".
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+import uuid
+
+from playwright.async_api import async_playwright
+
+from framework.browser_pool import BrowserPool
+from framework.spans import SpanRecorder, attach
+from framework.timeouts import percentile
+from pages.login_page import LoginPage
+from pages.org_page import OrgNameAllocator, OrgPage
+
+# Form values used by test_create_org; override per run with `flow_values`
+DEFAULT_FLOW_VALUES = {
+    "address_prefix": "123",
+    "ownership": "Sole Proprietorship",
+    "phone": "9876543210",
+    "email": "rrr.vendor@example.com",
+    "website": "https://rrrvendor.example.com",
+    "ceo_name": "Alex CEO",
+    "employees": "120",
+}
+
+SESSION_STEP = "session"
+
+
+class LoadStats:
+    def __init__(self):
+        # Successful runs only; failures are counted per step in `failures`
+        self.durations: dict[str, list[float]] = {}
+        self.failures: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.sessions = 0
+        self.failed_sessions = 0
+        self.started = time.perf_counter()
+        self.finished = self.started
+
+    def add_session(self, recorder: SpanRecorder, seconds: float, error: Exception | None):
+        self.sessions += 1
+        if error is None:
+            self.durations.setdefault(SESSION_STEP, []).append(seconds)
+        else:
+            self.failed_sessions += 1
+            self.failures[SESSION_STEP] = self.failures.get(SESSION_STEP, 0) + 1
+            self.errors[type(error).__name__] = self.errors.get(type(error).__name__, 0) + 1
+        for span in recorder.spans:
+            if "dur" not in span:
+                continue
+            if span["ok"]:
+                self.durations.setdefault(span["name"], []).append(span["dur"])
+            else:
+                self.failures[span["name"]] = self.failures.get(span["name"], 0) + 1
+
+    def summary(self) -> dict:
+        wall = max(self.finished - self.started, 1e-9)
+        steps = {}
+        for name in {**self.durations, **self.failures}:
+            values = self.durations.get(name, [])
+            steps[name] = {
+                "count": len(values),
+                "failed": self.failures.get(name, 0),
+                "throughput_per_s": len(values) / wall,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            }
+        return {
+            "sessions": self.sessions,
+            "failed_sessions": self.failed_sessions,
+            "errors": dict(self.errors),
+            "wall_seconds": wall,
+            "sessions_per_minute": self.sessions / wall * 60,
+            "steps": steps,
+        }
+
+
+def format_summary(summary: dict) -> str:
+    lines = [
+        f"Sessions: {summary['sessions']} ({summary['failed_sessions']} failed) in {summary['wall_seconds']:.1f}s "
+        f"| {summary['sessions_per_minute']:.1f} sessions/min",
+        f"{'step':<50} {'count':>6} {'failed':>6} {'per s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    for name, step in sorted(summary["steps"].items(), key=lambda item: -item[1]["p50_ms"]):
+        lines.append(
+            f"{name[:50]:<50} {step['count']:>6} {step['failed']:>6} {step['throughput_per_s']:>7.2f} "
+            f"{step['p50_ms']:>9.0f} {step['p95_ms']:>9.0f} {step['p99_ms']:>9.0f}"
+        )
+    if summary["errors"]:
+        lines.append("Errors: " + ", ".join(f"{name} x{count}" for name, count in summary["errors"].items()))
+    return "\n".join(lines)
+
+
+async def _session(
+    pool: BrowserPool,
+    base_url: str,
+    welcome_url: str,
+    email: str,
+    password: str,
+    org_name: str,
+    values: dict,
+    stats: LoadStats,
+):
+    recorder = SpanRecorder()
+    started = time.perf_counter()
+    context = None
+    error = None
+    try:
+        # Inside the try: a browser that can't open a context fails this session, not the whole run
+        context, _ = await pool.acquire()
+        page = await context.new_page()
+        attach(page, recorder)
+        login_page = LoginPage(page, base_url=base_url)
+        await login_page.go_to_login_page()
+        await login_page.login(email, password)
+        org_page = OrgPage(page, welcome_url=welcome_url)
+        await org_page.complete_flow_from_current_url(org_name=org_name, **values)
+    except Exception as exc:
+        error = exc
+    finally:
+        if context is not None:
+            await pool.release(context)
+    stats.add_session(recorder, time.perf_counter() - started, error)
+
+
+async def run_load(
+    base_url: str,
+    email: str,
+    password: str,
+    users: int = 10,
+    concurrency: int = 5,
+    ramp_up: float = 0.0,
+    browsers: int = 1,
+    headless: bool = True,
+    org_prefix: str = "Load Org",
+    flow_values: dict | None = None,
+    run_tag: str | None = None,
+) -> dict:
+    """Run `users` sessions and return LoadStats.summary()."""
+    values = {**DEFAULT_FLOW_VALUES, **(flow_values or {})}
+    welcome_url = f"{base_url.rstrip('/')}/welcome"
+    # Random like the test run ids: a time of day repeats every day and would reuse org names
+    names = OrgNameAllocator(run_tag or uuid.uuid4().hex[:6].upper())
+    stats = LoadStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    playwright = await async_playwright().start()
+    pools = []
+    try:
+        for _ in range(max(1, browsers)):
+            pools.append(await BrowserPool(headless=headless, prewarm=0, playwright=playwright).start())
+        pool_cycle = itertools.cycle(pools)
+        stats.started = time.perf_counter()
+
+        async def _user(index: int, pool: BrowserPool):
+            # Ramp-up: spread session starts evenly over `ramp_up` seconds
+            if ramp_up and users > 1:
+                await asyncio.sleep(ramp_up * index / users)
+            async with semaphore:
+                await _session(pool, base_url, welcome_url, email, password, names.allocate(org_prefix), values, stats)
+
+        await asyncio.gather(*(_user(i, next(pool_cycle)) for i in range(users)))
+        stats.finished = time.perf_counter()
+    finally:
+        for pool in pools:
+            await pool.close()
+        await playwright.stop()
+    return stats.summary()
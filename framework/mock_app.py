@@ -0,0 +1,246 @@
+"""
+Local stand-in for the Construct app.
+
+Serves the login, welcome, create-organization, setup and "Hello" pages with
+the same placeholders, labels and roles LoginPage/OrgPage look for, backed by
+a small in-memory JSON API. Used to run the suite offline (`pytest --mock-app`)
+and by the framework benchmarks, where network jitter would hide regressions.
+
+Only the standard library is used; the server runs in a background thread.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+
+MOCK_EMAIL = "qa@example.com"
+MOCK_PASSWORD = "mock-password"
+
+_LAYOUT = """<!doctype html><html><head><meta charset="utf-8"><title>{title}</title>
+<style>body{{font-family:Arial,sans-serif;padding:24px}}.hidden{{display:none}}
+input,button{{display:block;margin:6px 0;padding:6px}}.toast{{color:#b00}}</style></head>
+<body>{body}</body></html>"""
+
+# Served at /static/logo.png so routing profiles have an image to block. A real
+# (1x1) PNG, so a page that loaded it sees naturalWidth == 1 and a blocked one sees 0
+_LOGO = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+_LOGIN = """
+<img src="/static/logo.png" alt="Construct" height="32">
+<h1>Login</h1>
+<form id="login-form">
+  <input type="email" placeholder="Enter your email" id="email">
+  <input type="password" placeholder="Enter your password" id="password">
+  <button type="submit">Login</button>
+</form>
+<p id="error" class="toast"></p>
+<script>
+document.getElementById("login-form").addEventListener("submit", async (e) => {
+  e.preventDefault();
+  const res = await fetch("/api/auth/login", {method: "POST", headers: {"Content-Type": "application/json"},
+    body: JSON.stringify({email: email.value, password: password.value})});
+  if (res.ok) { location.href = "/welcome"; } else { error.textContent = "Invalid email or password"; }
+});
+</script>
+"""
+
+_WELCOME = """
+<h1>Welcome to Construct</h1>
+<button onclick="location.href='/organization/create-organization'">Start</button>
+"""
+
+_CREATE_ORG = """
+<h1>Create your organization</h1>
+<input placeholder="ABC Corp" id="org-name">
+<button id="create">Create a business</button>
+<p id="toast" class="toast" role="alert"></p>
+<script>
+document.getElementById("create").addEventListener("click", async () => {
+  toast.textContent = "";
+  const res = await fetch("/api/organizations", {method: "POST", headers: {"Content-Type": "application/json"},
+    body: JSON.stringify({name: document.getElementById("org-name").value})});
+  const data = await res.json();
+  if (res.ok) { location.href = "/organization/setup/" + data.id; } else { toast.textContent = data.error; }
+});
+</script>
+"""
+
+_SETUP = """
+<h1>Tell Us About Your Business</h1>
+<input placeholder="Type to search address..." id="address" autocomplete="off">
+<ul role="listbox" id="suggestions" class="hidden">
+  <li role="option">123 Main Street</li>
+  <li role="option">123 Market Avenue</li>
+</ul>
+<input placeholder="9876543210" id="phone">
+<input placeholder="person@example.com" id="email">
+<input placeholder="www.example.com" id="website">
+<label for="ceo">CEO / Business Unit Head</label><input id="ceo">
+<label for="ownership">Ownership Type</label>
+<button id="ownership" role="combobox" aria-expanded="false">Select an option</button>
+<ul role="listbox" id="ownership-options" class="hidden">
+  <li role="option">Sole Proprietorship</li>
+  <li role="option">Partnership</li>
+  <li role="option">Private Limited</li>
+</ul>
+<input placeholder="e.g. 100" id="employees">
+<button id="next">Next</button>
+<script>
+const address = document.getElementById("address");
+const suggestions = document.getElementById("suggestions");
+address.addEventListener("input", () => suggestions.classList.toggle("hidden", address.value.length < 3));
+suggestions.querySelectorAll("li").forEach((li) => li.addEventListener("click", () => {
+  address.value = li.textContent; suggestions.classList.add("hidden");
+}));
+const ownership = document.getElementById("ownership");
+const options = document.getElementById("ownership-options");
+ownership.addEventListener("click", () => options.classList.toggle("hidden"));
+options.querySelectorAll("li").forEach((li) => li.addEventListener("click", () => {
+  ownership.textContent = li.textContent; options.classList.add("hidden");
+}));
+document.getElementById("next").addEventListener("click", async () => {
+  const fields = ["address", "phone", "email", "website", "ceo", "employees"];
+  const body = Object.fromEntries(fields.map((f) => [f, document.getElementById(f).value]));
+  body.ownership = ownership.textContent;
+  const res = await fetch(location.pathname.replace("/organization/setup/", "/api/organizations/") + "/setup",
+    {method: "POST", headers: {"Content-Type": "application/json"}, body: JSON.stringify(body)});
+  if (res.ok) { location.href = "/dashboard"; }
+});
+</script>
+"""
+
+_DASHBOARD = """
+<h1>Hello</h1>
+<p>Your organization is ready.</p>
+"""
+
+
+class MockConstructApp:
+    def __init__(self, email: str = MOCK_EMAIL, password: str = MOCK_PASSWORD, latency: float = 0.0, port: int = 0):
+        self.email = email
+        self.password = password
+        # Artificial delay added to every API call, to mimic a real backend
+        self.latency = latency
+        self.sessions: set[str] = set()
+        self.orgs: dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockConstructApp":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-construct-app", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        app = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _session(self) -> str | None:
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                token = cookie["session"].value if "session" in cookie else None
+                return token if token in app.sessions else None
+
+            def _send(
+                self, status: int, body: str | bytes, content_type: str = "text/html; charset=utf-8", headers=None
+            ):
+                data = body if isinstance(body, bytes) else body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _json(self, status: int, payload: dict, headers=None):
+                self._send(status, json.dumps(payload), "application/json", headers)
+
+            def _page(self, title: str, body: str):
+                self._send(200, _LAYOUT.format(title=title, body=body))
+
+            def _read_json(self) -> dict:
+                length = int(self.headers.get("Content-Length", "0") or 0)
+                try:
+                    return json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return {}
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path in ("/", "/login"):
+                    if path == "/" and self._session():
+                        return self._send(302, "", headers={"Location": "/welcome"})
+                    if path == "/":
+                        return self._send(302, "", headers={"Location": "/login"})
+                    return self._page("Login", _LOGIN)
+                if path == "/static/logo.png":
+                    return self._send(200, _LOGO, "image/png")
+                if path == "/api/health":
+                    return self._json(200, {"ok": True})
+                if not self._session():
+                    return self._send(302, "", headers={"Location": "/login"})
+                if path == "/welcome":
+                    return self._page("Welcome", _WELCOME)
+                if path == "/organization/create-organization":
+                    return self._page("Create organization", _CREATE_ORG)
+                match = re.fullmatch(r"/organization/setup/([\w-]+)", path)
+                if match and match.group(1) in app.orgs:
+                    return self._page("Setup", _SETUP)
+                if path == "/dashboard":
+                    return self._page("Dashboard", _DASHBOARD)
+                self._send(404, "Not found", "text/plain")
+
+            def do_POST(self):
+                path = self.path.split("?", 1)[0]
+                payload = self._read_json()
+                if app.latency:
+                    time.sleep(app.latency)
+                if path == "/api/auth/login":
+                    if payload.get("email") != app.email or payload.get("password") != app.password:
+                        return self._json(401, {"error": "Invalid email or password"})
+                    token = secrets.token_hex(16)
+                    with app.lock:
+                        app.sessions.add(token)
+                    return self._json(200, {"ok": True}, {"Set-Cookie": f"session={token}; Path=/; HttpOnly"})
+                if not self._session():
+                    return self._json(401, {"error": "Not signed in"})
+                if path == "/api/organizations":
+                    name = (payload.get("name") or "").strip()
+                    with app.lock:
+                        if not name:
+                            return self._json(422, {"error": "Organization name is required"})
+                        if any(org["name"].lower() == name.lower() for org in app.orgs.values()):
+                            return self._json(409, {"error": f"Organization {name} already exists"})
+                        org_id = secrets.token_hex(6)
+                        app.orgs[org_id] = {"id": org_id, "name": name, "setup": None}
+                    return self._json(201, {"id": org_id, "name": name})
+                match = re.fullmatch(r"/api/organizations/([\w-]+)/setup", path)
+                if match and match.group(1) in app.orgs:
+                    with app.lock:
+                        app.orgs[match.group(1)]["setup"] = payload
+                    return self._json(200, {"ok": True})
+                self._json(404, {"error": "Not found"})
+
+        return Handler
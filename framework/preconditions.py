@@ -0,0 +1,249 @@
+"""
+API fast path for test preconditions.
+
+Tests about the setup form or the "Hello" page don't need to click through
+org creation to get there. `Preconditions` builds the same state with the
+backend endpoints the UI itself calls (see OrgApi), then opens the page the
+test starts on and hands back an OrgPage. Requests go through the context's
+APIRequestContext (`context.request`). It shares the context's cookies, so an
+`authenticated` context is already signed in, and Playwright keeps its
+connections open between calls.
+
+When the org can't be created through the API (an endpoint moved, the
+session was refused, a network error), the precondition falls back to the UI
+flow and the reason is kept for the report. Once the API has created the org,
+there is no fallback. A failed setup call is finished through that org's
+setup form instead. `PRECONDITIONS=ui` (or `--preconditions ui`) always uses
+the UI.
+
+Every UI run records how long it took. The median of those runs, minus the
+API time, is the time the shortcuts saved. Until a precondition has been run
+through the UI at least once, there is no baseline and no saving is claimed.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+
+from playwright.async_api import APIRequestContext, Error as PlaywrightError, Page
+
+from pages.org_page import OrgNameAllocator, OrgPage
+
+MODES = ("api", "ui")
+
+# The endpoints the create-organization page and the setup form post to
+CREATE_ORG_PATH = "/api/organizations"
+SETUP_ORG_PATH = "/api/organizations/{org_id}/setup"
+SETUP_PAGE_PATH = "/organization/setup/{org_id}"
+# Where the setup form sends the browser once it is saved (the "Hello" page)
+DASHBOARD_PATH = "/dashboard"
+
+# UI timings kept per precondition for the baseline
+BASELINE_WINDOW = 20
+
+
+class PreconditionError(Exception):
+    """The API could not build the state; the UI path is used instead."""
+
+
+class OrgApi:
+    def __init__(self, request: APIRequestContext, base_url: str):
+        self.request = request
+        self.base_url = base_url.rstrip("/")
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        response = await self.request.post(f"{self.base_url}{path}", data=payload)
+        if not response.ok:
+            raise PreconditionError(f"POST {path} -> {response.status}")
+        try:
+            return await response.json()
+        except (PlaywrightError, ValueError):
+            return {}
+
+    async def sign_in(self, email: str, password: str):
+        await self._post("/api/auth/login", {"email": email, "password": password})
+
+    async def create_org(self, name: str) -> dict:
+        """Create an organization; returns {"id", "name"}."""
+        org = await self._post(CREATE_ORG_PATH, {"name": name})
+        if not org.get("id"):
+            raise PreconditionError(f"POST {CREATE_ORG_PATH} returned no organization id")
+        return org
+
+    async def setup_org(
+        self,
+        org_id: str,
+        address_prefix: str,
+        ownership: str,
+        phone: str,
+        email: str,
+        website: str,
+        ceo_name: str,
+        employees: str,
+    ):
+        # Same fields the setup form posts; the address is what the first suggestion would fill in
+        await self._post(
+            SETUP_ORG_PATH.format(org_id=org_id),
+            {
+                "address": address_prefix,
+                "ownership": ownership,
+                "phone": phone,
+                "email": email,
+                "website": website,
+                "ceo": ceo_name,
+                "employees": employees,
+            },
+        )
+
+
+class PreconditionStats:
+    """API vs UI timings for one process, with the UI baseline learned from earlier runs."""
+
+    def __init__(self, history: dict[str, list[float]] | None = None):
+        self.history = {name: list(samples) for name, samples in (history or {}).items()}
+        # UI timings from this process, merged into the saved history at the end
+        self.new_samples: dict[str, list[float]] = {}
+        self.totals = {"api": 0, "ui": 0, "fallbacks": 0, "api_seconds": 0.0, "saved_seconds": 0.0}
+
+    def baseline(self, name: str) -> float | None:
+        samples = self.history.get(name)
+        return statistics.median(samples) if samples else None
+
+    def record(self, name: str, path: str, seconds: float, fallback: bool = False) -> float | None:
+        """Count one run; returns the seconds saved against the UI baseline (None without one)."""
+        self.totals[path] += 1
+        if fallback:
+            self.totals["fallbacks"] += 1
+        if path == "ui":
+            for target in (self.history, self.new_samples):
+                target.setdefault(name, []).append(round(seconds, 3))
+                del target[name][:-BASELINE_WINDOW]
+            return None
+        self.totals["api_seconds"] += seconds
+        baseline = self.baseline(name)
+        if baseline is None:
+            return None
+        saved = max(baseline - seconds, 0.0)
+        self.totals["saved_seconds"] += saved
+        return saved
+
+    def merged_history(self, saved: dict[str, list[float]]) -> dict[str, list[float]]:
+        # Read-merge-write: parallel workers add to the saved baseline instead of replacing it
+        merged = {name: list(samples) for name, samples in saved.items()}
+        for name, samples in self.new_samples.items():
+            merged[name] = (merged.get(name, []) + samples)[-BASELINE_WINDOW:]
+        return merged
+
+    def summary(self) -> str:
+        totals = self.totals
+        if not totals["api"] and not totals["ui"]:
+            return ""
+        fallbacks = f" ({totals['fallbacks']} API fallbacks)" if totals["fallbacks"] else ""
+        text = (
+            f"Preconditions: {totals['api']} via API in {totals['api_seconds']:.1f}s, "
+            f"{totals['ui']} via UI{fallbacks}"
+        )
+        if totals["api"]:
+            if self.history:
+                text += f" | ~{totals['saved_seconds']:.1f}s saved vs UI"
+            else:
+                text += " | no UI baseline yet (run once with --preconditions ui)"
+        return text
+
+
+class Preconditions:
+    def __init__(
+        self,
+        request: APIRequestContext,
+        base_url: str,
+        mode: str = "api",
+        name_allocator: OrgNameAllocator | None = None,
+        stats: PreconditionStats | None = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown preconditions mode {mode!r}; choose from {', '.join(MODES)}")
+        self.api = OrgApi(request, base_url)
+        self.base_url = base_url.rstrip("/")
+        self.mode = mode
+        self.name_allocator = name_allocator
+        self.stats = stats if stats is not None else PreconditionStats()
+        # One entry per precondition run by the test, for the report
+        self.records: list[dict] = []
+
+    def _org_page(self, page: Page) -> OrgPage:
+        return OrgPage(page, welcome_url=f"{self.base_url}/welcome", name_allocator=self.name_allocator)
+
+    @staticmethod
+    def _reason(exc: Exception) -> str:
+        return (str(exc).splitlines() or [type(exc).__name__])[0][:200]
+
+    async def _run(self, name: str, org_name: str, api_step, ui_step) -> dict:
+        """Create `org_name` through the API and hand it to `api_step`, or run `ui_step` instead.
+
+        Only a failed create falls back to the UI. Once the org exists, `api_step`
+        carries on from it, so a later failure never leaves a second, orphaned org.
+        """
+        started = time.perf_counter()
+        record = {"precondition": name, "path": self.mode}
+        if self.mode == "api":
+            try:
+                org = await self.api.create_org(org_name)
+            except (PreconditionError, PlaywrightError) as exc:
+                record.update(path="ui", fallback=self._reason(exc))
+            else:
+                record.update(await api_step(org))
+        if record["path"] == "ui":
+            # Only the UI part counts towards the baseline, not the failed API attempt
+            ui_started = time.perf_counter()
+            record.update(await ui_step())
+            ui_seconds = time.perf_counter() - ui_started
+            self.stats.record(name, "ui", ui_seconds, fallback="fallback" in record)
+        else:
+            saved = self.stats.record(name, "api", time.perf_counter() - started)
+            if saved is not None:
+                record["saved_seconds"] = round(saved, 3)
+        record["seconds"] = round(time.perf_counter() - started, 3)
+        self.records.append(record)
+        return record
+
+    async def org_at_setup(self, page: Page, org_name: str) -> OrgPage:
+        """A new organization waiting for its setup form, with `page` on that form."""
+        org_page = self._org_page(page)
+
+        async def _api(org):
+            await page.goto(f"{self.base_url}{SETUP_PAGE_PATH.format(org_id=org['id'])}")
+            await org_page.wait_until_element("org.setup_form", org_page.address_input)
+            return {"org_name": org["name"]}
+
+        async def _ui():
+            await org_page.click_start_on_welcome()
+            return {"org_name": await org_page.create_org(org_name)}
+
+        await self._run("org_at_setup", org_name, _api, _ui)
+        return org_page
+
+    async def org_set_up(self, page: Page, org_name: str, **setup_values) -> OrgPage:
+        """A new organization with its setup form saved, with `page` on the "Hello" page."""
+        org_page = self._org_page(page)
+
+        async def _api(org):
+            try:
+                await self.api.setup_org(org["id"], **setup_values)
+            except (PreconditionError, PlaywrightError) as exc:
+                # The org exists already: finish it through its setup form rather than making another one
+                await page.goto(f"{self.base_url}{SETUP_PAGE_PATH.format(org_id=org['id'])}")
+                await org_page.fill_setup_form(**setup_values)
+                await org_page.click_next()
+                return {"org_name": org["name"], "resumed": f"setup form used, {self._reason(exc)}"}
+            await page.goto(f"{self.base_url}{DASHBOARD_PATH}")
+            return {"org_name": org["name"]}
+
+        async def _ui():
+            await org_page.click_start_on_welcome()
+            created_name = await org_page.create_org(org_name)
+            await org_page.fill_setup_form(**setup_values)
+            await org_page.click_next()
+            return {"org_name": created_name}
+
+        await self._run("org_set_up", org_name, _api, _ui)
+        return org_page
@@ -0,0 +1,220 @@
+"""
+Bulk organization provisioning for seeding environments.
+
+Org records are streamed from a CSV or JSONL file through a fixed number of
+workers. Each worker runs OrgPage.complete_flow_from_current_url in a
+context that is already signed in. The contexts come pre-warmed from a
+BrowserPool whose contexts carry the saved login.
+
+Every finished row is appended to a JSONL checkpoint log and flushed at once,
+so a rerun after a crash skips the rows that are already done. Failed rows are
+logged as well, but they are retried on the next run.
+
+Orgs are never renamed. If the name is already taken, the row is logged as
+`exists` and counts as done. This covers an org created just before a crash,
+before its log line was written. The log always holds the name the org was
+really created under.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+from framework.auth_state import AuthStateCache
+from framework.browser_pool import BrowserPool
+from framework.load import DEFAULT_FLOW_VALUES
+from pages.org_page import OrgExistsError, OrgPage
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 10.0
+# Log statuses that mean the row needs no more work
+DONE_STATUSES = ("done", "exists")
+
+
+def iter_records(path: str):
+    """Yield org records from a .csv or .jsonl file, one at a time."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def row_key(record: dict) -> str:
+    """Identity of a row in the checkpoint log: an explicit `id` column, else the org name."""
+    return str(record.get("id") or record["org_name"])
+
+
+def flow_values(record: dict) -> dict:
+    return {key: str(record.get(key, default)) for key, default in DEFAULT_FLOW_VALUES.items()}
+
+
+class CheckpointLog:
+    def __init__(self, path: str):
+        self.path = path
+        self.done: set[str] = set()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Last line cut short by a crash
+                        continue
+                    if entry.get("status") in DONE_STATUSES:
+                        self.done.add(entry["key"])
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Line-buffered: every finished row is on disk before the next one starts
+        self._f = open(path, "a", encoding="utf-8", buffering=1)
+
+    def append(self, key: str, status: str, **fields):
+        entry = {"key": key, "status": status, "at": datetime.now().isoformat(timespec="seconds"), **fields}
+        self._f.write(json.dumps(entry) + "\n")
+        if status in DONE_STATUSES:
+            self.done.add(key)
+
+    def close(self):
+        self._f.close()
+
+
+class ProvisionStats:
+    def __init__(self):
+        self.done = 0
+        self.exists = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self.errors: dict[str, int] = {}
+
+    def rows_per_minute(self) -> float:
+        return self.done / max(time.perf_counter() - self.started, 1e-9) * 60
+
+    def line(self) -> str:
+        return (
+            f"done {self.done} | exists {self.exists} | failed {self.failed} | skipped {self.skipped} (already done) | "
+            f"{self.rows_per_minute():.1f} rows/min"
+        )
+
+    def summary(self) -> dict:
+        return {
+            "done": self.done,
+            "exists": self.exists,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "errors": dict(self.errors),
+            "seconds": time.perf_counter() - self.started,
+            "rows_per_minute": self.rows_per_minute(),
+        }
+
+
+async def run_pipeline(records, log: CheckpointLog, handler, concurrency: int = 4, progress=print) -> dict:
+    """Feed `records` through `concurrency` workers calling `await handler(record)`.
+
+    The handler returns fields for the log line; a "status" field of "exists"
+    marks a row that needed no work. Rows already done in `log` are skipped. The
+    queue is bounded, so the input is never read far ahead of the workers.
+    """
+    stats = ProvisionStats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def _worker():
+        while True:
+            record = await queue.get()
+            if record is None:
+                return
+            key = row_key(record)
+            started = time.perf_counter()
+            try:
+                result = await handler(record)
+            except Exception as exc:
+                stats.failed += 1
+                stats.errors[type(exc).__name__] = stats.errors.get(type(exc).__name__, 0) + 1
+                log.append(key, "failed", error=f"{type(exc).__name__}: {exc}"[:500])
+                continue
+            result = dict(result or {})
+            status = result.pop("status", "done")
+            if status == "exists":
+                stats.exists += 1
+            else:
+                stats.done += 1
+            log.append(key, status, seconds=round(time.perf_counter() - started, 2), **result)
+
+    async def _progress():
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            progress(stats.line())
+
+    workers = [asyncio.ensure_future(_worker()) for _ in range(concurrency)]
+    reporter = asyncio.ensure_future(_progress()) if progress else None
+    try:
+        for record in records:
+            if row_key(record) in log.done:
+                stats.skipped += 1
+                continue
+            await queue.put(record)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        if reporter is not None:
+            reporter.cancel()
+    if progress:
+        progress(stats.line())
+    return stats.summary()
+
+
+async def provision_orgs(
+    input_path: str,
+    checkpoint_path: str,
+    base_url: str,
+    email: str,
+    password: str,
+    concurrency: int = 4,
+    headless: bool = True,
+    auth_state_dir: str = ".auth",
+    progress=print,
+) -> dict:
+    """Create every org in `input_path` not yet marked done in `checkpoint_path`."""
+    welcome_url = f"{base_url.rstrip('/')}/welcome"
+    pool = await BrowserPool(headless=headless, prewarm=0).start()
+    log = CheckpointLog(checkpoint_path)
+    try:
+        auth = AuthStateCache(pool, base_url, state_dir=auth_state_dir)
+        # From here on, every context the pool hands out (and pre-warms) is signed in
+        pool.context_options["storage_state"] = await auth.get(email, password)
+        pool.prewarm = concurrency
+
+        async def _create(record: dict) -> dict:
+            context, _ = await pool.acquire()
+            try:
+                page = await context.new_page()
+                await page.goto(welcome_url)
+                org_page = OrgPage(page, welcome_url=welcome_url)
+                await org_page.click_start_on_welcome()
+                try:
+                    org_name = await org_page.create_org(record["org_name"], rename_on_collision=False)
+                except OrgExistsError:
+                    return {"status": "exists", "org_name": record["org_name"]}
+                await org_page.fill_setup_form(**flow_values(record))
+                await org_page.click_next()
+                if not await org_page.is_hello_page_displayed():
+                    raise RuntimeError(f"Setup did not finish for {org_name!r} (at {page.url})")
+                return {"org_name": org_name, "url": page.url}
+            finally:
+                await pool.release(context)
+
+        return await run_pipeline(iter_records(input_path), log, _create, concurrency=concurrency, progress=progress)
+    finally:
+        log.close()
+        await pool.close()
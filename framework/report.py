@@ -0,0 +1,231 @@
+"""
+Test report: a compact data file plus a static HTML viewer.
+
+Results are streamed into `report-data.js` one row at a time, so the full
+result set is never held in memory. The file is one JSON document behind a
+fixed `window.REPORT_DATA=` prefix. That way `report.html` can load it with a
+plain <script> tag, even when opened straight from disk, where fetch() is
+blocked. `load_report_data()` reads it back for scripts.
+
+The viewer (framework/report_viewer.html) pages, filters and sorts the rows
+in the browser. It only builds a row's step waterfall and failure details when
+the row is expanded. Every run is also added to the history index (see
+framework.history), and each row carries its test's recent outcomes and
+durations for the trend column.
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from html import escape
+
+from framework.archive import resolve
+from framework.history import HISTORY_WINDOW, append_run, outcome_code, read_recent_runs, trends_by_test
+from framework.results import safe_filename
+from framework.routing import format_bytes
+
+DATA_FILE = "report-data.js"
+DATA_PREFIX = "window.REPORT_DATA="
+VIEWER_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "report_viewer.html")
+
+# Steps taking at least this share of the test are highlighted in the waterfall
+SLOW_STEP_SHARE = 0.25
+# Failure text kept in the report; the end (where the assertion is) is kept, the full text stays in the test's JSON
+LONGREPR_MAX_CHARS = 20000
+# Meta lines from each process shown above the table
+META_KEYS = ("pool", "archive", "screenshots", "tracing", "preconditions")
+
+_JSON = {"separators": (",", ":"), "ensure_ascii": False}
+
+
+def _format_duration(s):
+    try:
+        return f"{s:.2f}s"
+    except Exception:
+        return str(s)
+
+
+def _relative(path: str, report_dir: str, aliases: dict) -> str:
+    return resolve(aliases, os.path.relpath(path, report_dir).replace(os.sep, "/"))
+
+
+def screenshot_html(r: dict, report_dir: str, aliases: dict) -> str:
+    """Thumbnail (or size label) that expands into the lazily loaded full screenshot."""
+    if not r.get("screenshot"):
+        return "skipped (budget)" if r.get("screenshot_skipped") else "-"
+    full = _relative(r["screenshot"], report_dir, aliases)
+    # The writer names the thumbnail before making it; if making it failed, there's no file to show
+    if r.get("thumbnail") and os.path.isfile(r["thumbnail"]):
+        preview = f"<img src='./{_relative(r['thumbnail'], report_dir, aliases)}' loading='lazy' style='height:60px'>"
+    else:
+        preview = f"screenshot ({format_bytes(r.get('screenshot_bytes', 0))})"
+    return (
+        f"<details class='shot'><summary>{preview}</summary>"
+        f"<a href='./{full}' target='_blank'><img class='full' data-src='./{full}'></a></details>"
+    )
+
+
+def playwright_trace_html(r: dict, report_dir: str, aliases: dict) -> str:
+    """Links to the trace chunks kept for a failed test, last step first."""
+    links = [
+        f"<a href='./{_relative(path, report_dir, aliases)}'>{escape(os.path.basename(path))}</a>"
+        for path in reversed(r.get("playwright_trace", []))
+    ]
+    if not links:
+        return ""
+    failed_step = f" (failed in {escape(r['failed_step'])})" if r.get("failed_step") else ""
+    return (
+        f"<p>Playwright trace{failed_step}: {' &middot; '.join(links)} "
+        "<small>open with <code>playwright show-trace</code> or trace.playwright.dev</small></p>"
+    )
+
+
+def browser_log_html(r: dict) -> str:
+    log = r.get("browser_log")
+    if not log or not (log["entries"] or log["dropped"]):
+        return ""
+    dropped = f", {log['dropped']} older dropped" if log["dropped"] else ""
+    rows = "".join(
+        f"<tr><td>{entry['ms'] / 1000:.2f}s</td><td>{escape(entry['kind'])}</td><td>{escape(entry['text'])}</td></tr>"
+        for entry in log["entries"]
+    )
+    return (
+        f"<details><summary>Browser log ({len(log['entries'])} entries{dropped})</summary>"
+        f"<table class='log'>{rows}</table></details>"
+    )
+
+
+def longrepr_html(r: dict, report_dir: str, aliases: dict) -> str:
+    text = r["longrepr"]
+    if len(text) > LONGREPR_MAX_CHARS:
+        json_href = _relative(os.path.join(report_dir, f"{safe_filename(r['nodeid'])}.json"), report_dir, aliases)
+        cut = (
+            f"... first {len(text) - LONGREPR_MAX_CHARS} characters cut, "
+            f"full text in <a href='./{json_href}'>the test's JSON</a>\n"
+        )
+        text = text[-LONGREPR_MAX_CHARS:]
+    else:
+        cut = ""
+    return f"<details><summary>Failure details</summary><pre>{cut}{escape(text)}</pre></details>"
+
+
+def report_notes(r: dict) -> list[str]:
+    """Plain-text notes shown under a test's duration."""
+    notes = []
+    org_create = r.get("metrics", {}).get("org_create")
+    if org_create and org_create["attempts"] > 1:
+        notes.append(
+            f"{org_create['attempts'] - 1} org retries, {_format_duration(org_create['wasted_seconds'])} wasted"
+        )
+    routing = r.get("routing")
+    if routing and (routing["blocked"] or routing["stubbed"]):
+        notes.append(
+            f"{routing['profile']}: {routing['blocked'] + routing['stubbed']}/{routing['requests']} "
+            f"requests skipped, ~{format_bytes(routing['bytes_saved'])} saved"
+        )
+    for step in r.get("preconditions", []):
+        saved = f", ~{_format_duration(step['saved_seconds'])} saved" if step.get("saved_seconds") else ""
+        fallback = f" (API fallback: {step['fallback']})" if step.get("fallback") else ""
+        if step.get("resumed"):
+            fallback += f" ({step['resumed']})"
+        notes.append(f"{step['precondition']} via {step['path']} {_format_duration(step['seconds'])}{saved}{fallback}")
+    if r.get("tracing_overhead"):
+        notes.append(f"tracing +{r['tracing_overhead']:.0f} ms")
+    return notes
+
+
+def span_mark(span: dict, total: float) -> str:
+    """Waterfall highlight for a step: "err" if it failed, "slow" if it took SLOW_STEP_SHARE of `total` ms, else ""."""
+    if not span["ok"]:
+        return "err"
+    return "slow" if span["dur"] >= total * SLOW_STEP_SHARE else ""
+
+
+def report_row(r: dict, report_dir: str, aliases: dict, trend: dict | None = None) -> dict:
+    """One compact viewer row; empty fields are left out."""
+    row = {"nodeid": r.get("nodeid", ""), "outcome": r.get("outcome", ""), "duration": round(r.get("duration") or 0, 3)}
+    notes = report_notes(r)
+    if notes:
+        row["notes"] = notes
+    if r.get("page_url"):
+        row["page_url"] = r["page_url"]
+    if r.get("screenshot") or r.get("screenshot_skipped"):
+        row["screenshot"] = screenshot_html(r, report_dir, aliases)
+    if r.get("spans"):
+        # [name, start ms, duration ms, depth, mark] is much smaller than a dict per step
+        # Measured against the whole test, not just the time its steps cover
+        total = max([1, (r.get("duration") or 0) * 1000] + [s["start"] + s["dur"] for s in r["spans"]])
+        row["spans"] = [[s["name"], s["start"], s["dur"], s["depth"], span_mark(s, total)] for s in r["spans"]]
+        if r.get("trace"):
+            row["trace"] = _relative(r["trace"], report_dir, aliases)
+    if r.get("longrepr"):
+        # Only failed tests carry HTML; it is inserted when the row is expanded
+        row["details"] = (
+            playwright_trace_html(r, report_dir, aliases) + browser_log_html(r) + longrepr_html(r, report_dir, aliases)
+        )
+    if trend:
+        row["trend"] = trend
+    return row
+
+
+def write_report(
+    report_dir: str,
+    results,
+    exitstatus: int,
+    metas: list[dict],
+    aliases: dict,
+    run_id: str = "",
+    history_path: str | None = None,
+    wall_seconds: float = 0.0,
+) -> list[str]:
+    """Write the data file and the viewer, and add the run to the history; returns the report files."""
+    runs = read_recent_runs(history_path, HISTORY_WINDOW - 1) if history_path else []
+    past = trends_by_test(runs)
+    counts = {"passed": 0, "failed": 0, "skipped": 0}
+    tests: dict[str, list] = {}
+
+    data_path = os.path.join(report_dir, DATA_FILE)
+    tmp_path = f"{data_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(DATA_PREFIX + '{"tests":[')
+        for index, r in enumerate(results):
+            nodeid, outcome = r.get("nodeid", ""), r.get("outcome", "")
+            if outcome in counts:
+                counts[outcome] += 1
+            tests[nodeid] = [outcome_code(outcome), round(r.get("duration") or 0, 3)]
+            previous = past.get(nodeid, {"outcomes": "", "durations": []})
+            trend = {
+                "outcomes": previous["outcomes"] + tests[nodeid][0],
+                "durations": previous["durations"] + [tests[nodeid][1]],
+            }
+            f.write(("," if index else "") + json.dumps(report_row(r, report_dir, aliases, trend), **_JSON))
+        run = {
+            "run_id": run_id,
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "exitstatus": int(exitstatus),
+            "total": len(tests),
+            **counts,
+            "seconds": round(wall_seconds, 1),
+        }
+        notes = [f"[{meta['worker']}] {meta[key]}" for meta in metas for key in META_KEYS if meta.get(key)]
+        history = [{k: v for k, v in past_run.items() if k != "tests"} for past_run in runs] + [run]
+        f.write(
+            f'],"run":{json.dumps(run, **_JSON)},"notes":{json.dumps(notes, **_JSON)},'
+            f'"history":{json.dumps(history, **_JSON)}}};\n'
+        )
+    os.replace(tmp_path, data_path)
+
+    html_path = os.path.join(report_dir, "report.html")
+    with open(VIEWER_TEMPLATE, "r", encoding="utf-8") as src, open(html_path, "w", encoding="utf-8") as dst:
+        dst.write(src.read().replace("{{DATA_FILE}}", DATA_FILE))
+    if history_path:
+        append_run(history_path, {**run, "tests": tests})
+    return [data_path, html_path]
+
+
+def load_report_data(path: str) -> dict:
+    """The JSON document inside a report-data.js file."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return json.loads(text[len(DATA_PREFIX) :].rstrip().rstrip(";"))
@@ -0,0 +1,184 @@
+"""
+Worker-safe, streaming result collection.
+
+Each pytest process (the single process of a serial run, or every xdist
+worker) appends its results to its own JSONL shard under
+REPORT_DIR/shards/<run_id>/. Lines are flushed as they are written, so a
+crashed run still leaves every finished test on disk. The controller streams
+the shards of the current run into one report, and keeps a rolling per-test
+duration history used to hand the slowest tests out first.
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+
+# Weight of the newest measurement in the rolling duration average
+DURATION_SMOOTHING = 0.5
+# Shards untouched for this long belong to finished (or crashed) runs and can go
+SHARD_MAX_AGE = 24 * 3600
+
+
+def worker_id(config) -> str:
+    workerinput = getattr(config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else "main"
+
+
+def is_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def safe_filename(nodeid: str, max_length: int = 120) -> str:
+    """Filesystem-safe, collision-free name for a test nodeid.
+
+    Parametrized tests and same-named tests in different classes/modules all map
+    to different names; a short hash keeps long ids unique after truncation.
+    """
+    readable = re.sub(r"[^A-Za-z0-9._-]+", "_", nodeid).strip("_")[:max_length]
+    digest = hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:8]
+    return f"{readable}-{digest}"
+
+
+def shard_dir(report_dir: str, run_id: str) -> str:
+    return os.path.join(report_dir, "shards", run_id)
+
+
+def prune_shards(report_dir: str, max_age: float = SHARD_MAX_AGE, now: float | None = None) -> list[str]:
+    """Delete the shard directories of runs that haven't written anything for `max_age` seconds.
+
+    Another run sharing REPORT_DIR keeps appending to its shards, so a
+    directory counts as old only when the directory and every file in it are.
+    Returns the run ids that were removed.
+    """
+    now = time.time() if now is None else now
+    removed = []
+    for path in sorted(glob.glob(os.path.join(report_dir, "shards", "*"))):
+        try:
+            newest = max(
+                [os.path.getmtime(path)] + [os.path.getmtime(os.path.join(path, name)) for name in os.listdir(path)]
+            )
+        except OSError:
+            continue
+        if now - newest >= max_age:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(os.path.basename(path))
+    return removed
+
+
+class ResultSink:
+    """Append-only JSONL writer keyed by nodeid.
+
+    Every update appends the test's full current entry as one line; readers
+    take the last line per nodeid. Only tests still in progress are kept in
+    memory, so memory stays flat however many tests run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # buffering=1: line-buffered, each entry reaches the OS as soon as it is written
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._open: dict[str, dict] = {}
+
+    def get(self, nodeid: str) -> dict | None:
+        return self._open.get(nodeid)
+
+    def record(self, nodeid: str, **fields) -> dict:
+        entry = self._open.get(nodeid)
+        if entry is None:
+            entry = self._open[nodeid] = {"nodeid": nodeid}
+        entry.update(fields)
+        self._write(entry)
+        return entry
+
+    def finish(self, nodeid: str, **fields) -> dict | None:
+        """Write the final state of a test and drop it from memory."""
+        entry = self._open.pop(nodeid, None)
+        if entry is None:
+            return None
+        if fields:
+            entry.update(fields)
+            self._write(entry)
+        return entry
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def shard_path(report_dir: str, run_id: str, worker: str) -> str:
+    return os.path.join(shard_dir(report_dir, run_id), f"{worker}.jsonl")
+
+
+def write_shard_meta(report_dir: str, run_id: str, worker: str, meta: dict):
+    path = os.path.join(shard_dir(report_dir, run_id), f"{worker}.meta.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"worker": worker, **meta}, f)
+
+
+def load_shard_meta(report_dir: str, run_id: str) -> list[dict]:
+    metas = []
+    for path in sorted(glob.glob(os.path.join(shard_dir(report_dir, run_id), "*.meta.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                metas.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return metas
+
+
+def iter_results(report_dir: str, run_id: str):
+    """Yield the final entry of every test of a run, one shard at a time.
+
+    A process runs one test at a time, so all lines for a nodeid are adjacent
+    within its shard and only the current entry has to be held in memory.
+    """
+    for path in sorted(glob.glob(os.path.join(shard_dir(report_dir, run_id), "*.jsonl"))):
+        current = None
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line of a crashed worker
+                    continue
+                if current is not None and entry.get("nodeid") != current.get("nodeid"):
+                    yield current
+                current = entry
+        if current is not None:
+            yield current
+
+
+def update_durations(history: dict, results) -> dict:
+    updated = dict(history)
+    for r in results:
+        duration = r.get("duration")
+        if not isinstance(duration, (int, float)):
+            continue
+        previous = updated.get(r["nodeid"])
+        if previous is None:
+            updated[r["nodeid"]] = duration
+        else:
+            updated[r["nodeid"]] = DURATION_SMOOTHING * duration + (1 - DURATION_SMOOTHING) * previous
+    return updated
+
+
+def order_by_duration(items: list, history: dict) -> list:
+    """Longest tests first, so xdist's load scheduler can fill the gaps with short ones.
+
+    Tests without history are assumed to take as long as the median known test.
+    The sort is stable and deterministic, which xdist requires: every worker
+    must collect the same order.
+    """
+    known = sorted(history.values())
+    default = known[len(known) // 2] if known else 0.0
+    return sorted(items, key=lambda item: -history.get(item.nodeid, default))
@@ -0,0 +1,179 @@
+"""
+Routing profiles: block or stub resources the assertions never look at.
+
+A profile blocks whole resource types (image, font, media, ...) and/or URL
+patterns, and can answer other patterns (analytics, chat widgets) with an empty
+stub so the page's own scripts don't error. Installing a route sends every
+matching request through Python and disables Chromium's HTTP cache for the
+context, so the "full" profile installs nothing.
+
+Blocked requests never download, so "bytes saved" uses sizes learned from
+Content-Length of the same URLs in earlier runs (kept in the pytest cache).
+"""
+from __future__ import annotations
+
+import fnmatch
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Request, Response, Route
+
+# Common trackers/widgets: stubbed rather than aborted so inline callers don't throw
+TRACKER_PATTERNS = (
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+    "*hotjar.com/*",
+    "*segment.io/*",
+    "*cdn.segment.com/*",
+    "*connect.facebook.net/*",
+    "*clarity.ms/*",
+    "*intercom.io/*",
+    "*intercomcdn.com/*",
+    "*sentry.io/*",
+)
+
+STUB_BODIES = {
+    "script": ("", "text/javascript"),
+    "stylesheet": ("", "text/css"),
+    "xhr": ("{}", "application/json"),
+    "fetch": ("{}", "application/json"),
+}
+
+
+class RoutingProfile:
+    def __init__(
+        self,
+        name: str,
+        block_types: tuple[str, ...] | list[str] = (),
+        block_patterns: tuple[str, ...] | list[str] = (),
+        stub_patterns: tuple[str, ...] | list[str] = (),
+    ):
+        self.name = name
+        self.block_types = frozenset(block_types)
+        self.block_patterns = tuple(block_patterns)
+        self.stub_patterns = tuple(stub_patterns)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.block_types or self.block_patterns or self.stub_patterns)
+
+    def action_for(self, url: str, resource_type: str) -> str | None:
+        """"stub", "block" or None (let the request through)."""
+        if any(fnmatch.fnmatchcase(url, pattern) for pattern in self.stub_patterns):
+            return "stub"
+        if resource_type in self.block_types:
+            return "block"
+        if any(fnmatch.fnmatchcase(url, pattern) for pattern in self.block_patterns):
+            return "block"
+        return None
+
+    def extend(self, block_types=(), block_patterns=(), stub_patterns=()) -> "RoutingProfile":
+        if not (block_types or block_patterns or stub_patterns):
+            return self
+        return RoutingProfile(
+            f"{self.name}+custom",
+            self.block_types | set(block_types),
+            self.block_patterns + tuple(block_patterns),
+            self.stub_patterns + tuple(stub_patterns),
+        )
+
+
+PROFILES = {
+    "full": RoutingProfile("full"),
+    # Nothing LoginPage/OrgPage assert on; stylesheets stay because visibility waits depend on them
+    "lean": RoutingProfile("lean", block_types=("image", "media", "font"), stub_patterns=TRACKER_PATTERNS),
+}
+
+
+def get_profile(name: str | None = None, **overrides) -> RoutingProfile:
+    """Named profile, optionally extended with block_types/block_patterns/stub_patterns."""
+    try:
+        profile = PROFILES[name or "full"]
+    except KeyError:
+        raise ValueError(f"Unknown routing profile {name!r}; choose from {', '.join(sorted(PROFILES))}") from None
+    return profile.extend(**overrides)
+
+
+def _size_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class RouteStats:
+    def __init__(self, profile: RoutingProfile, known_sizes: dict[str, int] | None = None):
+        self.profile = profile
+        self.known_sizes = known_sizes if known_sizes is not None else {}
+        # Sizes seen in this context, to be merged into known_sizes for later runs
+        self.learned: dict[str, int] = {}
+        self.requests = 0
+        self.blocked = 0
+        self.stubbed = 0
+        self.bytes_loaded = 0
+        self.bytes_saved = 0
+        self.unknown_size = 0
+        self.by_type: dict[str, int] = {}
+
+    def on_request(self, request: Request):
+        self.requests += 1
+
+    def on_response(self, response: Response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.bytes_loaded += int(length)
+            self.learned[_size_key(response.url)] = int(length)
+
+    def skipped(self, url: str, resource_type: str, action: str):
+        if action == "stub":
+            self.stubbed += 1
+        else:
+            self.blocked += 1
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+        size = self.known_sizes.get(_size_key(url))
+        if size is None:
+            self.unknown_size += 1
+        else:
+            self.bytes_saved += size
+
+    async def handle(self, route: Route, request: Request):
+        action = self.profile.action_for(request.url, request.resource_type)
+        if action is None:
+            await route.continue_()
+            return
+        self.skipped(request.url, request.resource_type, action)
+        if action == "stub":
+            body, content_type = STUB_BODIES.get(request.resource_type, ("", "text/plain"))
+            await route.fulfill(status=200, body=body, content_type=content_type)
+        else:
+            await route.abort("blockedbyclient")
+
+    def summary(self) -> dict:
+        return {
+            "profile": self.profile.name,
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "stubbed": self.stubbed,
+            "bytes_loaded": self.bytes_loaded,
+            "bytes_saved": self.bytes_saved,
+            "unknown_size": self.unknown_size,
+            "by_type": dict(self.by_type),
+        }
+
+
+async def apply_profile(
+    context: BrowserContext, profile: RoutingProfile, known_sizes: dict[str, int] | None = None
+) -> RouteStats:
+    """Install `profile` on a context and return the stats it fills in."""
+    stats = RouteStats(profile, known_sizes)
+    context.on("request", stats.on_request)
+    context.on("response", stats.on_response)
+    if profile.active:
+        await context.route("**/*", stats.handle)
+    return stats
+
+
+def format_bytes(count: int) -> str:
+    if count < 1024:
+        return f"{count} B"
+    if count < 1024 * 1024:
+        return f"{count / 1024:.1f} KB"
+    return f"{count / 1024 / 1024:.1f} MB"
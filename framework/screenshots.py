@@ -0,0 +1,95 @@
+"""
+Background screenshot writer.
+
+Failure screenshots are captured as bytes while the page is still open; the
+file write, thumbnail and archiving happen on a worker thread, so the test's
+teardown only pays for the capture itself. A byte budget per run stops a
+mass failure from filling the disk with near-identical full-page PNGs.
+
+A job that fails (disk full, report dir removed, an image Pillow can't read)
+is counted in the stats and the writer moves on to the next one.
+"""
+from __future__ import annotations
+
+import io
+import os
+import queue
+import threading
+
+from PIL import Image
+
+THUMBNAIL_SIZE = (240, 160)
+
+
+class ScreenshotWriter:
+    def __init__(self, archive=None, max_bytes: int = 0):
+        self.archive = archive
+        # 0 = unlimited
+        self.max_bytes = max_bytes
+        self.stats = {"screenshots": 0, "bytes": 0, "thumbnails": 0, "over_budget": 0, "errors": 0}
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    def has_budget(self) -> bool:
+        return not self.max_bytes or self.stats["bytes"] < self.max_bytes
+
+    def skip(self) -> dict:
+        """Report fields for a screenshot not taken or not kept because of the budget."""
+        self.stats["over_budget"] += 1
+        return {"screenshot": "", "thumbnail": "", "screenshot_skipped": "over the per-run screenshot budget"}
+
+    def submit(self, data: bytes, path: str) -> dict:
+        """Queue `data` to be written to `path`; returns the report fields right away.
+
+        The thumbnail path is where the writer will put it. The report checks the
+        file exists, since a thumbnail that failed is never made.
+        """
+        if self.max_bytes and self.stats["bytes"] + len(data) > self.max_bytes:
+            return self.skip()
+        self.stats["screenshots"] += 1
+        self.stats["bytes"] += len(data)
+        thumbnail = f"{os.path.splitext(path)[0]}.thumb.jpg"
+        self._queue.put((data, path, thumbnail))
+        return {"screenshot": path, "thumbnail": thumbnail, "screenshot_bytes": len(data)}
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            # One bad job must not stop the thread: the screenshots queued after it would never be written
+            try:
+                self._write(*job)
+            except Exception:
+                self.stats["errors"] += 1
+
+    def _write(self, data: bytes, path: str, thumbnail: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        if self.archive is not None:
+            self.archive.add(path)
+        write_thumbnail(data, thumbnail)
+        self.stats["thumbnails"] += 1
+        if self.archive is not None:
+            self.archive.add(thumbnail)
+
+    def summary(self) -> str:
+        budget = f" of {self.max_bytes / 1e6:.0f} MB budget" if self.max_bytes else ""
+        skipped = f", {self.stats['over_budget']} skipped over budget" if self.stats["over_budget"] else ""
+        errors = f", {self.stats['errors']} failed to save" if self.stats["errors"] else ""
+        return f"Screenshots: {self.stats['screenshots']} ({self.stats['bytes'] / 1e6:.1f} MB{budget}){skipped}{errors}"
+
+
+def write_thumbnail(data: bytes, path: str, size: tuple[int, int] = THUMBNAIL_SIZE):
+    # Full-page shots are tall; keep the top of the page, which is what the eye looks for first
+    with Image.open(io.BytesIO(data)) as image:
+        width, height = image.size
+        top = image.crop((0, 0, width, min(height, width * size[1] // size[0])))
+        top.thumbnail(size)
+        top.convert("RGB").save(path, "JPEG", quality=70)
@@ -0,0 +1,130 @@
+"""
+Step-level timing spans for page-object methods.
+
+`instrument` wraps every public async method of a page-object class in a span;
+BasePage readiness waits add their own spans underneath. Spans are collected by
+a SpanRecorder attached to the Playwright page, exported per test as Chrome
+trace-event JSON (open in chrome://tracing or https://ui.perfetto.dev) and
+drawn as a waterfall in report.html.
+
+With no recorder attached to a page, a wrapped method costs one dict lookup.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
+
+_RECORDERS = weakref.WeakKeyDictionary()
+
+
+class SpanRecorder:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: list[dict] = []
+        # Objects with async step_started(name) / step_finished(name, ok) hooks, called for top-level spans
+        self.listeners: list = []
+        self._depth = 0
+
+    @asynccontextmanager
+    async def span(self, name: str, **args):
+        depth = self._depth
+        if depth == 0:
+            for listener in self.listeners:
+                await listener.step_started(name)
+        record = {"name": name, "start": time.perf_counter() - self.origin, "depth": depth, "ok": False}
+        if args:
+            record["args"] = args
+        self.spans.append(record)
+        self._depth += 1
+        try:
+            yield record
+            record["ok"] = True
+        finally:
+            self._depth -= 1
+            record["dur"] = time.perf_counter() - self.origin - record["start"]
+            if depth == 0:
+                for listener in self.listeners:
+                    await listener.step_finished(name, record["ok"])
+
+    def compact(self) -> list[dict]:
+        """Spans in milliseconds, small enough to keep in the result entry."""
+        return [
+            {
+                "name": s["name"],
+                "start": round(s["start"] * 1000, 1),
+                "dur": round(s.get("dur", 0) * 1000, 1),
+                "depth": s["depth"],
+                "ok": s["ok"],
+            }
+            for s in self.spans
+        ]
+
+    def to_chrome_trace(self, label: str = "") -> dict:
+        events = [
+            {
+                "name": s["name"],
+                "cat": "step",
+                "ph": "X",
+                "ts": round(s["start"] * 1e6),
+                "dur": round(s.get("dur", 0) * 1e6),
+                "pid": os.getpid(),
+                "tid": 1,
+                "args": {**s.get("args", {}), "ok": s["ok"]},
+            }
+            for s in self.spans
+        ]
+        if label:
+            events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": 1, "args": {"name": label}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str, label: str = ""):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(label), f, separators=(",", ":"))
+
+
+def attach(page, recorder: SpanRecorder):
+    _RECORDERS[page] = recorder
+
+
+def recorder_for(page) -> SpanRecorder | None:
+    try:
+        return _RECORDERS.get(page)
+    except TypeError:
+        return None
+
+
+@asynccontextmanager
+async def span(page, name: str, **args):
+    recorder = recorder_for(page)
+    if recorder is None:
+        yield None
+        return
+    async with recorder.span(name, **args) as record:
+        yield record
+
+
+def instrument(cls):
+    """Class decorator: time every public async method defined on `cls`."""
+    for attr, method in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, attr, _traced(method, f"{cls.__name__}.{attr}"))
+    return cls
+
+
+def _traced(method, name: str):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        recorder = recorder_for(self.page)
+        if recorder is None:
+            return await method(self, *args, **kwargs)
+        async with recorder.span(name):
+            return await method(self, *args, **kwargs)
+
+    return wrapper
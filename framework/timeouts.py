@@ -0,0 +1,126 @@
+"""
+Adaptive timeouts learned from how long each named step took before.
+
+Every successful BasePage wait records its duration under the wait's name.
+The timeout for a step is its p99 over the last TIMEOUT_WINDOW successful
+runs times TIMEOUT_FACTOR, clamped between TIMEOUT_FLOOR_MS and
+TIMEOUT_CEILING_MS. A step with too little history uses the cold-start default
+its page object declares. Slow deploys raise the learned timeouts on their own.
+When something is genuinely broken, the test fails after a few times the
+usual wait instead of a worst-case literal.
+
+History is kept per host (dev app, local mock app, ...) in
+REPORT_DIR/step_timings.json. The mock app answers in milliseconds, so its
+samples must never set the timeouts used against a real server. The file is
+merged on save, so parallel workers add to it instead of overwriting each other.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+
+TIMEOUT_HISTORY_PATH = os.getenv(
+    "TIMEOUT_HISTORY", os.path.join(os.getenv("REPORT_DIR", "reports"), "step_timings.json")
+)
+TIMEOUT_FACTOR = float(os.getenv("TIMEOUT_FACTOR", "3"))
+TIMEOUT_FLOOR_MS = float(os.getenv("TIMEOUT_FLOOR_MS", "1000"))
+TIMEOUT_CEILING_MS = float(os.getenv("TIMEOUT_CEILING_MS", "30000"))
+# Successful runs kept per step, and how many are needed before the history is trusted
+TIMEOUT_WINDOW = int(os.getenv("TIMEOUT_WINDOW", "200"))
+TIMEOUT_MIN_SAMPLES = int(os.getenv("TIMEOUT_MIN_SAMPLES", "5"))
+# ADAPTIVE_TIMEOUTS=0 always uses the cold-start defaults (history is still recorded)
+ADAPTIVE_TIMEOUTS = os.getenv("ADAPTIVE_TIMEOUTS", "1").lower() not in ("0", "false", "no")
+
+
+def step_key(name: str, host: str = "") -> str:
+    return f"{host}/{name}" if host else name
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TimeoutPolicy:
+    def __init__(
+        self,
+        path: str = TIMEOUT_HISTORY_PATH,
+        factor: float = TIMEOUT_FACTOR,
+        floor_ms: float = TIMEOUT_FLOOR_MS,
+        ceiling_ms: float = TIMEOUT_CEILING_MS,
+        window: int = TIMEOUT_WINDOW,
+        min_samples: int = TIMEOUT_MIN_SAMPLES,
+        enabled: bool = ADAPTIVE_TIMEOUTS,
+    ):
+        self.path = path
+        self.factor = factor
+        self.floor_ms = floor_ms
+        self.ceiling_ms = ceiling_ms
+        self.window = window
+        self.min_samples = min_samples
+        self.enabled = enabled
+        self.data: dict[str, dict] = self._load()
+        # Samples gathered by this process, merged into the file on save
+        self._delta: dict[str, dict] = {}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def timeout(self, name: str, default: float, host: str = "") -> float:
+        """Timeout in ms for step `name` on `host`; `default` until enough history exists."""
+        samples = self.data.get(step_key(name, host), {}).get("samples", [])
+        if not self.enabled or len(samples) < self.min_samples:
+            return default
+        learned = percentile(samples, 99) * 1000 * self.factor
+        return min(max(learned, self.floor_ms), self.ceiling_ms)
+
+    def record(self, name: str, seconds: float, ok: bool = True, host: str = ""):
+        # Timed-out waits only say "longer than the timeout" and would skew the percentile
+        for target in (self.data, self._delta):
+            step = target.setdefault(step_key(name, host), {"samples": [], "timeouts": 0})
+            if ok:
+                step["samples"].append(round(seconds, 4))
+                del step["samples"][: -self.window]
+            else:
+                step["timeouts"] += 1
+
+    def save(self):
+        merged = self._load()
+        for name, delta in self._delta.items():
+            step = merged.setdefault(name, {"samples": [], "timeouts": 0})
+            step["samples"] = (step["samples"] + delta["samples"])[-self.window :]
+            step["timeouts"] += delta["timeouts"]
+        if self._delta:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(merged, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self.data = merged
+        self._delta = {}
+
+    def stats(self) -> dict[str, dict]:
+        """Per host/step key: samples, p99 and the timeout the next run will use (None = cold-start default)."""
+        result = {}
+        for name, step in self.data.items():
+            samples = step["samples"]
+            learned = len(samples) >= self.min_samples
+            result[name] = {
+                "samples": len(samples),
+                "p99_ms": percentile(samples, 99) * 1000,
+                "timeout_ms": self.timeout(name, 0) if learned and self.enabled else None,
+                "timeouts": step["timeouts"],
+            }
+        return result
+
+
+timeout_policy = TimeoutPolicy()
@@ -0,0 +1,91 @@
+"""
+Retain-on-failure Playwright tracing, one chunk per page-object step.
+
+The tracer listens to the page's SpanRecorder: every top-level step (an
+instrumented page-object method) starts a new trace chunk, so the driver only
+holds one step's screenshots and DOM snapshots at a time. Finished chunks go
+to a scratch directory, and only the last `max_chunks` are kept. When the test
+passes they are thrown away. When it fails they are moved into the report
+(open with `playwright show-trace <zip>` or https://trace.playwright.dev).
+
+Every tracing call is timed so the report can show what tracing costs.
+"""
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from playwright.async_api import BrowserContext
+
+MODES = ("off", "retain-on-failure")
+
+
+def _chunk_name(index: int, title: str) -> str:
+    return f"{index:02d}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', title)[:60]}.zip"
+
+
+class ChunkedTracer:
+    def __init__(self, context: BrowserContext, max_chunks: int = 3, screenshots: bool = True, snapshots: bool = True):
+        self.context = context
+        self.max_chunks = max_chunks
+        self.screenshots = screenshots
+        self.snapshots = snapshots
+        self.chunk_dir = tempfile.mkdtemp(prefix="construct-trace-")
+        self.chunks: list[str] = []
+        self.failed_step: str | None = None
+        # Seconds spent inside tracing calls, i.e. added to the test's own time
+        self.overhead = 0.0
+        self._index = 0
+        self._title = "setup"
+
+    async def _timed(self, call, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await call(*args, **kwargs)
+        finally:
+            self.overhead += time.perf_counter() - started
+
+    async def start(self):
+        await self._timed(self.context.tracing.start, screenshots=self.screenshots, snapshots=self.snapshots)
+        await self._timed(self.context.tracing.start_chunk, title=self._title)
+
+    async def _close_chunk(self, keep: bool = True):
+        if not keep:
+            await self._timed(self.context.tracing.stop_chunk)
+            return
+        path = os.path.join(self.chunk_dir, _chunk_name(self._index, self._title))
+        await self._timed(self.context.tracing.stop_chunk, path=path)
+        self.chunks.append(path)
+        while len(self.chunks) > self.max_chunks:
+            os.remove(self.chunks.pop(0))
+
+    async def step_started(self, name: str):
+        await self._close_chunk()
+        self._index += 1
+        self._title = name
+        await self._timed(self.context.tracing.start_chunk, title=name)
+
+    async def step_finished(self, name: str, ok: bool):
+        if not ok and self.failed_step is None:
+            self.failed_step = name
+
+    async def stop(self, keep: bool, target_dir: str) -> list[str]:
+        """End tracing; on `keep`, move the retained chunks into `target_dir` and return their paths."""
+        try:
+            await self._close_chunk(keep)
+            await self._timed(self.context.tracing.stop)
+        except Exception:
+            # The context went away with the browser; nothing left to save
+            keep = False
+        kept = []
+        if keep:
+            os.makedirs(target_dir, exist_ok=True)
+            for path in self.chunks:
+                target = os.path.join(target_dir, os.path.basename(path))
+                shutil.move(path, target)
+                kept.append(target)
+        shutil.rmtree(self.chunk_dir, ignore_errors=True)
+        return kept
@@ -0,0 +1,170 @@
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from framework.spans import span
+from framework.timeouts import TimeoutPolicy, timeout_policy
+from pages.locators import first_visible
+
+_PAGE_METRICS = weakref.WeakKeyDictionary()
+
+# Sets every value in one round-trip. Uses the native value setter so React/Vue
+# controlled inputs notice the change, then fires the same input/change events
+# a user edit would. Returns the indexes it could not fill (non-input elements).
+_BULK_FILL_SCRIPT = """
+(pairs) => {
+  const skipped = [];
+  pairs.forEach(([el, value], index) => {
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+      : el instanceof HTMLInputElement ? HTMLInputElement.prototype : null;
+    if (!proto || el.disabled || el.readOnly) {
+      skipped.push(index);
+      return;
+    }
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+    el.dispatchEvent(new Event("input", { bubbles: true }));
+    el.dispatchEvent(new Event("change", { bubbles: true }));
+    el.blur();
+  });
+  return skipped;
+}
+"""
+
+
+def page_metrics(page) -> dict:
+    """Measurements shared by every page object on `page`; conftest copies them into the test result."""
+    return _PAGE_METRICS.setdefault(page, {"waits": []})
+
+
+class BasePage:
+    """Shared helpers for page objects.
+
+    Readiness waits block on one specific signal (a URL, an element state, or
+    the first of several racing signals such as an API answer) instead of
+    `networkidle`, which never settles on pages with polling or analytics
+    traffic. Every wait is timed in `wait_timings`.
+
+    Waits called without a timeout get one from the TimeoutPolicy, learned from
+    earlier runs of the same named step. Subclasses list cold-start defaults
+    for their steps in TIMEOUTS.
+    """
+
+    # Step name -> timeout (ms) used until the step has enough history
+    TIMEOUTS: dict[str, float] = {}
+    DEFAULT_TIMEOUT = 10000
+
+    def __init__(self, page: Page, timeouts: TimeoutPolicy | None = None):
+        self.page = page
+        self.timeouts = timeouts or timeout_policy
+        self.metrics = page_metrics(page)
+        self.wait_timings: list[dict] = self.metrics["waits"]
+
+    def _host(self) -> str:
+        # Learned timeouts are per host: the local mock app must not shorten the real app's
+        return urlparse(self.page.url).hostname or ""
+
+    def timeout_for(self, name: str) -> float:
+        return self.timeouts.timeout(name, self.TIMEOUTS.get(name, self.DEFAULT_TIMEOUT), host=self._host())
+
+    @asynccontextmanager
+    async def _timed_wait(self, name: str, kind: str):
+        host = self._host()
+        started = time.perf_counter()
+        record = {"name": name, "kind": kind, "ok": False}
+        try:
+            async with span(self.page, name, kind=kind):
+                yield record
+            record["ok"] = True
+        finally:
+            record["seconds"] = time.perf_counter() - started
+            self.wait_timings.append(record)
+            # sample=False: the wait ended on a signal that says nothing about how long the step takes
+            if record.get("sample", True):
+                ok = record["ok"] and not record.get("timed_out")
+                self.timeouts.record(name, record["seconds"], ok=ok, host=host)
+
+    async def wait_until_url(self, name: str, url, timeout: float | None = None, required: bool = True) -> bool:
+        """Wait for the page URL to match a glob, regex or predicate."""
+        timeout = self.timeout_for(name) if timeout is None else timeout
+        try:
+            async with self._timed_wait(name, "url"):
+                await self.page.wait_for_url(url, timeout=timeout, wait_until="commit")
+            return True
+        except PlaywrightTimeoutError:
+            if required:
+                raise
+            return False
+
+    async def wait_until_element(
+        self, name: str, locator, state: str = "visible", timeout: float | None = None, required: bool = True
+    ) -> bool:
+        timeout = self.timeout_for(name) if timeout is None else timeout
+        try:
+            async with self._timed_wait(name, "element"):
+                await locator.wait_for(state=state, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            if required:
+                raise
+            return False
+
+    async def first_visible(self, field: str, candidates: dict, timeout: float | None = None):
+        """Race candidate locators for `field`; returns (name, locator) of the first visible one."""
+        name = f"{type(self).__name__}.{field}"
+        timeout = self.timeout_for(name) if timeout is None else timeout
+        async with self._timed_wait(name, "locator"):
+            return await first_visible(name, candidates, timeout)
+
+    async def wait_for_first(self, name: str, signals: dict, action=None, sample_signals=None) -> str | None:
+        """Start every signal, run `action`, and return the name of the first signal to fire.
+
+        Signals are awaitables that raise (usually a Playwright timeout) when they
+        don't fire. Returns None if none of them fired. With `sample_signals`, only
+        those signals count as a timing sample for the step's learned timeout.
+        """
+        tasks = {asyncio.ensure_future(signal): key for key, signal in signals.items()}
+        pending = set(tasks)
+        try:
+            async with self._timed_wait(name, "signal") as record:
+                if action is not None:
+                    await action()
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            record["signal"] = tasks[task]
+                            if sample_signals is not None and tasks[task] not in sample_signals:
+                                record["sample"] = False
+                            return tasks[task]
+                record["timed_out"] = True
+                return None
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def fill_fields(self, fields: dict, timeout: float | None = None, name: str = "fill_fields"):
+        """Fill several inputs at once from a {locator: value} mapping.
+
+        Visibility is checked for all fields concurrently and the values are set
+        in a single evaluate() call, instead of one fill() round-trip (with its
+        own actionability checks) per field. Elements that aren't plain
+        inputs/textareas, or are disabled/read-only, fall back to fill().
+        """
+        locators = list(fields)
+        values = [str(fields[locator]) for locator in locators]
+        timeout = self.timeout_for(name) if timeout is None else timeout
+        async with self._timed_wait(name, "fill"):
+            await asyncio.gather(*(locator.wait_for(state="visible", timeout=timeout) for locator in locators))
+            handles = await asyncio.gather(*(locator.element_handle(timeout=timeout) for locator in locators))
+            try:
+                skipped = await self.page.evaluate(_BULK_FILL_SCRIPT, [[h, v] for h, v in zip(handles, values)])
+            finally:
+                await asyncio.gather(*(h.dispose() for h in handles), return_exceptions=True)
+            for index in skipped:
+                await locators[index].fill(values[index], timeout=timeout)
@@ -0,0 +1,128 @@
+"""
+"First of many" locator resolution.
+
+Some fields render differently between app versions, so page objects keep a
+list of candidate locators. Instead of trying them one after another (paying
+the full timeout for every dead candidate), all candidates are raced and the
+first visible one wins. Winners are remembered per page/field in a small JSON
+file so later runs try the known-good candidate first.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+
+from playwright.async_api import Locator, TimeoutError as PlaywrightTimeoutError
+
+SELECTOR_CACHE_PATH = os.getenv("SELECTOR_CACHE", ".selector_cache.json")
+
+# How long the remembered winner gets before the full race starts
+CACHED_WINNER_TIMEOUT = 1000
+
+
+class SelectorCache:
+    def __init__(self, path: str = SELECTOR_CACHE_PATH):
+        self.path = path
+        self.data: dict[str, dict] = self._load()
+        # Counts gathered by this process, merged into the file on save
+        self._delta: dict[str, dict] = {}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def winner(self, key: str) -> str | None:
+        return self.data.get(key, {}).get("winner")
+
+    def record(self, key: str, candidates: list[str], winner: str | None, cache_hit: bool):
+        for target in (self.data, self._delta):
+            field = target.setdefault(key, {"winner": None, "hits": 0, "misses": 0, "wins": {}})
+            if winner is not None:
+                field["winner"] = winner
+                field["wins"][winner] = field["wins"].get(winner, 0) + 1
+            field["hits" if cache_hit else "misses"] += 1
+            for name in candidates:
+                field["wins"].setdefault(name, 0)
+
+    def save(self):
+        # Re-read so parallel workers don't drop each other's counts
+        merged = self._load()
+        for key, delta in self._delta.items():
+            field = merged.setdefault(key, {"winner": None, "hits": 0, "misses": 0, "wins": {}})
+            field["winner"] = delta["winner"] or field["winner"]
+            field["hits"] += delta["hits"]
+            field["misses"] += delta["misses"]
+            for name, wins in delta["wins"].items():
+                field["wins"][name] = field["wins"].get(name, 0) + wins
+        if self._delta:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(merged, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self.data = merged
+        self._delta = {}
+
+    def stats(self) -> dict[str, dict]:
+        """Per field: cache hits/misses, wins per candidate and candidates that never won."""
+        return {
+            key: {
+                "hits": field["hits"],
+                "misses": field["misses"],
+                "wins": dict(field["wins"]),
+                "dead": sorted(name for name, wins in field["wins"].items() if wins == 0),
+            }
+            for key, field in self.data.items()
+        }
+
+
+selector_cache = SelectorCache()
+
+
+async def _race(candidates: dict[str, Locator], timeout: float) -> str | None:
+    tasks = {
+        asyncio.ensure_future(locator.wait_for(state="visible", timeout=timeout)): name
+        for name, locator in candidates.items()
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return tasks[task]
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        # Let cancelled waits unwind so they don't surface as "exception never retrieved"
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def first_visible(
+    key: str,
+    candidates: dict[str, Locator],
+    timeout: float,
+    cache: SelectorCache | None = None,
+) -> tuple[str, Locator]:
+    """Return (name, locator) of the first candidate to become visible.
+
+    Raises PlaywrightTimeoutError when none shows up within `timeout`.
+    """
+    cache = cache or selector_cache
+    cached = cache.winner(key)
+    if cached in candidates:
+        try:
+            await candidates[cached].wait_for(state="visible", timeout=min(timeout, CACHED_WINNER_TIMEOUT))
+            cache.record(key, list(candidates), cached, cache_hit=True)
+            return cached, candidates[cached]
+        except PlaywrightTimeoutError:
+            pass
+    winner = await _race(candidates, timeout)
+    cache.record(key, list(candidates), winner, cache_hit=False)
+    if winner is None:
+        raise PlaywrightTimeoutError(f"None of the candidates for {key} became visible: {', '.join(candidates)}")
+    return winner, candidates[winner]
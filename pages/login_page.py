@@ -1,9 +1,23 @@
 import re
 
+from framework.spans import instrument
+from pages.base_page import BasePage
+
+
+@instrument
+class LoginPage(BasePage):
+    # Cold-start timeouts (ms); learned ones replace them once the steps have history
+    TIMEOUTS = {
+        "login.email_input": 5000,
+        "login.password_input": 5000,
+        "login.login_button": 5000,
+        "login.fill": 5000,
+        "login.form_gone": 10000,
+        "login.signed_in": 30000,
+    }
 
-class LoginPage:
     def __init__(self, page, base_url):
-        self.page = page
+        super().__init__(page)
         self.base_url = base_url
         self.email_input = page.get_by_placeholder("Enter your email")
         self.password_input = page.get_by_placeholder("Enter your password")
@@ -14,22 +28,26 @@ class LoginPage:
         await self.page.goto(self.base_url)
 
     async def type_email(self, email):
-        await self.email_input.wait_for(state="visible", timeout=5000)
+        await self.wait_until_element("login.email_input", self.email_input)
         await self.email_input.fill(email)
 
     async def type_password(self, password):
-        await self.password_input.wait_for(state="visible", timeout=5000)
+        await self.wait_until_element("login.password_input", self.password_input)
         await self.password_input.fill(password)
 
     async def click_login_button(self):
-        await self.login_button.wait_for(state="visible", timeout=5000)
+        await self.wait_until_element("login.login_button", self.login_button)
         await self.login_button.click()
 
     async def is_login_page_displayed(self):
         return await self.login_heading.is_visible()
 
     async def login(self, email, password):
-        await self.type_email(email)
-        await self.type_password(password)
+        await self.fill_fields({self.email_input: email, self.password_input: password}, name="login.fill")
         await self.click_login_button()
-        await self.page.wait_for_load_state("networkidle", timeout=10000)
+        # Signed in once the form goes away; wrong credentials keep it on screen and are for the caller to assert
+        await self.wait_until_element("login.form_gone", self.email_input, state="hidden", required=False)
+
+    async def wait_until_signed_in(self, required: bool = True) -> bool:
+        """Wait until the app has navigated away from the login page."""
+        return await self.wait_until_url("login.signed_in", lambda url: "login" not in url.lower(), required=required)
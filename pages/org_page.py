@@ -1,15 +1,80 @@
+import itertools
+import re
+import time
 import uuid
 
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
+from framework.spans import instrument
+from pages.base_page import BasePage
+
 
 DEFAULT_WELCOME_URL = "https://dev-app.helpconstruct.com/welcome"
 
+# Backend call made by the "Create a business" button
+CREATE_ORG_API = re.compile(r"/organi[sz]ations?(?:/create)?/?(?:\?|$)", re.I)
+ORG_EXISTS_MESSAGE = re.compile(r"already (?:exists|taken|in use|registered)", re.I)
+# Status the create-org API answers a duplicate name with. Any other error status is a real failure,
+# including 422: that is a name the API refused (empty, too long), and a new suffix wouldn't fix it
+COLLISION_STATUSES = (409,)
+
+
+class OrgCreateError(Exception):
+    """The create-org API failed for a reason other than a duplicate name (auth, outage, ...)."""
+
+
+class OrgExistsError(Exception):
+    """An organization with this name already exists and create_org was told not to rename."""
+
+
+def create_org_rejection(response) -> str | None:
+    """"collision" for a duplicate-name answer of the create-org API, "error" for any other failure, else None."""
+    if response.request.method != "POST" or response.status < 400 or not CREATE_ORG_API.search(response.url):
+        return None
+    return "collision" if response.status in COLLISION_STATUSES else "error"
+
 
-class OrgPage:
-    def __init__(self, page: Page, welcome_url: str = DEFAULT_WELCOME_URL):
-        self.page = page
+class OrgNameAllocator:
+    """Hands out organization names that are unique to this run (and worker).
+
+    Names never collide with orgs created by earlier runs or by parallel
+    workers, so create_org doesn't have to detect and retry a collision.
+    """
+
+    def __init__(self, run_tag: str):
+        self.run_tag = run_tag
+        self._counter = itertools.count(1)
+
+    def allocate(self, base: str) -> str:
+        return f"{base} {self.run_tag}{next(self._counter):02d}"
+
+
+@instrument
+class OrgPage(BasePage):
+    # Cold-start timeouts (ms); learned ones replace them once the steps have history
+    TIMEOUTS = {
+        "org.welcome_url": 15000,
+        "org.create_url": 20000,
+        "org.create_attempt": 30000,
+        "org.setup_heading": 20000,
+        "org.setup_form": 20000,
+        "OrgPage.address_suggestion": 3000,
+        "org.setup_fields": 5000,
+        "OrgPage.ownership_dropdown": 2000,
+        "org.next_button": 10000,
+        "org.setup_submitted": 15000,
+        "org.hello": 20000,
+    }
+
+    def __init__(
+        self,
+        page: Page,
+        welcome_url: str = DEFAULT_WELCOME_URL,
+        name_allocator: OrgNameAllocator | None = None,
+    ):
+        super().__init__(page)
         self.welcome_url = welcome_url
+        self.name_allocator = name_allocator
 
         # Welcome
         self.start_button = self.page.get_by_role("button", name="Start")
@@ -17,6 +82,7 @@ class OrgPage:
         # Create organization
         self.org_name_input = self.page.get_by_placeholder("ABC Corp")
         self.create_business_button = self.page.get_by_role("button", name="Create a business")
+        self.org_exists_message = self.page.get_by_text(ORG_EXISTS_MESSAGE).first
 
         # Setup
         self.address_input = self.page.get_by_placeholder("Type to search address...")
@@ -32,37 +98,79 @@ class OrgPage:
     async def click_start_on_welcome(self):
         if "/welcome" not in self.page.url:
             await self.page.goto(self.welcome_url)
-        await self.page.wait_for_url("**/welcome", timeout=15000)
+        await self.wait_until_url("org.welcome_url", "**/welcome")
         await self.start_button.click()
 
-    async def create_org(self, name: str):
-        await self.page.wait_for_url("**/organization/create-organization", timeout=20000)
+    async def create_org(self, name: str, rename_on_collision: bool = True) -> str:
+        """Create an organization and wait for its setup form; returns the name it was created under.
 
-        async def _attempt(org_name: str) -> bool:
+        On a name collision the org is created once more under a fresh name,
+        unless `rename_on_collision` is False, in which case OrgExistsError is raised.
+        """
+        await self.wait_until_url("org.create_url", "**/organization/create-organization")
+
+        stats = self.metrics.setdefault("org_create", {"attempts": 0, "collisions": 0, "wasted_seconds": 0.0})
+
+        def _rejected(response) -> bool:
+            return create_org_rejection(response) == "collision"
+
+        async def _attempt(org_name: str) -> str | None:
+            started = time.perf_counter()
+            timeout = self.timeout_for("org.create_attempt")
+            stats["attempts"] += 1
             await self.org_name_input.fill(org_name)
-            await self.create_business_button.click()
-            await self.page.wait_for_load_state("networkidle", timeout=30000)
-            try:
-                await self.page.wait_for_function(
-                    "location.href.includes('/organization/setup/')",
-                    timeout=30000,
-                )
+            errors = []
+
+            def _failed(response) -> bool:
+                if create_org_rejection(response) != "error":
+                    return False
+                errors.append(f"POST {response.url} -> {response.status}")
                 return True
-            except PlaywrightTimeoutError:
-                return False
+
+            # A duplicate name is reported by the API/toast within milliseconds; don't wait out the redirect
+            signals = {
+                "created": self.page.wait_for_url(
+                    lambda url: "/organization/setup/" in url, timeout=timeout, wait_until="commit"
+                ),
+                "rejected": self.page.wait_for_event("response", predicate=_rejected, timeout=timeout),
+                # An expired session or a backend outage: retrying under another name would only hide it
+                "failed": self.page.wait_for_event("response", predicate=_failed, timeout=timeout),
+            }
+            # A toast left over from the previous attempt says nothing about this one
+            if not await self.org_exists_message.is_visible():
+                signals["exists"] = self.org_exists_message.wait_for(state="visible", timeout=timeout)
+            # Collisions answer in milliseconds; only a finished create-and-redirect is a sample of this step
+            outcome = await self.wait_for_first(
+                "org.create_attempt", signals, action=self.create_business_button.click, sample_signals=("created",)
+            )
+            if outcome == "failed":
+                raise OrgCreateError(f"Creating organization {org_name!r} failed: {errors[0]}")
+            if outcome not in ("created", None):
+                stats["collisions"] += 1
+            if outcome != "created":
+                stats["wasted_seconds"] += time.perf_counter() - started
+            return outcome
 
         # First try with provided name
-        ok = await _attempt(name)
-        if not ok:
-            # Retry once with a random suffix to avoid "already exists" errors
-            suffix = uuid.uuid4().hex[:6].upper()
-            fallback_name = f"{name} {suffix}"
-            ok = await _attempt(fallback_name)
-
-        if not ok:
+        created_name = name
+        outcome = await _attempt(name)
+        if outcome in ("rejected", "exists") and not rename_on_collision:
+            raise OrgExistsError(f"Organization {name!r} already exists")
+        if outcome != "created" and rename_on_collision:
+            # Retry once with a fresh name to avoid "already exists" errors
+            if self.name_allocator is not None:
+                created_name = self.name_allocator.allocate(name)
+            else:
+                suffix = uuid.uuid4().hex[:6].upper()
+                created_name = f"{name} {suffix}"
+            outcome = await _attempt(created_name)
+
+        if outcome != "created":
             raise PlaywrightTimeoutError("Could not reach setup page after creating org")
 
-        await self.page.wait_for_selector('text=\"Tell Us About Your Business\"', timeout=20000)
+        setup_heading = self.page.locator('text="Tell Us About Your Business"').first
+        await self.wait_until_element("org.setup_heading", setup_heading)
+        return created_name
 
     async def fill_setup_form(
         self,
@@ -75,7 +183,7 @@ class OrgPage:
         employees: str,
     ):
         # Ensure we are on the setup form by waiting for address input
-        await self.address_input.wait_for(state="visible", timeout=20000)
+        await self.wait_until_element("org.setup_form", self.address_input)
 
         # Address autocomplete: type first 3 characters, wait for suggestions, pick the first visible suggestion.
         await self.address_input.click()
@@ -90,62 +198,52 @@ class OrgPage:
             ".suggestion-item",
             "li[role='option']",
         ]
-
-        clicked = False
-        for sel in suggestion_selectors:
-            try:
-                locator = self.page.locator(sel).first
-                await locator.wait_for(state="visible", timeout=3000)
-                await locator.click()
-                clicked = True
-                break
-            except Exception:
-                continue
-
-        if not clicked:
+        # Race all selectors at once instead of paying 3s for every one that doesn't match
+        try:
+            _, suggestion = await self.first_visible(
+                "address_suggestion",
+                {sel: self.page.locator(sel).first for sel in suggestion_selectors},
+            )
+            await suggestion.click()
+        except PlaywrightTimeoutError:
             # Fallback: press Enter to accept the typed address
             await self.page.keyboard.press("Enter")
 
-        await self.phone_input.fill(phone)
-        await self.email_input.fill(email)
-        await self.website_input.fill(website)
-        await self.ceo_input.fill(ceo_name)
+        await self.fill_fields(
+            {
+                self.phone_input: phone,
+                self.email_input: email,
+                self.website_input: website,
+                self.ceo_input: ceo_name,
+                self.employees_input: employees,
+            },
+            name="org.setup_fields",
+        )
 
         # Ownership dropdown selection - resolve locator robustly
-        ownership_locators = [
-            lambda: self.page.get_by_label("Ownership Type"),
-            lambda: self.page.get_by_placeholder("Select an option"),
-            lambda: self.page.get_by_role("combobox").first,
-        ]
-        ownership_locator = None
-        for loc_fn in ownership_locators:
-            try:
-                candidate = loc_fn()
-                # check if visible
-                await candidate.wait_for(state="visible", timeout=2000)
-                ownership_locator = candidate
-                break
-            except Exception:
-                continue
-        if ownership_locator is None:
+        try:
+            _, ownership_locator = await self.first_visible(
+                "ownership_dropdown",
+                {
+                    "label:Ownership Type": self.page.get_by_label("Ownership Type"),
+                    "placeholder:Select an option": self.page.get_by_placeholder("Select an option"),
+                    "role:combobox": self.page.get_by_role("combobox").first,
+                },
+            )
+        except PlaywrightTimeoutError:
             raise PlaywrightTimeoutError("Could not find ownership dropdown")
         await ownership_locator.click()
         # select the requested ownership option
         await self.page.get_by_role("option", name=ownership).first.click()
 
-        await self.employees_input.fill(employees)
-
     async def click_next(self):
-        await self.next_button.wait_for(state="visible", timeout=10000)
+        await self.wait_until_element("org.next_button", self.next_button)
         await self.next_button.click()
-        await self.page.wait_for_load_state("networkidle", timeout=15000)
+        # The setup form is done once Next goes away; is_hello_page_displayed() checks where we landed
+        await self.wait_until_element("org.setup_submitted", self.next_button, state="hidden", required=False)
 
     async def is_hello_page_displayed(self) -> bool:
-        try:
-            await self.page.wait_for_selector('text="Hello"', timeout=20000)
-            return await self.page.get_by_text("Hello").is_visible()
-        except PlaywrightTimeoutError:
-            return False
+        return await self.wait_until_element("org.hello", self.page.locator('text="Hello"').first, required=False)
 
     async def complete_flow_from_welcome(
         self,
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Load-test the Construct app with the LoginPage/OrgPage flows.
+
+Usage:
+  python3 scripts/load_test.py --users 50 --concurrency 10 --ramp-up 30 --browsers 2
+
+Each session logs in and creates an organization in its own browser context.
+Prints throughput and p50/p95/p99 latency per step. Credentials and the
+target URL default to TEST_EMAIL, TEST_PASSWORD and WEBSITE_URL from .env.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv  # noqa: E402
+
+from framework.load import format_summary, run_load  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    load_dotenv()
+    p = argparse.ArgumentParser(description="Run concurrent login + create-organization sessions")
+    p.add_argument("--base-url", default=os.getenv("WEBSITE_URL", "https://dev-app.helpconstruct.com"))
+    p.add_argument("--email", default=os.getenv("TEST_EMAIL"), help="Login email (TEST_EMAIL)")
+    p.add_argument("--password", default=os.getenv("TEST_PASSWORD"), help="Login password (TEST_PASSWORD)")
+    p.add_argument("--users", type=int, default=10, help="Total sessions to run")
+    p.add_argument("--concurrency", type=int, default=5, help="Maximum sessions running at once")
+    p.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which session starts are spread")
+    p.add_argument("--browsers", type=int, default=1, help="Browser processes to spread contexts over")
+    p.add_argument("--headed", action="store_true", help="Show the browsers")
+    p.add_argument("--org-prefix", default="Load Org", help="Organization name prefix")
+    p.add_argument("--json", help="Also write the summary as JSON to this path")
+    args = p.parse_args(argv)
+
+    if not args.email or not args.password:
+        print("TEST_EMAIL/TEST_PASSWORD (or --email/--password) are required", file=sys.stderr)
+        return 2
+
+    summary = asyncio.run(
+        run_load(
+            base_url=args.base_url,
+            email=args.email,
+            password=args.password,
+            users=args.users,
+            concurrency=args.concurrency,
+            ramp_up=args.ramp_up,
+            browsers=args.browsers,
+            headless=not args.headed,
+            org_prefix=args.org_prefix,
+        )
+    )
+    print(format_summary(summary))
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return 1 if summary["failed_sessions"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
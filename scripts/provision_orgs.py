@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Create organizations in bulk from a CSV or JSONL file.
+
+Usage:
+  python3 scripts/provision_orgs.py orgs.csv --concurrency 6
+
+Each row needs `org_name`; `id`, `address_prefix`, `ownership`, `phone`,
+`email`, `website`, `ceo_name` and `employees` are optional (the test values
+are used for missing ones). Finished rows are appended to a checkpoint log
+(`<input>.done.jsonl` by default), so running the same command again after a
+crash only creates the orgs that are still missing. Credentials and the target
+URL default to TEST_EMAIL, TEST_PASSWORD and WEBSITE_URL from .env.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv  # noqa: E402
+
+from framework.provision import provision_orgs  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    load_dotenv()
+    p = argparse.ArgumentParser(description="Create organizations from a CSV/JSONL file")
+    p.add_argument("input", help="CSV or JSONL file with one organization per row")
+    p.add_argument("--checkpoint", help="Checkpoint log (default: <input>.done.jsonl)")
+    p.add_argument("--base-url", default=os.getenv("WEBSITE_URL", "https://dev-app.helpconstruct.com"))
+    p.add_argument("--email", default=os.getenv("TEST_EMAIL"), help="Login email (TEST_EMAIL)")
+    p.add_argument("--password", default=os.getenv("TEST_PASSWORD"), help="Login password (TEST_PASSWORD)")
+    p.add_argument("--concurrency", type=int, default=4, help="Organizations created at once")
+    p.add_argument("--headed", action="store_true", help="Show the browser")
+    p.add_argument("--json", help="Also write the summary as JSON to this path")
+    args = p.parse_args(argv)
+
+    if not args.email or not args.password:
+        print("TEST_EMAIL/TEST_PASSWORD (or --email/--password) are required", file=sys.stderr)
+        return 2
+
+    summary = asyncio.run(
+        provision_orgs(
+            input_path=args.input,
+            checkpoint_path=args.checkpoint or f"{args.input}.done.jsonl",
+            base_url=args.base_url,
+            email=args.email,
+            password=args.password,
+            concurrency=args.concurrency,
+            headless=not args.headed,
+            auth_state_dir=os.getenv("AUTH_STATE_DIR", ".auth"),
+        )
+    )
+    if summary["errors"]:
+        print("Errors: " + ", ".join(f"{name} x{count}" for name, count in summary["errors"].items()))
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+import zipfile
+
+from framework.archive import IncrementalArchive, append_files, combine_archives, resolve
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestIncrementalArchive:
+    def test_stores_images_and_deflates_text(self, tmp_path):
+        archive = IncrementalArchive(str(tmp_path / "shards" / "main.zip"), str(tmp_path))
+        archive.add(_write(tmp_path / "shot.png", b"\x89PNG" + b"0" * 1000))
+        archive.add(_write(tmp_path / "test.json", b'{"a": 1}' * 100))
+        archive.close()
+        with zipfile.ZipFile(tmp_path / "shards" / "main.zip") as zf:
+            assert zf.getinfo("shot.png").compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo("test.json").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        archive = IncrementalArchive(str(tmp_path / "shards" / "main.zip"), str(tmp_path))
+        archive.add(_write(tmp_path / "a.png", b"same"))
+        archive.add(_write(tmp_path / "b.png", b"same"))
+        archive.add(str(tmp_path / "missing.png"))
+        archive.close()
+        with zipfile.ZipFile(tmp_path / "shards" / "main.zip") as zf:
+            assert zf.namelist() == ["a.png"]
+        assert archive.aliases == {"b.png": "a.png"}
+        assert archive.stats["duplicates"] == 1
+
+    def test_only_queued_files_are_archived(self, tmp_path):
+        _write(tmp_path / "old-run.png", b"stale")
+        archive = IncrementalArchive(str(tmp_path / "shards" / "main.zip"), str(tmp_path))
+        archive.add(_write(tmp_path / "new.png", b"fresh"))
+        archive.close()
+        with zipfile.ZipFile(tmp_path / "shards" / "main.zip") as zf:
+            assert zf.namelist() == ["new.png"]
+
+
+class TestCombineArchives:
+    def test_workers_are_merged_and_deduplicated(self, tmp_path):
+        first = IncrementalArchive(str(tmp_path / "shards" / "gw0.zip"), str(tmp_path))
+        first.add(_write(tmp_path / "a.png", b"same"))
+        first.close()
+        second = IncrementalArchive(str(tmp_path / "shards" / "gw1.zip"), str(tmp_path))
+        second.add(_write(tmp_path / "b.png", b"same"))
+        second.add(_write(tmp_path / "c.json", b"{}"))
+        second.close()
+
+        target = str(tmp_path / "report.zip")
+        aliases = combine_archives([first.path, second.path], target)
+        append_files(target, str(tmp_path), [_write(tmp_path / "report.html", b"<html>")])
+        with zipfile.ZipFile(target) as zf:
+            assert sorted(zf.namelist()) == ["a.png", "c.json", "report.html"]
+        assert resolve(aliases, "b.png") == "a.png"
+        assert resolve(aliases, "c.json") == "c.json"
+
+    def test_single_archive_is_moved_into_place(self, tmp_path):
+        only = IncrementalArchive(str(tmp_path / "shards" / "main.zip"), str(tmp_path))
+        only.add(_write(tmp_path / "a.png", b"x"))
+        only.close()
+        combine_archives([only.path], str(tmp_path / "report.zip"))
+        assert not (tmp_path / "shards" / "main.zip").exists()
+        with zipfile.ZipFile(tmp_path / "report.zip") as zf:
+            assert zf.namelist() == ["a.png"]
@@ -0,0 +1,46 @@
+import json
+import os
+import time
+
+from framework.auth_state import AuthStateCache
+
+
+def _write_state(path, cookies, origins=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"cookies": cookies, "origins": origins or []}, f)
+
+
+class TestAuthStateCache:
+    def test_path_is_per_email_and_host(self, tmp_path):
+        cache = AuthStateCache(None, "https://dev-app.helpconstruct.com", state_dir=str(tmp_path))
+        other_host = AuthStateCache(None, "http://127.0.0.1:8000", state_dir=str(tmp_path))
+        assert cache.path_for("a@example.com") == cache.path_for("A@example.com")
+        assert cache.path_for("a@example.com") != cache.path_for("b@example.com")
+        assert cache.path_for("a@example.com") != other_host.path_for("a@example.com")
+
+    def test_missing_or_empty_state_is_invalid(self, tmp_path):
+        cache = AuthStateCache(None, "https://example.com", state_dir=str(tmp_path))
+        path = cache.path_for("a@example.com")
+        assert not cache.is_valid(path)
+        _write_state(path, [])
+        assert not cache.is_valid(path)
+
+    def test_session_and_future_cookies_are_valid(self, tmp_path):
+        cache = AuthStateCache(None, "https://example.com", state_dir=str(tmp_path))
+        path = cache.path_for("a@example.com")
+        _write_state(path, [{"name": "sid", "expires": -1}, {"name": "jwt", "expires": time.time() + 600}])
+        assert cache.is_valid(path)
+
+    def test_expired_cookie_invalidates_state(self, tmp_path):
+        cache = AuthStateCache(None, "https://example.com", state_dir=str(tmp_path))
+        path = cache.path_for("a@example.com")
+        _write_state(path, [{"name": "jwt", "expires": time.time() - 1}])
+        assert not cache.is_valid(path)
+
+    def test_state_older_than_ttl_is_invalid(self, tmp_path):
+        cache = AuthStateCache(None, "https://example.com", state_dir=str(tmp_path), ttl=60)
+        path = cache.path_for("a@example.com")
+        _write_state(path, [{"name": "sid", "expires": -1}])
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        assert not cache.is_valid(path)
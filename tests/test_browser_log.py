@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from framework.browser_log import ENTRY_OVERHEAD, BrowserLog
+from framework.report import browser_log_html
+
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def emit(self, event, payload):
+        self.handlers[event](payload)
+
+
+def _request(url, method="GET", failure=None, response_end=-1):
+    return SimpleNamespace(url=url, method=method, failure=failure, timing={"responseEnd": response_end})
+
+
+class TestBrowserLog:
+    def test_records_what_the_browser_reported(self):
+        context = FakeContext()
+        log = BrowserLog(slow_request_ms=500).attach(context)
+        context.emit("console", SimpleNamespace(type="error", text="boom", location={"url": "app.js", "lineNumber": 7}))
+        context.emit("weberror", SimpleNamespace(error=ValueError("undefined is not a function")))
+        context.emit("requestfailed", _request("https://app/api/x", failure="net::ERR_CONNECTION_RESET"))
+        # Blocked on purpose by the lean routing profile
+        context.emit("requestfailed", _request("https://app/logo.png", failure="net::ERR_BLOCKED_BY_CLIENT"))
+        failed = SimpleNamespace(status=500, url="https://app/api/y", request=_request("https://app/api/y", "POST"))
+        context.emit("response", failed)
+        context.emit("response", SimpleNamespace(status=200, url="https://app/", request=_request("https://app/")))
+        context.emit("requestfinished", _request("https://app/api/slow", response_end=1200.4))
+        context.emit("requestfinished", _request("https://app/api/fast", response_end=40))
+
+        entries = [(e["kind"], e["text"]) for e in log.dump()["entries"]]
+        assert entries == [
+            ("console.error", "boom (app.js:7)"),
+            ("pageerror", "undefined is not a function"),
+            ("requestfailed", "GET https://app/api/x net::ERR_CONNECTION_RESET"),
+            ("http", "500 POST https://app/api/y"),
+            ("slow", "GET https://app/api/slow 1200ms"),
+        ]
+
+    def test_buffer_is_capped_by_count_and_bytes(self):
+        log = BrowserLog(max_entries=3, max_bytes=10_000)
+        for i in range(10):
+            log.add("console.log", f"line {i}")
+        assert [e["text"] for e in log.dump()["entries"]] == ["line 7", "line 8", "line 9"]
+        assert log.dropped == 7
+
+        log = BrowserLog(max_entries=100, max_bytes=2 * (100 + ENTRY_OVERHEAD))
+        for i in range(5):
+            log.add("console.log", str(i) * 100)
+        assert len(log.entries) == 2 and log.bytes <= log.max_bytes
+        # One huge message can't blow the cap either
+        log.add("console.log", "x" * 100_000)
+        assert len(log.dump()["entries"][-1]["text"]) == 500
+
+    def test_report_section(self):
+        log = BrowserLog(max_entries=1)
+        log.add("console.error", "<b>oops</b>")
+        log.add("pageerror", "TypeError: x is undefined")
+        html = browser_log_html({"browser_log": log.dump()})
+        assert "1 entries, 1 older dropped" in html
+        assert "TypeError" in html and "<b>oops" not in html
+        assert browser_log_html({}) == ""
@@ -0,0 +1,186 @@
+import json
+import os
+import time
+
+import pytest
+
+from framework.flow_state import FlowSnapshotCache
+
+BASE_URL = "https://app.example.com"
+STATE = {"cookies": [{"name": "session", "value": "x", "expires": -1}], "origins": []}
+
+
+class FakeAuthState:
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, email, password):
+        self.calls += 1
+        return "auth.json"
+
+
+class FakeApp:
+    """What the fake pages do, shared by every context the pool hands out."""
+
+    def __init__(self, ready=True, fail_create=False):
+        self.ready = ready
+        self.fail_create = fail_create
+        self.steps = []
+        self.orgs = 0
+
+
+class FakePage:
+    def __init__(self, app):
+        self.app = app
+        self.url = "about:blank"
+
+    async def goto(self, url):
+        self.app.steps.append(("goto", url.replace(BASE_URL, "")))
+        self.url = url
+
+
+class FakeContext:
+    def __init__(self, app):
+        self.app = app
+
+    async def new_page(self):
+        return FakePage(self.app)
+
+    async def storage_state(self):
+        return STATE
+
+
+class FakePool:
+    def __init__(self, app):
+        self.app = app
+        self.acquired = []
+        self.released = 0
+
+    async def acquire(self, storage_state=None):
+        self.acquired.append(storage_state)
+        return FakeContext(self.app), 0.0
+
+    async def release(self, context):
+        self.released += 1
+        return 0.0
+
+
+class FakeOrgPage:
+    """Stands in for OrgPage inside the real _build and _still_valid: moves the fake page along the flow."""
+
+    start_button = "start_button"
+    org_name_input = "org_name_input"
+    address_input = "address_input"
+
+    def __init__(self, page, welcome_url, name_allocator=None):
+        self.page = page
+        self.app = page.app
+
+    async def wait_until_url(self, name, pattern):
+        self.app.steps.append(("wait", name))
+
+    async def wait_until_element(self, name, locator, required=True):
+        return self.app.ready
+
+    async def click_start_on_welcome(self):
+        self.app.steps.append(("start",))
+        self.page.url = f"{BASE_URL}/organization/create-organization"
+
+    async def create_org(self, name):
+        if self.app.fail_create:
+            raise TimeoutError("org.create_attempt timed out")
+        self.app.orgs += 1
+        self.app.steps.append(("create", name))
+        self.page.url = f"{BASE_URL}/organization/setup/{self.app.orgs}"
+        return name
+
+
+@pytest.fixture
+def fake_org_page(monkeypatch):
+    monkeypatch.setattr("framework.flow_state.OrgPage", FakeOrgPage)
+
+
+def _cache(tmp_path, app):
+    return FlowSnapshotCache(FakePool(app), FakeAuthState(), BASE_URL, state_dir=str(tmp_path))
+
+
+def _write(path, snapshot, age=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    if age:
+        os.utime(path, (time.time() - age, time.time() - age))
+
+
+class TestFlowSnapshotCache:
+    def test_snapshots_are_per_environment_and_user(self, tmp_path):
+        dev = FlowSnapshotCache(None, None, "https://dev.example.com", state_dir=str(tmp_path))
+        staging = FlowSnapshotCache(None, None, "https://staging.example.com", state_dir=str(tmp_path))
+        assert dev.path_for("setup", "a@example.com") != staging.path_for("setup", "a@example.com")
+        assert dev.path_for("setup", "a@example.com") == dev.path_for("setup", "A@example.com")
+        assert dev.path_for("setup", "a@example.com") != dev.path_for("setup", "b@example.com")
+
+    def test_expired_or_incomplete_snapshots_are_not_loaded(self, tmp_path):
+        cache = FlowSnapshotCache(None, None, "https://app.example.com", state_dir=str(tmp_path), ttl=60)
+        good = {"url": "https://app.example.com/welcome", "storage_state": STATE}
+        _write(str(tmp_path / "good.json"), good)
+        _write(str(tmp_path / "old.json"), good, age=120)
+        _write(str(tmp_path / "no_url.json"), {**good, "url": ""})
+        expired = {"cookies": [{"name": "session", "value": "x", "expires": time.time() - 10}]}
+        _write(str(tmp_path / "expired.json"), {**good, "storage_state": expired})
+
+        assert cache.load(str(tmp_path / "good.json"))["url"].endswith("/welcome")
+        for name in ("old", "no_url", "expired", "missing"):
+            assert cache.load(str(tmp_path / f"{name}.json")) is None
+
+    async def test_checkpoints_build_on_each_other_once(self, tmp_path, fake_org_page):
+        app = FakeApp()
+        cache = _cache(tmp_path, app)
+        snapshot = await cache.get("setup", "qa@example.com", "pw")
+
+        assert snapshot["url"] == f"{BASE_URL}/organization/setup/1"
+        assert snapshot["storage_state"] == STATE
+        # Each checkpoint starts from the URL and state the one before it saved
+        assert app.steps == [
+            ("goto", "/welcome"),
+            ("wait", "org.welcome_url"),
+            ("goto", "/welcome"),
+            ("start",),
+            ("wait", "org.create_url"),
+            ("goto", "/organization/create-organization"),
+            ("create", snapshot["org_name"]),
+        ]
+        assert cache.pool.acquired == ["auth.json", STATE, STATE]
+        assert cache.pool.released == 3
+        assert cache.auth_state.calls == 1 and cache.stats["builds"] == 3
+
+        again = _cache(tmp_path, app)
+        app.steps.clear()
+        assert (await again.get("setup", "qa@example.com", "pw"))["org_name"] == snapshot["org_name"]
+        # Checked once against the app, not rebuilt
+        assert app.steps == [("goto", "/organization/setup/1")]
+        assert again.stats["builds"] == 0 and again.stats["hits"] == 1
+        assert again.pool.released == 1
+
+    async def test_invalid_snapshot_is_rebuilt_from_the_previous_checkpoint(self, tmp_path, fake_org_page):
+        app = FakeApp()
+        await _cache(tmp_path, app).get("setup", "qa@example.com", "pw")
+        app.ready = False
+        stale = _cache(tmp_path, app)
+        snapshot = await stale.get("setup", "qa@example.com", "pw")
+        # The earlier checkpoints were also reported invalid, so the whole chain is rebuilt
+        assert stale.stats["builds"] == 3 and stale.stats["rebuilds"] == 3
+        assert snapshot["url"] == f"{BASE_URL}/organization/setup/2"
+
+    async def test_failed_build_releases_its_context_and_saves_nothing(self, tmp_path, fake_org_page):
+        app = FakeApp(fail_create=True)
+        cache = _cache(tmp_path, app)
+        with pytest.raises(TimeoutError):
+            await cache.get("setup", "qa@example.com", "pw")
+        assert cache.pool.released == len(cache.pool.acquired) == 3
+        assert not os.path.exists(cache.path_for("setup", "qa@example.com"))
+        assert os.path.exists(cache.path_for("create-organization", "qa@example.com"))
+
+    async def test_unknown_checkpoint(self, tmp_path):
+        with pytest.raises(ValueError, match="setup"):
+            await _cache(tmp_path, FakeApp()).get("dashboard", "qa@example.com", "pw")
@@ -0,0 +1,105 @@
+import base64
+import hashlib
+import json
+import os
+import urllib.error
+
+import pytest
+
+from framework.har_cache import HarCache
+
+
+def _entry(url, mime, body=None, file=None, method="GET", status=200):
+    content = {"mimeType": mime, "size": 0}
+    if file is not None:
+        content["_file"] = file
+    elif body is not None:
+        content["text"] = base64.b64encode(body).decode("ascii")
+        content["encoding"] = "base64"
+    return {
+        "startedDateTime": "2026-01-01T00:00:00Z",
+        "request": {"method": method, "url": url},
+        "response": {"status": status, "content": content},
+    }
+
+
+def _write_har(path, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"log": {"entries": entries}}, f)
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    cache = HarCache(str(tmp_path / "har"), "record", api_patterns=["*/api/countries*"])
+    recording_dir = cache.recording_dir("run1")
+    os.makedirs(recording_dir)
+    with open(os.path.join(recording_dir, "abc.js"), "wb") as f:
+        f.write(b"console.log('app')")
+    _write_har(
+        os.path.join(recording_dir, "test_a.har"),
+        [
+            _entry("https://app.example.com/static/app.js", "application/javascript", file="abc.js"),
+            _entry("https://app.example.com/login", "text/html", body=b"<html>"),
+            _entry("https://app.example.com/api/countries", "application/json", body=b"[]"),
+            _entry("https://app.example.com/api/organizations", "application/json", body=b"{}", method="POST"),
+        ],
+    )
+    _write_har(
+        os.path.join(recording_dir, "test_b.har"),
+        [_entry("https://app.example.com/static/logo.png", "image/png", body=b"png", status=304)],
+    )
+    cache.merge_recordings("run1")
+    return cache
+
+
+class TestMergeRecordings:
+    def test_keeps_static_assets_and_selected_apis(self, recorded):
+        with open(recorded.path, encoding="utf-8") as f:
+            urls = sorted(e["request"]["url"] for e in json.load(f)["log"]["entries"])
+        assert urls == ["https://app.example.com/api/countries", "https://app.example.com/static/app.js"]
+        assert recorded.stats["recorded"] == 2
+        assert not os.path.exists(recorded.recording_dir("run1"))
+
+    def test_bodies_are_content_addressed(self, recorded):
+        manifest = recorded.load_manifest()
+        app_js = manifest["https://app.example.com/static/app.js"]
+        assert app_js["sha256"] == hashlib.sha256(b"console.log('app')").hexdigest()
+        assert app_js["file"].endswith(".js")
+        with open(os.path.join(recorded.har_dir, app_js["file"]), "rb") as f:
+            assert f.read() == b"console.log('app')"
+
+
+class TestStaleness:
+    def test_changed_content_is_dropped(self, recorded):
+        def fetch(url):
+            if url.endswith("app.js"):
+                return b"console.log('new release')"
+            return b"[]"
+
+        stats = HarCache(recorded.har_dir, "replay").check_staleness(fetch)
+        assert stats["checked"] == 2 and stats["stale"] == 1 and stats["entries"] == 1
+        assert list(recorded.load_manifest()) == ["https://app.example.com/api/countries"]
+
+    def test_unreachable_app_keeps_cache(self, recorded):
+        def fetch(url):
+            raise urllib.error.URLError("no network")
+
+        stats = HarCache(recorded.har_dir, "replay").check_staleness(fetch)
+        assert stats["offline"] and stats["stale"] == 0
+        assert len(recorded.load_manifest()) == 2
+
+    def test_refused_urls_are_kept(self, recorded):
+        def fetch(url):
+            if "/api/" in url:
+                raise urllib.error.HTTPError(url, 401, "Unauthorized", {}, None)
+            return b"console.log('app')"
+
+        stats = HarCache(recorded.har_dir, "replay").check_staleness(fetch)
+        assert stats["checked"] == 1 and stats["stale"] == 0 and stats["entries"] == 2
+
+
+class TestModes:
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            HarCache(mode="replay-all")
@@ -0,0 +1,92 @@
+from framework.load import SESSION_STEP, LoadStats, _session, format_summary, percentile, run_load
+from framework.spans import SpanRecorder
+
+
+def _recorder(*spans):
+    # (name, seconds) or (name, seconds, ok)
+    recorder = SpanRecorder()
+    recorder.spans = [
+        {"name": span[0], "start": 0.0, "dur": span[1], "depth": 0, "ok": span[2] if len(span) > 2 else True}
+        for span in spans
+    ]
+    return recorder
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([3.0], 99) == 3.0
+        assert percentile([], 50) == 0.0
+
+
+class TestLoadStats:
+    def test_summary_per_step(self):
+        stats = LoadStats()
+        stats.add_session(_recorder(("LoginPage.login", 0.2), ("OrgPage.create_org", 1.0)), 1.5, None)
+        stats.add_session(_recorder(("LoginPage.login", 0.4)), 0.6, TimeoutError("x"))
+        stats.finished = stats.started + 60
+        summary = stats.summary()
+
+        assert summary["sessions"] == 2 and summary["failed_sessions"] == 1
+        assert summary["errors"] == {"TimeoutError": 1}
+        assert summary["sessions_per_minute"] == 2.0
+        login = summary["steps"]["LoginPage.login"]
+        assert login["count"] == 2
+        assert round(login["p50_ms"]) == 200 and round(login["p99_ms"]) == 400
+        assert summary["steps"][SESSION_STEP]["count"] == 1 and summary["steps"][SESSION_STEP]["failed"] == 1
+        text = format_summary(summary)
+        assert "OrgPage.create_org" in text and "TimeoutError x1" in text
+
+    def test_failures_are_counted_outside_the_percentiles(self):
+        stats = LoadStats()
+        stats.add_session(_recorder(("LoginPage.login", 0.2), ("OrgPage.create_org", 1.0)), 1.5, None)
+        # A timed-out step and its session would otherwise be the slowest samples
+        timed_out = _recorder(("LoginPage.login", 0.3), ("OrgPage.create_org", 30.0, False))
+        stats.add_session(timed_out, 30.5, TimeoutError("x"))
+        summary = stats.summary()
+
+        create = summary["steps"]["OrgPage.create_org"]
+        assert create["count"] == 1 and create["failed"] == 1 and round(create["p99_ms"]) == 1000
+        assert summary["steps"]["LoginPage.login"]["count"] == 2
+        session = summary["steps"][SESSION_STEP]
+        assert session["count"] == 1 and session["failed"] == 1 and round(session["p99_ms"]) == 1500
+
+    def test_step_that_only_failed_is_listed(self):
+        stats = LoadStats()
+        stats.add_session(_recorder(("OrgPage.click_next", 5.0, False)), 5.0, TimeoutError("x"))
+        step = stats.summary()["steps"]["OrgPage.click_next"]
+        assert step["count"] == 0 and step["failed"] == 1 and step["p50_ms"] == 0
+
+
+class BrokenPool:
+    def __init__(self):
+        self.released = 0
+
+    async def acquire(self):
+        raise RuntimeError("browser closed")
+
+    async def release(self, context):
+        self.released += 1
+
+
+class TestSession:
+    async def test_failed_acquire_is_a_failed_session(self):
+        stats, pool = LoadStats(), BrokenPool()
+        await _session(pool, "http://app", "http://app/welcome", "qa@example.com", "pw", "Org 1", {}, stats)
+        summary = stats.summary()
+        assert summary["failed_sessions"] == 1 and summary["errors"] == {"RuntimeError": 1}
+        assert pool.released == 0
+
+
+class TestRunLoadAgainstMock:
+    async def test_sessions_complete(self, mock_app):
+        summary = await run_load(
+            mock_app.url, mock_app.email, mock_app.password, users=3, concurrency=3, run_tag="MOCK"
+        )
+
+        assert summary["sessions"] == 3 and summary["failed_sessions"] == 0
+        assert len(mock_app.orgs) == 3
+        assert all(org["setup"] for org in mock_app.orgs.values())
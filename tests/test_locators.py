@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from pages.locators import SelectorCache, first_visible
+
+
+class FakeLocator:
+    """Stands in for a Playwright Locator: becomes visible after `delay` seconds, or never."""
+
+    def __init__(self, delay=None):
+        self.delay = delay
+        self.calls = 0
+
+    async def wait_for(self, state="visible", timeout=0):
+        self.calls += 1
+        if self.delay is None or self.delay * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError("not visible")
+        await asyncio.sleep(self.delay)
+
+
+class TestFirstVisible:
+    async def test_race_returns_fastest_visible_candidate(self, tmp_path):
+        cache = SelectorCache(str(tmp_path / "cache.json"))
+        candidates = {"dead": FakeLocator(), "slow": FakeLocator(0.2), "fast": FakeLocator(0.01)}
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        name, locator = await first_visible("Page.field", candidates, timeout=1000, cache=cache)
+        assert name == "fast" and locator is candidates["fast"]
+        # Did not wait for the dead candidate's timeout
+        assert loop.time() - started < 0.5
+
+    async def test_cached_winner_is_tried_first(self, tmp_path):
+        cache = SelectorCache(str(tmp_path / "cache.json"))
+        candidates = {"a": FakeLocator(0.05), "b": FakeLocator(0.01)}
+        assert (await first_visible("Page.field", candidates, timeout=1000, cache=cache))[0] == "b"
+        cache.save()
+
+        reloaded = SelectorCache(str(tmp_path / "cache.json"))
+        candidates = {"a": FakeLocator(0.01), "b": FakeLocator(0.01)}
+        assert (await first_visible("Page.field", candidates, timeout=1000, cache=reloaded))[0] == "b"
+        assert candidates["a"].calls == 0
+        stats = reloaded.stats()["Page.field"]
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    async def test_no_visible_candidate_raises(self, tmp_path):
+        cache = SelectorCache(str(tmp_path / "cache.json"))
+        with pytest.raises(PlaywrightTimeoutError):
+            await first_visible("Page.field", {"x": FakeLocator(), "y": FakeLocator()}, timeout=50, cache=cache)
+
+
+class TestSelectorCache:
+    def test_stats_list_candidates_that_never_won(self, tmp_path):
+        cache = SelectorCache(str(tmp_path / "cache.json"))
+        cache.record("Page.field", ["a", "b", "c"], "a", cache_hit=False)
+        cache.record("Page.field", ["a", "b", "c"], "b", cache_hit=False)
+        assert cache.stats()["Page.field"]["dead"] == ["c"]
+
+    def test_save_merges_counts_from_other_processes(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+        first, second = SelectorCache(path), SelectorCache(path)
+        first.record("Page.field", ["a"], "a", cache_hit=False)
+        second.record("Page.field", ["a"], "a", cache_hit=True)
+        first.save()
+        second.save()
+        field = SelectorCache(path).stats()["Page.field"]
+        assert (field["hits"], field["misses"], field["wins"]["a"]) == (1, 1, 2)
@@ -38,8 +38,7 @@ class TestLoginFlow:
 
     async def test_login_button_exists(self, login_page, page):
         await login_page.go_to_login_page()
-        await login_page.login_button.wait_for(state="visible", timeout=10000)
-        assert True
+        assert await login_page.wait_until_element("login.login_button", login_page.login_button)
 
     async def test_login_with_valid_credentials(self, login_page, page):
         if not TEST_EMAIL or not TEST_PASSWORD:
@@ -47,10 +46,6 @@ class TestLoginFlow:
 
         await login_page.go_to_login_page()
         await login_page.login(TEST_EMAIL, TEST_PASSWORD)
-        await page.wait_for_load_state("networkidle", timeout=15000)
-        await page.wait_for_function(
-            "location.href.toLowerCase().includes('login') === false",
-            timeout=30000,
-        )
+        await login_page.wait_until_signed_in()
         current_url = page.url
         assert "login" not in current_url.lower(), f"Should not stay on login page, current URL: {current_url}"
@@ -3,7 +3,6 @@ import os
 import pytest
 from dotenv import load_dotenv
 
-from pages.login_page import LoginPage
 from pages.org_page import OrgPage
 
 load_dotenv()
@@ -11,27 +10,15 @@ load_dotenv()
 pytestmark = pytest.mark.asyncio
 
 WEBSITE_URL = os.getenv("WEBSITE_URL", "https://dev-app.helpconstruct.com")
-TEST_EMAIL = os.getenv("TEST_EMAIL")
-TEST_PASSWORD = os.getenv("TEST_PASSWORD")
 
 
 class TestOrganizationFlow:
-    async def test_create_org(self, page):
-        if not TEST_EMAIL or not TEST_PASSWORD:
-            pytest.skip("TEST_EMAIL and TEST_PASSWORD must be set in .env")
-
-        login_page = LoginPage(page, base_url=WEBSITE_URL)
-        org_page = OrgPage(page)
-
-        await login_page.go_to_login_page()
-        await login_page.login(TEST_EMAIL, TEST_PASSWORD)
-        await page.wait_for_load_state("networkidle", timeout=15000)
-        await page.wait_for_function(
-            "location.href.toLowerCase().includes('login') === false",
-            timeout=30000,
-        )
+    # Login is not what this test is about: start from a saved session (see conftest `authenticated`)
+    @pytest.mark.authenticated
+    async def test_create_org(self, page, org_names):
+        org_page = OrgPage(page, welcome_url=f"{WEBSITE_URL}/welcome", name_allocator=org_names)
 
-        company_name = os.getenv("COMPANY_NAME", "RRR Vendor")
+        company_name = org_names.allocate(os.getenv("COMPANY_NAME", "RRR Vendor"))
         await org_page.complete_flow_from_current_url(
             org_name=company_name,
             address_prefix="123",
@@ -44,3 +31,46 @@ class TestOrganizationFlow:
         )
 
         assert await org_page.is_hello_page_displayed(), "Hello page should be visible after setup"
+
+
+class TestSetupForm:
+    # Starts on the setup form of an org created earlier (see conftest `checkpoint`):
+    # no login, welcome or org creation in this test
+    @pytest.mark.checkpoint("setup")
+    async def test_fill_setup_form(self, page):
+        org_page = OrgPage(page, welcome_url=f"{WEBSITE_URL}/welcome")
+
+        await org_page.fill_setup_form(
+            address_prefix="123",
+            ownership="Sole Proprietorship",
+            phone="9876543210",
+            email="rrr.vendor@example.com",
+            website="https://rrrvendor.example.com",
+            ceo_name="Alex CEO",
+            employees="120",
+        )
+
+        # Not submitted, so the saved checkpoint stays on this form for the next run
+        assert await org_page.phone_input.input_value() == "9876543210"
+        assert await org_page.employees_input.input_value() == "120"
+        assert await org_page.next_button.is_enabled()
+
+
+class TestHelloPage:
+    # The org is created and set up through the backend API (see conftest `preconditions`);
+    # only the page this test is about is opened in the browser
+    @pytest.mark.authenticated
+    async def test_hello_page_after_setup(self, page, preconditions, org_names):
+        org_page = await preconditions.org_set_up(
+            page,
+            org_names.allocate("API Vendor"),
+            address_prefix="123",
+            ownership="Sole Proprietorship",
+            phone="9876543210",
+            email="api.vendor@example.com",
+            website="https://apivendor.example.com",
+            ceo_name="Alex CEO",
+            employees="120",
+        )
+
+        assert await org_page.is_hello_page_displayed(), "Hello page should be visible for a set-up org"
@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError, async_playwright
+
+from framework.timeouts import TimeoutPolicy
+from pages.base_page import BasePage, page_metrics
+from pages.org_page import OrgNameAllocator, create_org_rejection
+
+
+class FakePage:
+    url = "about:blank"
+
+
+async def _fires_after(delay):
+    await asyncio.sleep(delay)
+    return True
+
+
+async def _times_out(delay):
+    await asyncio.sleep(delay)
+    raise PlaywrightTimeoutError("timed out")
+
+
+class TestWaitForFirst:
+    async def test_first_signal_to_fire_wins(self, tmp_path):
+        page = BasePage(FakePage(), timeouts=TimeoutPolicy(str(tmp_path / "timings.json")))
+        clicked = []
+
+        async def action():
+            clicked.append(True)
+
+        outcome = await page.wait_for_first(
+            "step",
+            {"slow": _fires_after(0.5), "fast": _fires_after(0.01), "broken": _times_out(0.001)},
+            action=action,
+        )
+        assert outcome == "fast"
+        assert clicked == [True]
+        assert page.wait_timings[-1]["signal"] == "fast"
+        assert page.wait_timings[-1]["seconds"] < 0.4
+
+    async def test_no_signal_returns_none(self, tmp_path):
+        policy = TimeoutPolicy(str(tmp_path / "timings.json"))
+        page = BasePage(FakePage(), timeouts=policy)
+        assert await page.wait_for_first("step", {"a": _times_out(0.01), "b": _times_out(0.02)}) is None
+        # Nothing fired, so the wait's length is not a sample of how long the step takes
+        assert policy.data["step"] == {"samples": [], "timeouts": 1}
+
+    async def test_only_sample_signals_feed_the_timeout_history(self, tmp_path):
+        policy = TimeoutPolicy(str(tmp_path / "timings.json"))
+        page = BasePage(FakePage(), timeouts=policy)
+        signals = {"created": _fires_after(0.2), "rejected": _fires_after(0.001)}
+        assert await page.wait_for_first("step", signals, sample_signals=("created",)) == "rejected"
+        assert "step" not in policy.data
+        signals = {"created": _fires_after(0.001)}
+        assert await page.wait_for_first("step", signals, sample_signals=("created",)) == "created"
+        assert len(policy.data["step"]["samples"]) == 1
+
+    def test_page_objects_on_one_page_share_metrics(self):
+        fake = FakePage()
+        first, second = BasePage(fake), BasePage(fake)
+        first.wait_timings.append({"name": "x"})
+        assert second.wait_timings == [{"name": "x"}]
+        assert page_metrics(fake)["waits"] == [{"name": "x"}]
+
+
+class TestOrgNameAllocator:
+    def test_names_are_unique_within_and_across_runs(self):
+        run_a, run_b = OrgNameAllocator("A1B2C3"), OrgNameAllocator("D4E5F6")
+        names = [run_a.allocate("RRR Vendor") for _ in range(3)] + [run_b.allocate("RRR Vendor")]
+        assert len(set(names)) == 4
+        assert names[0] == "RRR Vendor A1B2C301"
+
+
+class TestCreateOrgRejection:
+    def _response(self, status, url="https://app/api/organizations", method="POST"):
+        return SimpleNamespace(status=status, url=url, request=SimpleNamespace(method=method))
+
+    def test_only_duplicate_name_statuses_are_collisions(self):
+        assert create_org_rejection(self._response(409)) == "collision"
+        # Expired session, no permission, invalid name, backend down: fail instead of retrying under another name
+        for status in (401, 403, 422, 500, 503):
+            assert create_org_rejection(self._response(status)) == "error"
+
+    def test_other_responses_are_ignored(self):
+        assert create_org_rejection(self._response(201)) is None
+        assert create_org_rejection(self._response(500, method="GET")) is None
+        assert create_org_rejection(self._response(500, url="https://app/api/health")) is None
+
+    async def test_empty_name_is_an_error_not_a_collision(self, mock_app):
+        # The mock's real answers; APIRequestContext needs no browser
+        async with async_playwright() as p:
+            request = await p.request.new_context()
+            credentials = {"email": mock_app.email, "password": mock_app.password}
+            await request.post(f"{mock_app.url}/api/auth/login", data=credentials)
+            outcomes = {}
+            for name in ("", "Rejection Org", "Rejection Org"):
+                response = await request.post(f"{mock_app.url}/api/organizations", data={"name": name})
+                outcomes[name] = create_org_rejection(self._response(response.status, url=response.url))
+            await request.dispose()
+        assert outcomes == {"": "error", "Rejection Org": "collision"}
@@ -0,0 +1,103 @@
+import pytest
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError, async_playwright
+
+from framework.preconditions import OrgApi, PreconditionError, Preconditions, PreconditionStats
+
+SETUP_VALUES = {
+    "address_prefix": "123",
+    "ownership": "Sole Proprietorship",
+    "phone": "9876543210",
+    "email": "api.vendor@example.com",
+    "website": "https://apivendor.example.com",
+    "ceo_name": "Alex CEO",
+    "employees": "120",
+}
+
+
+class TestOrgApiAgainstMock:
+    # APIRequestContext runs in the Playwright driver, so no browser is needed here
+    async def test_create_and_set_up(self, mock_app):
+        async with async_playwright() as p:
+            request = await p.request.new_context()
+            api = OrgApi(request, mock_app.url)
+            with pytest.raises(PreconditionError, match="401"):
+                await api.create_org("Api Org Unsigned")
+
+            await api.sign_in(mock_app.email, mock_app.password)
+            org = await api.create_org("Api Org One")
+            await api.setup_org(org["id"], **SETUP_VALUES)
+            with pytest.raises(PreconditionError, match="409"):
+                await api.create_org("Api Org One")
+            await request.dispose()
+
+        assert mock_app.orgs[org["id"]]["name"] == "Api Org One"
+        assert mock_app.orgs[org["id"]]["setup"]["ceo"] == "Alex CEO"
+
+
+class FakeOrgApi:
+    def __init__(self, error=None):
+        self.error = error
+        self.created = []
+
+    async def create_org(self, name):
+        if self.error is not None:
+            raise self.error
+        self.created.append(name)
+        return {"id": "org1", "name": name}
+
+
+class TestFallback:
+    async def _ui(self):
+        self.ui_calls += 1
+        return {"org_name": "Ui Org"}
+
+    def setup_method(self):
+        self.ui_calls = 0
+
+    async def test_failed_create_falls_back_to_ui(self):
+        stats = PreconditionStats()
+        pre = Preconditions(None, "https://app.example.com", stats=stats)
+        pre.api = FakeOrgApi(PlaywrightError("connect ECONNREFUSED 127.0.0.1:443"))
+
+        async def api_step(org):
+            raise AssertionError("no org to continue from")
+
+        record = await pre._run("org_at_setup", "Api Org", api_step, self._ui)
+        assert record["path"] == "ui" and "ECONNREFUSED" in record["fallback"]
+        assert stats.totals["fallbacks"] == 1 and len(stats.history["org_at_setup"]) == 1
+
+    async def test_no_ui_fallback_once_the_org_exists(self):
+        pre = Preconditions(None, "https://app.example.com")
+        pre.api = FakeOrgApi()
+
+        async def api_step(org):
+            raise PlaywrightTimeoutError("setup form never showed")
+
+        # A second org made through the UI would be an orphan; the failure is the test's to report
+        with pytest.raises(PlaywrightTimeoutError):
+            await pre._run("org_at_setup", "Api Org", api_step, self._ui)
+        assert pre.api.created == ["Api Org"] and self.ui_calls == 0
+
+    async def test_ui_mode_never_calls_the_api(self):
+        pre = Preconditions(None, "https://app.example.com", mode="ui")
+        pre.api = FakeOrgApi(AssertionError("API used in ui mode"))
+
+        assert (await pre._run("org_set_up", "Ui Org", None, self._ui))["path"] == "ui"
+        assert "fallback" not in pre.records[0]
+
+
+class TestStats:
+    def test_saved_time_needs_a_ui_baseline(self):
+        stats = PreconditionStats()
+        assert stats.record("org_set_up", "api", 0.2) is None
+        assert "no UI baseline" in stats.summary()
+
+        stats = PreconditionStats({"org_set_up": [4.0, 5.0, 9.0]})
+        assert stats.record("org_set_up", "api", 0.5) == pytest.approx(4.5)
+        assert "~4.5s saved" in stats.summary()
+
+    def test_history_merge_keeps_other_workers_samples(self):
+        stats = PreconditionStats()
+        stats.record("org_at_setup", "ui", 3.0)
+        merged = stats.merged_history({"org_at_setup": [2.0], "org_set_up": [6.0]})
+        assert merged == {"org_at_setup": [2.0, 3.0], "org_set_up": [6.0]}
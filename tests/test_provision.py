@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+
+from framework.provision import CheckpointLog, flow_values, iter_records, provision_orgs, run_pipeline
+
+
+def _jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+
+class TestRecords:
+    def test_csv_and_jsonl(self, tmp_path):
+        csv_path = tmp_path / "orgs.csv"
+        csv_path.write_text("org_name,phone,ceo_name\nAcme, 5551234 ,\nGlobex,,Hank\n", encoding="utf-8")
+        rows = list(iter_records(str(csv_path)))
+        assert rows == [{"org_name": "Acme", "phone": "5551234"}, {"org_name": "Globex", "ceo_name": "Hank"}]
+        assert flow_values(rows[0])["phone"] == "5551234"
+        assert flow_values(rows[0])["ceo_name"] == "Alex CEO"
+
+        jsonl_path = _jsonl(tmp_path / "orgs.jsonl", [{"id": 7, "org_name": "Initech"}])
+        assert list(iter_records(jsonl_path)) == [{"id": 7, "org_name": "Initech"}]
+
+
+class TestPipeline:
+    async def test_rerun_skips_done_rows_and_retries_failures(self, tmp_path):
+        rows = [{"org_name": f"Org {i}"} for i in range(6)]
+        log_path = str(tmp_path / "orgs.done.jsonl")
+        calls = []
+
+        async def flaky(record):
+            calls.append(record["org_name"])
+            await asyncio.sleep(0.001)
+            if record["org_name"] == "Org 3":
+                raise TimeoutError("setup page never loaded")
+            return {"org_name": record["org_name"]}
+
+        log = CheckpointLog(log_path)
+        first = await run_pipeline(iter(rows), log, flaky, concurrency=3, progress=None)
+        log.close()
+        assert first["done"] == 5 and first["failed"] == 1 and first["errors"] == {"TimeoutError": 1}
+
+        calls.clear()
+
+        async def ok(record):
+            calls.append(record["org_name"])
+
+        log = CheckpointLog(log_path)
+        second = await run_pipeline(iter(rows), log, ok, concurrency=3, progress=None)
+        log.close()
+        assert calls == ["Org 3"]
+        assert second["done"] == 1 and second["skipped"] == 5
+
+    async def test_existing_orgs_count_as_done(self, tmp_path):
+        log_path = str(tmp_path / "log.jsonl")
+
+        async def handler(record):
+            # e.g. created just before a crash, so its "done" line was never written
+            return {"status": "exists", "org_name": record["org_name"]}
+
+        log = CheckpointLog(log_path)
+        summary = await run_pipeline(iter([{"org_name": "Acme"}]), log, handler, progress=None)
+        log.close()
+        assert summary["exists"] == 1 and summary["done"] == 0
+        assert CheckpointLog(log_path).done == {"Acme"}
+
+    async def test_concurrency_cap(self, tmp_path):
+        running, peak = 0, 0
+
+        async def handler(record):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        log = CheckpointLog(str(tmp_path / "log.jsonl"))
+        records = ({"org_name": f"Org {i}"} for i in range(20))
+        summary = await run_pipeline(records, log, handler, concurrency=4, progress=None)
+        log.close()
+        assert peak == 4 and summary["done"] == 20 and summary["rows_per_minute"] > 0
+
+    def test_truncated_last_line_is_ignored(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text('{"key": "a", "status": "done"}\n{"key": "b", "sta', encoding="utf-8")
+        log = CheckpointLog(str(path))
+        log.close()
+        assert log.done == {"a"}
+
+
+class TestProvisionAgainstMock:
+    async def test_creates_every_org_once(self, mock_app, tmp_path):
+        input_path = _jsonl(tmp_path / "orgs.jsonl", [{"org_name": f"Seed Org {i}"} for i in range(3)])
+        log_path = str(tmp_path / "orgs.done.jsonl")
+        kwargs = dict(
+            base_url=mock_app.url,
+            email=mock_app.email,
+            password=mock_app.password,
+            concurrency=2,
+            auth_state_dir=str(tmp_path / "auth"),
+            progress=None,
+        )
+        summary = await provision_orgs(input_path, log_path, **kwargs)
+        assert summary["done"] == 3 and summary["failed"] == 0
+        assert sorted(org["name"] for org in mock_app.orgs.values() if org["name"].startswith("Seed Org")) == [
+            "Seed Org 0",
+            "Seed Org 1",
+            "Seed Org 2",
+        ]
+
+        again = await provision_orgs(input_path, log_path, **kwargs)
+        assert again["skipped"] == 3 and again["done"] == 0
+
+        # A lost checkpoint log: the orgs are recognised by name, not created again under a new one
+        os.remove(log_path)
+        lost = await provision_orgs(input_path, log_path, **kwargs)
+        assert lost["exists"] == 3 and lost["done"] == 0
+        assert sum(org["name"].startswith("Seed Org") for org in mock_app.orgs.values()) == 3
+
+    async def test_invalid_name_fails_instead_of_renaming(self, mock_app, tmp_path):
+        input_path = _jsonl(tmp_path / "orgs.jsonl", [{"id": "blank", "org_name": ""}])
+        orgs_before = len(mock_app.orgs)
+        summary = await provision_orgs(
+            input_path,
+            str(tmp_path / "orgs.done.jsonl"),
+            base_url=mock_app.url,
+            email=mock_app.email,
+            password=mock_app.password,
+            auth_state_dir=str(tmp_path / "auth"),
+            progress=None,
+        )
+        # The API's 422 is the error; it is neither renamed nor logged as an existing org
+        assert summary["failed"] == 1 and summary["exists"] == 0 and summary["done"] == 0
+        assert len(mock_app.orgs) == orgs_before
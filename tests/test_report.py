@@ -0,0 +1,102 @@
+import json
+import os
+
+from framework.history import append_run, read_recent_runs
+from framework.report import DATA_FILE, LONGREPR_MAX_CHARS, load_report_data, report_notes, write_report
+
+
+def _results():
+    return [
+        {"nodeid": "tests/test_a.py::test_ok", "outcome": "passed", "duration": 1.2345, "tracing_overhead": 12.0},
+        {
+            "nodeid": "tests/test_a.py::test_broken",
+            "outcome": "failed",
+            "duration": 3.0,
+            "longrepr": "x" * (LONGREPR_MAX_CHARS + 10) + "AssertionError: <boom>",
+            "page_url": "http://app/welcome",
+        },
+    ]
+
+
+class TestWriteReport:
+    def test_data_file_and_viewer(self, tmp_path):
+        metas = [{"worker": "main", "pool": "pool: 2 contexts", "archive": ""}]
+        files = write_report(str(tmp_path), iter(_results()), exitstatus=1, metas=metas, aliases={}, run_id="r1")
+        assert [p.rsplit("/", 1)[-1] for p in files] == [DATA_FILE, "report.html"]
+        assert f'src="./{DATA_FILE}"' in (tmp_path / "report.html").read_text(encoding="utf-8")
+
+        data = load_report_data(files[0])
+        assert data["run"]["total"] == 2 and data["run"]["failed"] == 1 and data["run"]["run_id"] == "r1"
+        assert data["notes"] == ["[main] pool: 2 contexts"]
+        ok, broken = data["tests"]
+        assert ok == {
+            "nodeid": "tests/test_a.py::test_ok",
+            "outcome": "passed",
+            "duration": 1.234,
+            "notes": ["tracing +12 ms"],
+            "trend": {"outcomes": "p", "durations": [1.234]},
+        }
+        # Failure text is escaped and keeps its end, with a pointer to the full text
+        assert "AssertionError: &lt;boom&gt;" in broken["details"]
+        assert "32 characters cut" in broken["details"] and "test_a.py_test_broken" in broken["details"]
+
+    def test_history_builds_trends(self, tmp_path):
+        history = str(tmp_path / "history.jsonl")
+        for run_id in ("r1", "r2"):
+            write_report(str(tmp_path), iter(_results()), 1, [], {}, run_id=run_id, history_path=history)
+        results = _results()
+        results[1]["outcome"], results[1]["longrepr"] = "passed", ""
+        files = write_report(str(tmp_path), iter(results), 0, [], {}, run_id="r3", history_path=history)
+
+        data = load_report_data(files[0])
+        assert data["tests"][1]["trend"] == {"outcomes": "ffp", "durations": [3.0, 3.0, 3.0]}
+        assert [run["run_id"] for run in data["history"]] == ["r1", "r2", "r3"]
+        assert "tests" not in data["history"][0]
+
+        runs = read_recent_runs(history, window=2)
+        assert [run["run_id"] for run in runs] == ["r2", "r3"]
+        assert runs[-1]["tests"]["tests/test_a.py::test_broken"] == ["p", 3.0]
+
+    def test_torn_history_line_is_skipped(self, tmp_path):
+        history = tmp_path / "history.jsonl"
+        append_run(str(history), {"run_id": "r1", "tests": {}})
+        with open(history, "a", encoding="utf-8") as f:
+            f.write('{"run_id": "r2", "tes')
+        assert [run["run_id"] for run in read_recent_runs(str(history))] == ["r1"]
+
+    def test_recent_runs_are_read_from_the_end(self, tmp_path, monkeypatch):
+        history = str(tmp_path / "history.jsonl")
+        for index in range(50):
+            append_run(history, {"run_id": f"r{index}", "tests": {"t": ["p", 1.0]}})
+        # Small blocks, so lines are split across reads
+        monkeypatch.setattr("framework.history.READ_BLOCK", 7)
+        reads = []
+
+        def counting_open(*args, **kwargs):
+            f = open(*args, **kwargs)
+            real_read = f.read
+            f.read = lambda size=-1: reads.append(size) or real_read(size)
+            return f
+
+        monkeypatch.setattr("framework.history.open", counting_open, raising=False)
+        runs = read_recent_runs(history, window=3)
+        assert [run["run_id"] for run in runs] == ["r47", "r48", "r49"]
+        assert reads and sum(reads) < os.path.getsize(history) // 4
+        assert [run["run_id"] for run in read_recent_runs(history, window=80)] == [f"r{i}" for i in range(50)]
+
+
+class TestNotes:
+    def test_notes_are_plain_text(self):
+        notes = report_notes(
+            {
+                "metrics": {"org_create": {"attempts": 2, "wasted_seconds": 1.5}},
+                "routing": {"profile": "lean", "blocked": 3, "stubbed": 1, "requests": 20, "bytes_saved": 2048},
+                "preconditions": [{"precondition": "org_set_up", "path": "api", "seconds": 0.2, "saved_seconds": 4.0}],
+            }
+        )
+        assert notes == [
+            "1 org retries, 1.50s wasted",
+            "lean: 4/20 requests skipped, ~2.0 KB saved",
+            "org_set_up via api 0.20s, ~4.00s saved",
+        ]
+        assert json.dumps(notes)
@@ -0,0 +1,90 @@
+import os
+from types import SimpleNamespace
+
+from framework.results import (
+    ResultSink,
+    iter_results,
+    load_shard_meta,
+    order_by_duration,
+    prune_shards,
+    safe_filename,
+    shard_path,
+    update_durations,
+    write_shard_meta,
+)
+
+
+class TestResultShards:
+    def test_safe_filename_keeps_similar_nodeids_apart(self):
+        names = {
+            safe_filename("tests/test_a.py::TestX::test_one"),
+            safe_filename("tests/test_b.py::TestX::test_one"),
+            safe_filename("tests/test_a.py::TestY::test_one"),
+            safe_filename("tests/test_a.py::test_p[a/b]"),
+            safe_filename("tests/test_a.py::test_p[a_b]"),
+        }
+        assert len(names) == 5
+        assert all("/" not in n and ":" not in n for n in names)
+
+    def test_safe_filename_is_bounded(self):
+        assert len(safe_filename("tests/test_a.py::test_p[" + "x" * 500 + "]")) <= 129
+
+    def test_sink_streams_last_entry_per_nodeid(self, tmp_path):
+        sink = ResultSink(shard_path(str(tmp_path), "run1", "gw0"))
+        sink.record("a", outcome="passed", duration=1.0)
+        assert sink.get("a")["outcome"] == "passed"
+        sink.finish("a", context_teardown=0.1)
+        assert sink.get("a") is None
+        sink.record("b", outcome="failed")
+        sink.finish("b", screenshot="b.png")
+        sink.close()
+        other = ResultSink(shard_path(str(tmp_path), "run1", "gw1"))
+        other.record("c", outcome="passed")
+        other.close()
+
+        results = list(iter_results(str(tmp_path), "run1"))
+        assert [r["nodeid"] for r in results] == ["a", "b", "c"]
+        assert results[0]["context_teardown"] == 0.1
+        assert results[1]["screenshot"] == "b.png"
+
+    def test_finish_unknown_nodeid_writes_nothing(self, tmp_path):
+        sink = ResultSink(shard_path(str(tmp_path), "run1", "main"))
+        assert sink.finish("never-called", context_teardown=0) is None
+        sink.close()
+        assert list(iter_results(str(tmp_path), "run1")) == []
+
+    def test_torn_line_from_crashed_worker_is_skipped(self, tmp_path):
+        sink = ResultSink(shard_path(str(tmp_path), "run1", "gw0"))
+        sink.record("a", outcome="passed")
+        sink._file.write('{"nodeid": "b", "outc')
+        sink.close()
+        assert [r["nodeid"] for r in iter_results(str(tmp_path), "run1")] == ["a"]
+
+    def test_shard_meta_round_trip(self, tmp_path):
+        write_shard_meta(str(tmp_path), "run1", "gw0", {"pool": "p0"})
+        write_shard_meta(str(tmp_path), "run0", "gw0", {"pool": "old"})
+        assert load_shard_meta(str(tmp_path), "run1") == [{"worker": "gw0", "pool": "p0"}]
+
+    def test_prune_keeps_shards_still_being_written(self, tmp_path):
+        now = 1_000_000.0
+        for run_id in ("old", "live"):
+            write_shard_meta(str(tmp_path), run_id, "gw0", {})
+            folder = tmp_path / "shards" / run_id
+            for path in [folder, *folder.iterdir()]:
+                os.utime(path, (now - 90_000, now - 90_000))
+        # The other run wrote one more result a minute ago
+        os.utime(tmp_path / "shards" / "live" / "gw0.meta.json", (now - 60, now - 60))
+
+        assert prune_shards(str(tmp_path), max_age=24 * 3600, now=now) == ["old"]
+        assert sorted(os.listdir(tmp_path / "shards")) == ["live"]
+
+
+class TestDurationScheduling:
+    def test_update_durations_smooths(self):
+        history = update_durations({"a": 10.0}, [{"nodeid": "a", "duration": 2.0}, {"nodeid": "b", "duration": 1.0}])
+        assert history == {"a": 6.0, "b": 1.0}
+
+    def test_longest_first_unknown_as_median(self):
+        items = [SimpleNamespace(nodeid=n) for n in ("fast", "new", "slow", "mid")]
+        ordered = order_by_duration(items, {"fast": 1.0, "mid": 5.0, "slow": 9.0})
+        assert [i.nodeid for i in ordered] == ["slow", "new", "mid", "fast"]
@@ -0,0 +1,101 @@
+import pytest
+
+from framework.routing import RouteStats, format_bytes, get_profile
+from pages.login_page import LoginPage
+
+
+class FakeRoute:
+    def __init__(self):
+        self.calls = []
+
+    async def continue_(self):
+        self.calls.append("continue")
+
+    async def fulfill(self, status, body, content_type):
+        self.calls.append(("fulfill", body, content_type))
+
+    async def abort(self, error_code):
+        self.calls.append(("abort", error_code))
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeResponse:
+    def __init__(self, url, length):
+        self.url = url
+        self.headers = {"content-length": str(length)}
+
+
+class TestProfiles:
+    def test_lean_blocks_heavy_types_and_stubs_trackers(self):
+        lean = get_profile("lean")
+        assert lean.action_for("https://app.example.com/logo.png", "image") == "block"
+        assert lean.action_for("https://app.example.com/app.js", "script") is None
+        assert lean.action_for("https://www.googletagmanager.com/gtm.js?id=1", "script") == "stub"
+
+    def test_full_is_inactive_and_extend_adds_rules(self):
+        assert not get_profile().active
+        custom = get_profile("full", block_patterns=["*/chat/*"])
+        assert custom.active and custom.name == "full+custom"
+        assert custom.action_for("https://app.example.com/chat/widget.js", "script") == "block"
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError, match="lean"):
+            get_profile("tiny")
+
+
+class TestRouteStats:
+    async def test_counts_and_estimates_saved_bytes(self):
+        stats = RouteStats(get_profile("lean"), known_sizes={"https://app.example.com/hero.jpg": 50_000})
+        route = FakeRoute()
+        for request in (
+            FakeRequest("https://app.example.com/hero.jpg?v=2", "image"),
+            FakeRequest("https://app.example.com/font.woff2", "font"),
+            FakeRequest("https://www.google-analytics.com/analytics.js", "script"),
+            FakeRequest("https://app.example.com/api/me", "fetch"),
+        ):
+            stats.on_request(request)
+            await stats.handle(route, request)
+        stats.on_response(FakeResponse("https://app.example.com/api/me?x=1", 120))
+
+        assert route.calls == [
+            ("abort", "blockedbyclient"),
+            ("abort", "blockedbyclient"),
+            ("fulfill", "", "text/javascript"),
+            "continue",
+        ]
+        summary = stats.summary()
+        assert summary["requests"] == 4 and summary["blocked"] == 2 and summary["stubbed"] == 1
+        assert summary["bytes_saved"] == 50_000 and summary["unknown_size"] == 2
+        assert summary["by_type"] == {"image": 1, "font": 1, "script": 1}
+        assert stats.learned == {"https://app.example.com/api/me": 120}
+
+    def test_format_bytes(self):
+        assert format_bytes(512) == "512 B"
+        assert format_bytes(2048) == "2.0 KB"
+        assert format_bytes(3 * 1024 * 1024) == "3.0 MB"
+
+
+class TestRoutingProfilesAgainstMock:
+    @pytest.mark.routing("full")
+    async def test_logo_decodes_without_blocking(self, page, mock_app):
+        await LoginPage(page, base_url=mock_app.url).go_to_login_page()
+        await page.wait_for_function("document.images[0].complete")
+        assert await page.evaluate("document.images[0].naturalWidth") == 1
+
+    @pytest.mark.routing("lean")
+    async def test_login_with_images_blocked(self, page, mock_app, request):
+        login_page = LoginPage(page, base_url=mock_app.url)
+        await login_page.go_to_login_page()
+        # The logo request was aborted, so the image never decoded
+        await page.wait_for_function("document.images[0].complete")
+        assert await page.evaluate("document.images[0].naturalWidth") == 0
+        summary = request.node._route_stats.summary()
+        assert summary["blocked"] >= 1 and summary["by_type"].get("image", 0) >= 1
+        await login_page.login(mock_app.email, mock_app.password)
+
+        await page.wait_for_url(f"{mock_app.url}/welcome")
@@ -0,0 +1,85 @@
+import io
+import os
+
+from PIL import Image
+
+from framework import screenshots
+from framework.report import screenshot_html
+from framework.screenshots import ScreenshotWriter
+
+
+class FakeArchive:
+    def __init__(self):
+        self.added = []
+
+    def add(self, path):
+        self.added.append(path)
+
+
+class TestScreenshotWriter:
+    def test_writes_and_archives_in_background(self, tmp_path):
+        archive = FakeArchive()
+        writer = ScreenshotWriter(archive)
+        path = str(tmp_path / "shots" / "test_a.png")
+        fields = writer.submit(b"\x89PNG" + bytes(100), path)
+        writer.close()
+
+        assert fields["screenshot"] == path and fields["screenshot_bytes"] == 104
+        with open(path, "rb") as f:
+            assert f.read().startswith(b"\x89PNG")
+        assert archive.added[0] == path
+
+    def test_budget_caps_bytes_per_run(self, tmp_path):
+        writer = ScreenshotWriter(max_bytes=250)
+        first = writer.submit(bytes(200), str(tmp_path / "a.png"))
+        second = writer.submit(bytes(200), str(tmp_path / "b.png"))
+        writer.close()
+
+        assert first["screenshot"] and writer.has_budget()
+        assert second == {"screenshot": "", "thumbnail": "", "screenshot_skipped": "over the per-run screenshot budget"}
+        assert not os.path.exists(tmp_path / "b.png")
+        assert "1 skipped over budget" in writer.summary()
+
+    def test_failed_job_is_counted_and_the_next_one_still_written(self, tmp_path):
+        class BrokenArchive:
+            def add(self, path):
+                raise RuntimeError("zip closed")
+
+        (tmp_path / "taken.png").mkdir()
+        writer = ScreenshotWriter(BrokenArchive())
+        writer.submit(bytes(10), str(tmp_path / "taken.png"))
+        writer.submit(bytes(10), str(tmp_path / "next.png"))
+        writer.close()
+
+        assert writer.stats["errors"] == 2
+        assert (tmp_path / "next.png").read_bytes() == bytes(10)
+        assert "2 failed to save" in writer.summary()
+
+    def test_thumbnail(self, tmp_path):
+        buffer = io.BytesIO()
+        Image.new("RGB", (1280, 4000), "white").save(buffer, "PNG")
+        writer = ScreenshotWriter()
+        fields = writer.submit(buffer.getvalue(), str(tmp_path / "tall.png"))
+        writer.close()
+
+        with Image.open(fields["thumbnail"]) as thumb:
+            assert thumb.size[0] <= screenshots.THUMBNAIL_SIZE[0] and thumb.size[1] <= screenshots.THUMBNAIL_SIZE[1]
+
+
+class TestScreenshotHtml:
+    def test_full_image_is_lazy(self, tmp_path):
+        (tmp_path / "a.thumb.jpg").write_bytes(b"jpg")
+        r = {"screenshot": str(tmp_path / "a.png"), "thumbnail": str(tmp_path / "a.thumb.jpg")}
+        html = screenshot_html(r, str(tmp_path), {})
+        assert "<img src='./a.thumb.jpg' loading='lazy'" in html
+        assert "data-src='./a.png'" in html and "src='./a.png'" not in html.replace("data-src", "")
+
+    def test_without_thumbnail_or_over_budget(self, tmp_path):
+        r = {"screenshot": str(tmp_path / "a.png"), "thumbnail": "", "screenshot_bytes": 2048}
+        assert "screenshot (2.0 KB)" in screenshot_html(r, str(tmp_path), {})
+        # Named by submit() but never written (the thumbnail failed): no broken image
+        missing = {**r, "thumbnail": str(tmp_path / "a.thumb.jpg")}
+        assert "screenshot (2.0 KB)" in screenshot_html(missing, str(tmp_path), {})
+        over_budget = {"screenshot": "", "screenshot_skipped": "budget"}
+        assert screenshot_html(over_budget, str(tmp_path), {}) == "skipped (budget)"
+        assert screenshot_html({}, str(tmp_path), {}) == "-"
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+from framework.report import report_row
+from framework.spans import SpanRecorder, attach, instrument
+
+
+class FakePage:
+    pass
+
+
+@instrument
+class FakeFlow:
+    def __init__(self, page):
+        self.page = page
+
+    async def outer(self):
+        await asyncio.sleep(0.01)
+        await self.inner()
+
+    async def inner(self):
+        await asyncio.sleep(0.01)
+
+    def not_async(self):
+        return "untouched"
+
+
+class TestSpans:
+    async def test_instrumented_methods_record_nested_spans(self):
+        page = FakePage()
+        recorder = SpanRecorder()
+        attach(page, recorder)
+        await FakeFlow(page).outer()
+        assert [(s["name"], s["depth"]) for s in recorder.spans] == [("FakeFlow.outer", 0), ("FakeFlow.inner", 1)]
+        outer, inner = recorder.spans
+        assert outer["dur"] >= inner["dur"] > 0
+        assert FakeFlow(page).not_async() == "untouched"
+
+    async def test_without_recorder_methods_still_run(self):
+        await FakeFlow(FakePage()).outer()
+
+    async def test_failed_span_is_marked(self):
+        recorder = SpanRecorder()
+        try:
+            async with recorder.span("boom"):
+                raise ValueError("x")
+        except ValueError:
+            pass
+        assert recorder.spans[0]["ok"] is False
+
+    async def test_chrome_trace_export(self, tmp_path):
+        page = FakePage()
+        recorder = SpanRecorder()
+        attach(page, recorder)
+        await FakeFlow(page).outer()
+        path = tmp_path / "traces" / "t.trace.json"
+        recorder.write_chrome_trace(str(path), label="tests/x.py::test")
+        events = json.loads(path.read_text())["traceEvents"]
+        complete = [e for e in events if e["ph"] == "X"]
+        assert {e["name"] for e in complete} == {"FakeFlow.outer", "FakeFlow.inner"}
+        assert all(isinstance(e["ts"], int) and e["dur"] >= 0 for e in complete)
+
+    def test_report_row_marks_slow_and_failed_steps(self, tmp_path):
+        row = report_row(
+            {
+                "nodeid": "t",
+                "outcome": "failed",
+                "duration": 0.4,
+                "spans": [
+                    # Top-level steps are the page-object calls the test makes itself
+                    {"name": "LoginPage.login", "start": 0, "dur": 150, "depth": 0, "ok": True},
+                    {"name": "wait<slow>", "start": 10, "dur": 120, "depth": 1, "ok": True},
+                    {"name": "quick", "start": 130, "dur": 5, "depth": 1, "ok": True},
+                    # A quarter of the steps' 300 ms, but not of the 400 ms test
+                    {"name": "OrgPage.create_org", "start": 150, "dur": 90, "depth": 0, "ok": True},
+                    {"name": "retry", "start": 240, "dur": 60, "depth": 0, "ok": False},
+                ],
+                "trace": str(tmp_path / "traces" / "t.trace.json"),
+            },
+            str(tmp_path),
+            {},
+        )
+        # The viewer draws the waterfall from these when the row is expanded, colouring bars by the mark
+        assert row["spans"] == [
+            ["LoginPage.login", 0, 150, 0, "slow"],
+            ["wait<slow>", 10, 120, 1, "slow"],
+            ["quick", 130, 5, 1, ""],
+            ["OrgPage.create_org", 150, 90, 0, ""],
+            ["retry", 240, 60, 0, "err"],
+        ]
+        assert row["trace"] == "traces/t.trace.json"
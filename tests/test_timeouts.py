@@ -0,0 +1,79 @@
+import json
+
+from framework.timeouts import TimeoutPolicy
+from pages.base_page import BasePage
+
+
+class FakePage:
+    url = "about:blank"
+
+
+class FakeStepPage(BasePage):
+    TIMEOUTS = {"step.known": 3000}
+
+
+def _policy(tmp_path, **kwargs):
+    options = {"factor": 3, "floor_ms": 1000, "ceiling_ms": 30000, "min_samples": 5, "window": 10}
+    return TimeoutPolicy(str(tmp_path / "timings.json"), **{**options, **kwargs})
+
+
+class TestTimeoutPolicy:
+    def test_cold_start_uses_default(self, tmp_path):
+        policy = _policy(tmp_path)
+        for _ in range(4):
+            policy.record("step", 0.5)
+        assert policy.timeout("step", 20000) == 20000
+
+    def test_p99_times_factor_with_floor_and_ceiling(self, tmp_path):
+        policy = _policy(tmp_path)
+        for seconds in (0.4, 0.5, 0.6, 0.5, 2.0):
+            policy.record("slow", seconds)
+            policy.record("fast", seconds / 100)
+            policy.record("huge", seconds * 100)
+        assert policy.timeout("slow", 20000) == 6000
+        assert policy.timeout("fast", 20000) == 1000
+        assert policy.timeout("huge", 20000) == 30000
+
+    def test_disabled_policy_keeps_defaults(self, tmp_path):
+        policy = _policy(tmp_path, enabled=False)
+        for _ in range(10):
+            policy.record("step", 0.1)
+        assert policy.timeout("step", 5000) == 5000
+
+    def test_timeouts_are_counted_not_sampled(self, tmp_path):
+        policy = _policy(tmp_path)
+        policy.record("step", 30.0, ok=False)
+        assert policy.data["step"] == {"samples": [], "timeouts": 1}
+
+    def test_save_merges_processes_and_keeps_a_rolling_window(self, tmp_path):
+        first, second = _policy(tmp_path), _policy(tmp_path)
+        for i in range(8):
+            first.record("step", i)
+            second.record("step", 100 + i)
+        first.save()
+        second.save()
+        with open(tmp_path / "timings.json", encoding="utf-8") as f:
+            samples = json.load(f)["step"]["samples"]
+        assert samples == [6, 7] + [100 + i for i in range(8)]
+        assert _policy(tmp_path).stats()["step"]["samples"] == 10
+
+
+class TestPageObjectTimeouts:
+    def test_step_defaults_then_learned(self, tmp_path):
+        policy = _policy(tmp_path)
+        page = FakeStepPage(FakePage(), timeouts=policy)
+        assert page.timeout_for("step.known") == 3000
+        assert page.timeout_for("step.unknown") == BasePage.DEFAULT_TIMEOUT
+        for _ in range(5):
+            policy.record("step.known", 0.8)
+        assert page.timeout_for("step.known") == 2400
+
+    def test_history_is_kept_per_host(self, tmp_path):
+        policy = _policy(tmp_path)
+        mock, real = FakePage(), FakePage()
+        mock.url, real.url = "http://127.0.0.1:51234/welcome", "https://dev-app.example.com/welcome"
+        for _ in range(5):
+            policy.record("step.known", 0.01, host="127.0.0.1")
+        # Millisecond mock-app samples floor the mock's timeout but leave the real app's default alone
+        assert FakeStepPage(mock, timeouts=policy).timeout_for("step.known") == 1000
+        assert FakeStepPage(real, timeouts=policy).timeout_for("step.known") == 3000
@@ -0,0 +1,102 @@
+import os
+
+from framework.report import playwright_trace_html
+from framework.spans import SpanRecorder
+from framework.tracing import ChunkedTracer
+
+
+class FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    async def start(self, screenshots, snapshots):
+        self.calls.append("start")
+
+    async def start_chunk(self, title=None):
+        self.calls.append(f"chunk:{title}")
+
+    async def stop_chunk(self, path=None):
+        self.calls.append("stop_chunk" if path else "discard")
+        if path:
+            with open(path, "wb") as f:
+                f.write(b"PK")
+
+    async def stop(self):
+        self.calls.append("stop")
+
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+
+async def _run_steps(tracer, names, fail_last=False):
+    recorder = SpanRecorder()
+    recorder.listeners.append(tracer)
+    for i, name in enumerate(names):
+        try:
+            async with recorder.span(name):
+                async with recorder.span(f"{name}.wait"):
+                    if fail_last and i == len(names) - 1:
+                        raise TimeoutError(name)
+        except TimeoutError:
+            pass
+
+
+class TestChunkedTracer:
+    async def test_one_chunk_per_top_level_step(self, tmp_path):
+        context = FakeContext()
+        tracer = ChunkedTracer(context, max_chunks=10)
+        await tracer.start()
+        await _run_steps(tracer, ["LoginPage.login", "OrgPage.create_org"])
+        kept = await tracer.stop(keep=True, target_dir=str(tmp_path / "trace"))
+
+        assert context.tracing.calls == [
+            "start",
+            "chunk:setup",
+            "stop_chunk",
+            "chunk:LoginPage.login",
+            "stop_chunk",
+            "chunk:OrgPage.create_org",
+            "stop_chunk",
+            "stop",
+        ]
+        assert [os.path.basename(p) for p in kept] == [
+            "00-setup.zip",
+            "01-LoginPage.login.zip",
+            "02-OrgPage.create_org.zip",
+        ]
+        assert all(os.path.exists(p) for p in kept)
+        assert not os.path.exists(tracer.chunk_dir)
+        assert tracer.overhead > 0
+
+    async def test_keeps_only_the_last_chunks_and_the_failed_step(self, tmp_path):
+        tracer = ChunkedTracer(FakeContext(), max_chunks=2)
+        await tracer.start()
+        await _run_steps(tracer, ["a", "b", "c", "d"], fail_last=True)
+        kept = await tracer.stop(keep=True, target_dir=str(tmp_path))
+
+        assert [os.path.basename(p) for p in kept] == ["03-c.zip", "04-d.zip"]
+        assert tracer.failed_step == "d"
+
+    async def test_passing_test_discards_everything(self, tmp_path):
+        context = FakeContext()
+        tracer = ChunkedTracer(context)
+        await tracer.start()
+        await _run_steps(tracer, ["a"])
+        kept = await tracer.stop(keep=False, target_dir=str(tmp_path / "trace"))
+
+        assert kept == [] and context.tracing.calls[-2:] == ["discard", "stop"]
+        assert not os.path.exists(tmp_path / "trace") and not os.path.exists(tracer.chunk_dir)
+
+
+class TestTraceLinks:
+    def test_links_last_step_first(self, tmp_path):
+        r = {
+            "playwright_trace": [str(tmp_path / "t" / "01-a.zip"), str(tmp_path / "t" / "02-b.zip")],
+            "failed_step": "b",
+        }
+        html = playwright_trace_html(r, str(tmp_path), {})
+        assert html.index("02-b.zip") < html.index("01-a.zip")
+        assert "failed in b" in html
+        assert playwright_trace_html({}, str(tmp_path), {}) == ""